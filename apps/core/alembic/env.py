@@ -1,8 +1,10 @@
 from logging.config import fileConfig
 from app.infra.db.schema import Base
 import app.infra.db.all_models  # noqa: F401  <-- ДО target_metadata
+from app.settings import settings
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy import text
 
 from alembic import context
 
@@ -12,14 +14,21 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# (не трогаем логирование, когда миграции гоняет само приложение — init_db)
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
+# та же база, что у приложения (DATABASE_URL), но синхронным драйвером
+config.set_main_option("sqlalchemy.url", settings.database_url.replace("+asyncpg", "+psycopg2"))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
+
+# API, бот и `alembic upgrade head` из menu.sh могут стартовать одновременно
+MIGRATIONS_LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtext('helix_alembic'))"
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -58,6 +67,12 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # init_db передаёт своё соединение (внутри его транзакции)
+        _run_with(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -65,12 +80,17 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        _run_with(connection)
 
-        with context.begin_transaction():
-            context.run_migrations()
+
+def _run_with(connection) -> None:
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
+
+    with context.begin_transaction():
+        connection.execute(text(MIGRATIONS_LOCK_SQL))
+        context.run_migrations()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,122 @@
+"""baseline: tensions, tension_events, baseline_fields, google_oauth_tokens
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+Схема в том виде, в каком её раньше создавал Base.metadata.create_all на старте.
+Базы, поднятые через create_all, уже содержат эти таблицы — их не трогаем.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("google_oauth_tokens"):
+        op.create_table(
+            "google_oauth_tokens",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("access_token", sa.Text(), nullable=False),
+            sa.Column("refresh_token", sa.Text(), nullable=True),
+            sa.Column("token_type", sa.String(length=32), nullable=False),
+            sa.Column("scope", sa.Text(), nullable=True),
+            sa.Column("expiry_utc", sa.DateTime(timezone=False), nullable=True),
+            sa.Column("created_utc", sa.DateTime(timezone=False), nullable=False),
+            sa.Column("updated_utc", sa.DateTime(timezone=False), nullable=False),
+        )
+
+    if not _has_table("baseline_fields"):
+        op.create_table(
+            "baseline_fields",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("user_id", sa.Text(), nullable=True),
+            sa.Column("name", sa.Text(), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("mode", sa.Text(), nullable=False),
+            sa.Column("min_quota_min_per_week", sa.Integer(), nullable=False),
+            sa.Column("max_quota_min_per_week", sa.Integer(), nullable=False),
+            sa.Column("preferred_windows", postgresql.JSONB(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+            sa.CheckConstraint("mode IN ('any','focus','admin','reflect')", name="ck_baseline_fields_mode"),
+            sa.CheckConstraint("min_quota_min_per_week >= 0", name="ck_baseline_fields_min_quota"),
+            sa.CheckConstraint("max_quota_min_per_week >= 0", name="ck_baseline_fields_max_quota"),
+        )
+
+    if not _has_table("tensions"):
+        op.create_table(
+            "tensions",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column(
+                "field_id",
+                sa.Integer(),
+                sa.ForeignKey("baseline_fields.id", ondelete="SET NULL"),
+                nullable=True,
+            ),
+            sa.Column("title", sa.Text(), nullable=False),
+            sa.Column("status", sa.Text(), nullable=False),
+            sa.Column("charge", sa.Integer(), nullable=False),
+            sa.Column("vector", sa.Text(), nullable=False),
+            sa.Column("return_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("cadence", sa.Text(), nullable=True),
+            sa.Column("last_triggered_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+            sa.CheckConstraint("status IN ('held','forming','released','parked','dropped')", name="ck_tensions_status"),
+            sa.CheckConstraint("charge BETWEEN 0 AND 5", name="ck_tensions_charge"),
+            sa.CheckConstraint(
+                "vector IN ('unknown','action','message','meeting','focus_block','decision','research','delegate','drop')",
+                name="ck_tensions_vector",
+            ),
+            sa.CheckConstraint(
+                "cadence IS NULL OR cadence IN ('daily','weekly','monthly')",
+                name="ck_tensions_cadence",
+            ),
+        )
+
+    if not _has_table("tension_events"):
+        op.create_table(
+            "tension_events",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column(
+                "tension_id",
+                sa.Integer(),
+                sa.ForeignKey("tensions.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("type", sa.Text(), nullable=False),
+            sa.Column("actor", sa.Text(), nullable=False),
+            sa.Column("payload", postgresql.JSONB(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.CheckConstraint(
+                "type IN ("
+                "'captured','edited','charge_changed','vector_changed','stage_changed',"
+                "'return_scheduled','returned','postponed','accepted','rejected',"
+                "'form_proposed','form_chosen','form_applied','released','dropped'"
+                ")",
+                name="ck_tension_events_type",
+            ),
+            sa.CheckConstraint("actor IN ('user','helix','system')", name="ck_tension_events_actor"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("tension_events")
+    op.drop_table("tensions")
+    op.drop_table("baseline_fields")
+    op.drop_table("google_oauth_tokens")
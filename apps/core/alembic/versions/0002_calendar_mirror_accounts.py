@@ -0,0 +1,123 @@
+"""calendar mirror, push channels, field week minutes, google accounts
+
+Revision ID: 0002_calendar_mirror_accounts
+Revises: 0001_baseline
+Create Date: 2026-10-18 10:05:00
+
+Всё, что добавлялось в модели поверх baseline, пока схему поднимал create_all.
+create_all не добавлял колонки в существующие таблицы, поэтому старые базы
+могут быть в любом промежуточном состоянии — каждый шаг проверяет, нужен ли он.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_calendar_mirror_accounts"
+down_revision: Union[str, None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _has_column(table: str, column: str) -> bool:
+    return any(c["name"] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    if not _has_table("calendar_events"):
+        op.create_table(
+            "calendar_events",
+            sa.Column("calendar_id", sa.Text(), primary_key=True),
+            sa.Column("event_id", sa.Text(), primary_key=True),
+            sa.Column("summary", sa.Text(), nullable=True),
+            sa.Column("status", sa.Text(), nullable=True),
+            sa.Column("start_raw", sa.Text(), nullable=False),
+            sa.Column("end_raw", sa.Text(), nullable=False),
+            sa.Column("start_utc", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("end_utc", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("is_all_day", sa.Boolean(), nullable=False),
+            sa.Column("synced_at", sa.DateTime(timezone=True), nullable=False),
+        )
+    op.create_index(
+        "ix_calendar_events_calendar_end",
+        "calendar_events",
+        ["calendar_id", "end_utc", "start_utc"],
+        if_not_exists=True,
+    )
+    if not _has_column("calendar_events", "field_id"):
+        op.add_column("calendar_events", sa.Column("field_id", sa.Integer(), nullable=True))
+        op.create_foreign_key(
+            "calendar_events_field_id_fkey",
+            "calendar_events",
+            "baseline_fields",
+            ["field_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+
+    if not _has_table("calendar_sync_state"):
+        op.create_table(
+            "calendar_sync_state",
+            sa.Column("calendar_id", sa.Text(), primary_key=True),
+            sa.Column("sync_token", sa.Text(), nullable=True),
+            sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("last_full_sync_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+    if not _has_table("calendar_watch_channels"):
+        op.create_table(
+            "calendar_watch_channels",
+            sa.Column("channel_id", sa.Text(), primary_key=True),
+            sa.Column("calendar_id", sa.Text(), nullable=False),
+            sa.Column("resource_id", sa.Text(), nullable=False),
+            sa.Column("token", sa.Text(), nullable=False),
+            sa.Column("expiration", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        )
+
+    if not _has_table("field_week_minutes"):
+        op.create_table(
+            "field_week_minutes",
+            sa.Column(
+                "field_id",
+                sa.Integer(),
+                sa.ForeignKey("baseline_fields.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("week_start", sa.Date(), primary_key=True),
+            sa.Column("minutes", sa.Integer(), nullable=False),
+        )
+
+    if not _has_column("google_oauth_tokens", "account_id"):
+        # запись времён одного аккаунта становится аккаунтом "default"
+        op.add_column(
+            "google_oauth_tokens",
+            sa.Column("account_id", sa.Text(), nullable=False, server_default="default"),
+        )
+        op.execute(
+            "UPDATE google_oauth_tokens SET account_id = 'legacy-' || id "
+            "WHERE id <> (SELECT min(id) FROM google_oauth_tokens)"
+        )
+        op.alter_column("google_oauth_tokens", "account_id", server_default=None)
+    op.create_index(
+        "ix_google_oauth_tokens_account_id",
+        "google_oauth_tokens",
+        ["account_id"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_google_oauth_tokens_account_id", table_name="google_oauth_tokens")
+    op.drop_column("google_oauth_tokens", "account_id")
+    op.drop_table("field_week_minutes")
+    op.drop_table("calendar_watch_channels")
+    op.drop_table("calendar_sync_state")
+    op.drop_table("calendar_events")
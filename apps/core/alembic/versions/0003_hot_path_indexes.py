@@ -0,0 +1,69 @@
+"""indexes for hot query paths
+
+Revision ID: 0003_hot_path_indexes
+Revises: 0002_calendar_mirror_accounts
+Create Date: 2026-10-18 10:10:00
+
+- списки активных: keyset по (created_at, id);
+- /return: due по return_at и top по (charge DESC, created_at) — частичные, только held/forming;
+- последний возврат: tension_events по (type, actor, created_at);
+- история напряжения: tension_events(tension_id, created_at) (заодно индекс под FK);
+- FK на baseline_fields: tensions.field_id, calendar_events.field_id (фильтры и ON DELETE SET NULL).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_hot_path_indexes"
+down_revision: Union[str, None] = "0002_calendar_mirror_accounts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status IN ('held', 'forming')")
+
+
+def upgrade() -> None:
+    # мог уже появиться через create_all
+    op.create_index("ix_tensions_created_at_id", "tensions", ["created_at", "id"], if_not_exists=True)
+    op.create_index(
+        "ix_tensions_active_created",
+        "tensions",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+        postgresql_where=ACTIVE,
+    )
+    op.create_index(
+        "ix_tensions_active_return_at",
+        "tensions",
+        ["return_at", "created_at"],
+        postgresql_where=sa.text("status IN ('held', 'forming') AND return_at IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_tensions_active_charge",
+        "tensions",
+        [sa.text("charge DESC"), "created_at"],
+        postgresql_where=ACTIVE,
+    )
+    op.create_index("ix_tensions_field_id", "tensions", ["field_id"])
+
+    op.create_index("ix_tension_events_tension_created", "tension_events", ["tension_id", "created_at"])
+    op.create_index(
+        "ix_tension_events_type_actor_created",
+        "tension_events",
+        ["type", "actor", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+    op.create_index("ix_calendar_events_field_id", "calendar_events", ["field_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_calendar_events_field_id", table_name="calendar_events")
+    op.drop_index("ix_tension_events_type_actor_created", table_name="tension_events")
+    op.drop_index("ix_tension_events_tension_created", table_name="tension_events")
+    op.drop_index("ix_tensions_field_id", table_name="tensions")
+    op.drop_index("ix_tensions_active_charge", table_name="tensions")
+    op.drop_index("ix_tensions_active_return_at", table_name="tensions")
+    op.drop_index("ix_tensions_active_created", table_name="tensions")
+    op.drop_index("ix_tensions_created_at_id", table_name="tensions")
@@ -0,0 +1,63 @@
+"""return scheduler: NOTIFY on schedule changes, fired marker, cadence index
+
+Revision ID: 0004_return_scheduler
+Revises: 0003_hot_path_indexes
+Create Date: 2026-10-18 11:00:00
+
+Триггер шлёт pg_notify('helix_tension_schedule', id) при любом изменении,
+которое может сдвинуть плановый возврат (status, return_at, cadence,
+last_triggered_at) — планировщик в боте перевзводит только это напряжение,
+не опрашивая таблицу. Одинаковые уведомления в одной транзакции Postgres схлопывает.
+
+tensions.return_fired_at — какой return_at уже отработан планировщиком: новый
+return_at (postpone, cadence) снова взводит возврат, отработанный — нет.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_return_scheduler"
+down_revision: Union[str, None] = "0003_hot_path_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tensions", sa.Column("return_fired_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_tensions_active_cadence",
+        "tensions",
+        ["cadence", "last_triggered_at"],
+        postgresql_where=sa.text("status IN ('held', 'forming') AND cadence IS NOT NULL"),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION helix_notify_tension_schedule() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' AND NEW.return_at IS NULL AND NEW.cadence IS NULL THEN
+                RETURN NULL;
+            END IF;
+            PERFORM pg_notify('helix_tension_schedule', COALESCE(NEW.id, OLD.id)::text);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tensions_schedule_notify
+        AFTER INSERT OR DELETE OR UPDATE OF status, return_at, cadence, last_triggered_at
+        ON tensions
+        FOR EACH ROW EXECUTE FUNCTION helix_notify_tension_schedule()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tensions_schedule_notify ON tensions")
+    op.execute("DROP FUNCTION IF EXISTS helix_notify_tension_schedule()")
+    op.drop_index("ix_tensions_active_cadence", table_name="tensions")
+    op.drop_column("tensions", "return_fired_at")
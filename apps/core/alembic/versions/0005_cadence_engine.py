@@ -0,0 +1,55 @@
+"""cadence engine: NOTIFY switch
+
+Revision ID: 0005_cadence_engine
+Revises: 0004_return_scheduler
+Create Date: 2026-10-18 12:00:00
+
+helix_notify_tension_schedule молчит при SET LOCAL helix.tension_notify = 'off':
+массовый проход cadence-движка (TensionsRepo.arm_cadence) не шлёт NOTIFY на каждую строку.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_cadence_engine"
+down_revision: Union[str, None] = "0004_return_scheduler"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION helix_notify_tension_schedule() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('helix.tension_notify', true) = 'off' THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'INSERT' AND NEW.return_at IS NULL AND NEW.cadence IS NULL THEN
+                RETURN NULL;
+            END IF;
+            PERFORM pg_notify('helix_tension_schedule', COALESCE(NEW.id, OLD.id)::text);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION helix_notify_tension_schedule() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' AND NEW.return_at IS NULL AND NEW.cadence IS NULL THEN
+                RETURN NULL;
+            END IF;
+            PERFORM pg_notify('helix_tension_schedule', COALESCE(NEW.id, OLD.id)::text);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
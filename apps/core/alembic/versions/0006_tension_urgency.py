@@ -0,0 +1,60 @@
+"""tension urgency score
+
+Revision ID: 0006_tension_urgency
+Revises: 0005_cadence_engine
+Create Date: 2026-10-18 13:00:00
+
+- tensions.return_count / last_returned_at: история событий 'returned', заполняется из tension_events;
+- tensions.urgency: срочность в очках (TensionsRepo.urgency_sql), поддерживается
+  инкрементально на записи и периодическим пересчётом (UrgencyRefresher);
+- ix_tensions_active_urgency (urgency DESC, created_at, id) по активным — id top-N выбираются
+  Index Only Scan-ом, полные строки читаются уже по этим id (TensionsRepo.list_top).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_tension_urgency"
+down_revision: Union[str, None] = "0005_cadence_engine"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tensions", sa.Column("return_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("tensions", sa.Column("last_returned_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("tensions", sa.Column("urgency", sa.Integer(), nullable=False, server_default="0"))
+
+    op.execute(
+        """
+        UPDATE tensions t
+        SET return_count = h.n, last_returned_at = h.last_at
+        FROM (
+            SELECT tension_id, count(*) AS n, max(created_at) AS last_at
+            FROM tension_events
+            WHERE type = 'returned'
+            GROUP BY tension_id
+        ) h
+        WHERE t.id = h.tension_id
+        """
+    )
+    # базовая часть счёта; возраст, просрочку и историю досчитает первый
+    # UrgencyRefresher.refresh (на старте API)
+    op.execute("UPDATE tensions SET urgency = charge * 100")
+
+    op.create_index(
+        "ix_tensions_active_urgency",
+        "tensions",
+        [sa.text("urgency DESC"), "created_at", "id"],
+        postgresql_where=sa.text("status IN ('held', 'forming')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tensions_active_urgency", table_name="tensions")
+    op.drop_column("tensions", "urgency")
+    op.drop_column("tensions", "last_returned_at")
+    op.drop_column("tensions", "return_count")
@@ -0,0 +1,73 @@
+"""tension search: notes, tsvector, trigram
+
+Revision ID: 0007_tension_search
+Revises: 0006_tension_urgency
+Create Date: 2026-10-18 14:00:00
+
+- tensions.search_notes: заметки из событий captured/released (заполняется из tension_events);
+- search_text / search_tsv — STORED generated колонки (заголовок + заметки);
+- GIN по search_tsv (полнотекстовый) и GIN gin_trgm_ops по search_text (pg_trgm, опечатки).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_tension_search"
+down_revision: Union[str, None] = "0006_tension_urgency"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column("tensions", sa.Column("search_notes", sa.Text(), nullable=False, server_default=""))
+    op.execute(
+        """
+        UPDATE tensions t
+        SET search_notes = n.notes
+        FROM (
+            SELECT tension_id, string_agg(payload->>'note', E'\\n' ORDER BY created_at, id) AS notes
+            FROM tension_events
+            WHERE type IN ('captured', 'released') AND coalesce(payload->>'note', '') <> ''
+            GROUP BY tension_id
+        ) n
+        WHERE t.id = n.tension_id
+        """
+    )
+    op.add_column(
+        "tensions",
+        sa.Column("search_text", sa.Text(), sa.Computed("title || ' ' || search_notes", persisted=True)),
+    )
+    op.add_column(
+        "tensions",
+        sa.Column(
+            "search_tsv",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('simple'::regconfig, title), 'A') || "
+                "setweight(to_tsvector('simple'::regconfig, search_notes), 'B')",
+                persisted=True,
+            ),
+        ),
+    )
+    op.create_index("ix_tensions_search_tsv", "tensions", ["search_tsv"], postgresql_using="gin")
+    op.create_index(
+        "ix_tensions_search_trgm",
+        "tensions",
+        ["search_text"],
+        postgresql_using="gin",
+        postgresql_ops={"search_text": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tensions_search_trgm", table_name="tensions")
+    op.drop_index("ix_tensions_search_tsv", table_name="tensions")
+    op.drop_column("tensions", "search_tsv")
+    op.drop_column("tensions", "search_text")
+    op.drop_column("tensions", "search_notes")
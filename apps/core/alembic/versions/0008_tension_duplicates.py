@@ -0,0 +1,35 @@
+"""trigram index over active titles for duplicate detection
+
+Revision ID: 0008_tension_duplicates
+Revises: 0007_tension_search
+Create Date: 2026-10-18 15:00:00
+
+TensionsRepo.find_similar ищет похожие активные напряжения при захвате
+(pg_trgm, title % :title) — частичный GIN только по held/forming.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_tension_duplicates"
+down_revision: Union[str, None] = "0007_tension_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tensions_active_title_trgm",
+        "tensions",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+        postgresql_where=sa.text("status IN ('held', 'forming')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tensions_active_title_trgm", table_name="tensions")
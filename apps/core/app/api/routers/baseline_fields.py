@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta
 from typing import Literal
+from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.services.field_quota import QuotaStatus
+from app.domain.services.field_windows import field_windows_cache, validate_preferred_windows
 from app.infra.db.session import SessionLocal
 from app.infra.repos.baseline_fields_repo import BaselineFieldsRepo
+from app.settings import settings
 
 Mode = Literal["any", "focus", "admin", "reflect"]
 
@@ -63,6 +68,10 @@ async def create_baseline_field(
 ):
     if payload.max_quota_min_per_week < payload.min_quota_min_per_week:
         raise HTTPException(status_code=400, detail="max_quota_min_per_week must be >= min_quota_min_per_week")
+    try:
+        preferred_windows = validate_preferred_windows(payload.preferred_windows)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid preferred_windows: {e}")
 
     repo = BaselineFieldsRepo(session)
     row = await repo.create_field(
@@ -71,7 +80,7 @@ async def create_baseline_field(
         mode=payload.mode,
         min_quota_min_per_week=payload.min_quota_min_per_week,
         max_quota_min_per_week=payload.max_quota_min_per_week,
-        preferred_windows=payload.preferred_windows,
+        preferred_windows=preferred_windows,
         is_active=payload.is_active,
         user_id=payload.user_id,
     )
@@ -85,7 +94,75 @@ async def list_baseline_fields(
     session: AsyncSession = Depends(get_db_session),
 ):
     repo = BaselineFieldsRepo(session)
-    return await repo.list_fields(include_inactive=include_inactive, limit=limit)
+    return await repo.list_fields_cached(
+        ttl_sec=settings.cache_baseline_fields_ttl_sec, include_inactive=include_inactive, limit=limit
+    )
+
+
+@router.get("/quota-status")
+async def quota_status(
+    week: str | None = None,
+    session: AsyncSession = Depends(get_db_session),
+):
+    """
+    Недельные квоты полей по времени в календаре.
+
+    week: любая дата недели "YYYY-MM-DD" (default — текущая неделя в TZ пользователя).
+    Минуты берутся из field_week_minutes — по состоянию последней синхронизации зеркала.
+    """
+    tz = ZoneInfo(settings.user_timezone)
+    try:
+        day = datetime.fromisoformat(week).date() if week else datetime.now(tz).date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
+    week_start = day - timedelta(days=day.weekday())
+
+    repo = BaselineFieldsRepo(session)
+    fields = await repo.list_fields()
+    minutes = await repo.week_minutes(week_start)
+
+    statuses = [
+        QuotaStatus(
+            field_id=f.id,
+            name=f.name,
+            minutes=minutes.get(f.id, 0),
+            min_quota=f.min_quota_min_per_week,
+            max_quota=f.max_quota_min_per_week,
+        )
+        for f in fields
+    ]
+    return {
+        "week_start": week_start.isoformat(),
+        "timezone": settings.user_timezone,
+        "fields": [
+            {
+                "id": st.field_id,
+                "name": st.name,
+                "minutes": st.minutes,
+                "min_quota_min_per_week": st.min_quota,
+                "max_quota_min_per_week": st.max_quota,
+                "status": st.status,
+            }
+            for st in statuses
+        ],
+        "under": [st.field_id for st in statuses if st.status == "under"],
+        "over": [st.field_id for st in statuses if st.status == "over"],
+    }
+
+
+@router.get("/active", response_model=list[BaselineFieldOut])
+async def active_fields(
+    at: datetime | None = None,
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Поля, в чьи preferred_windows попадает момент at (default — сейчас)."""
+    moment = at or datetime.now(ZoneInfo(settings.user_timezone))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=ZoneInfo(settings.user_timezone))
+
+    fields = await BaselineFieldsRepo(session).list_fields()
+    active = field_windows_cache.index(fields).active_at(moment)
+    return [f for f in fields if f.id in active]
 
 
 @router.patch("/{field_id}", response_model=BaselineFieldOut)
@@ -123,6 +200,13 @@ async def update_baseline_field(
     if max_quota < min_quota:
         raise HTTPException(status_code=400, detail="max_quota_min_per_week must be >= min_quota_min_per_week")
 
+    preferred_windows = None
+    if payload.preferred_windows is not None:
+        try:
+            preferred_windows = validate_preferred_windows(payload.preferred_windows)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid preferred_windows: {e}")
+
     row = await repo.update_field(
         field_id,
         name=payload.name,
@@ -130,7 +214,7 @@ async def update_baseline_field(
         mode=payload.mode,
         min_quota_min_per_week=payload.min_quota_min_per_week,
         max_quota_min_per_week=payload.max_quota_min_per_week,
-        preferred_windows=payload.preferred_windows,
+        preferred_windows=preferred_windows,
         is_active=payload.is_active,
     )
     if not row:
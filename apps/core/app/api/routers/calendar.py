@@ -1,15 +1,36 @@
 from datetime import datetime, time, timedelta
+from typing import Literal
 from zoneinfo import ZoneInfo
-from app.domain.services.free_slots import find_free_slots
-
-from fastapi import APIRouter, Depends, HTTPException
+from app.domain.services.free_slots import (
+    WEEKDAYS, busy_intervals, find_free_slots, find_free_slots_range, parse_hhmm
+)
+from app.domain.services.availability_grid import find_free_slots_grid, grid_free_slots
+from app.domain.services.group_availability import group_free_slots
+
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.settings import settings
 from app.infra.db.session import SessionLocal
-from app.infra.repos.google_tokens_repo import GoogleTokensRepo
-from app.domain.services.google_oauth import refresh_access_token, compute_expiry_utc
-from app.domain.services.google_calendar import list_events, create_event
+from app.infra.http_clients import get_google_client
+from app.infra.etag_cache import ETagCache, get_etag_cache
+from app.infra.cache import CALENDAR, read_cache
+from app.infra.db.models.calendar_events import CalendarEvent
+from app.infra.repos.calendar_events_repo import CalendarEventsRepo
+from app.domain.services.google_token_manager import (
+    GoogleNotConnected, GoogleTokenManager, get_token_manager
+)
+from app.domain.services.google_calendar import (
+    NewEvent, create_event, create_events, list_events, query_freebusy
+)
+from app.domain.services.calendar_sync import ensure_synced
+from app.domain.services.calendar_watch import CalendarWatcher, UnknownChannel, get_calendar_watcher
+
+PRIMARY_CALENDAR = "primary"
+MAX_RANGE_DAYS = 31
+MAX_BULK_EVENTS = 100
+MAX_GROUP_CALENDARS = 200
 
 router = APIRouter(prefix="/calendar", tags=["calendar"])
 
@@ -17,6 +38,44 @@ async def get_db() -> AsyncSession:
     async with SessionLocal() as db:
         yield db
 
+async def get_account_id(
+    tokens: GoogleTokenManager = Depends(get_token_manager),
+    x_helix_account: str | None = Header(default=None),
+) -> str:
+    # X-Helix-Account picks a connected Google account; without it the default one is used
+    try:
+        return await tokens.resolve_account(x_helix_account)
+    except GoogleNotConnected as e:
+        raise HTTPException(status_code=401, detail=e.detail)
+
+async def get_access_token(
+    account_id: str = Depends(get_account_id),
+    tokens: GoogleTokenManager = Depends(get_token_manager),
+) -> str:
+    # access token from process memory; refresh is single-flight and usually done in background
+    try:
+        return await tokens.get_access_token(account_id)
+    except GoogleNotConnected as e:
+        raise HTTPException(status_code=401, detail=e.detail)
+
+async def get_mirror_key(
+    account_id: str = Depends(get_account_id),
+    tokens: GoogleTokenManager = Depends(get_token_manager),
+) -> str:
+    # the default account's calendar is mirrored as "primary" (the watcher keeps it fresh);
+    # other accounts get their own mirror rows
+    if account_id == await tokens.resolve_account(None):
+        return PRIMARY_CALENDAR
+    return f"{account_id}:{PRIMARY_CALENDAR}"
+
+def mirror_max_age(
+    mirror_key: str = Depends(get_mirror_key),
+    watcher: CalendarWatcher = Depends(get_calendar_watcher),
+) -> int:
+    # the watched mirror only needs a rare safety-net sync while its push channel is live;
+    # mirrors of other accounts get no pushes and keep the short max age
+    return watcher.mirror_max_age_sec(mirror_key)
+
 def day_range_iso(tz_name: str, date_iso: str | None = None) -> tuple[str, str]:
     tz = ZoneInfo(tz_name)
     if date_iso:
@@ -28,113 +87,259 @@ def day_range_iso(tz_name: str, date_iso: str | None = None) -> tuple[str, str]:
     # Google API expects RFC3339 timestamps
     return start.isoformat(), end.isoformat()
 
-@router.get("/today")
-async def today(db: AsyncSession = Depends(get_db)):
-    repo = GoogleTokensRepo()
-    tok = await repo.get_latest(db)
-    if not tok:
-        raise HTTPException(status_code=401, detail="Google Calendar not connected. Visit /oauth/google/start")
-
-    # refresh if expired (with small leeway)
-    if tok.expiry_utc and datetime.utcnow() > (tok.expiry_utc - timedelta(seconds=30)):
-        if not tok.refresh_token:
-            raise HTTPException(status_code=401, detail="No refresh token. Reconnect via /oauth/google/start")
-        refreshed = await refresh_access_token(tok.refresh_token)
-        new_access = refreshed["access_token"]
-        new_expiry = compute_expiry_utc(refreshed.get("expires_in"))
-        tok = await repo.update_access(db, tok, access_token=new_access, expiry_utc=new_expiry)
+def _event_out(ev: CalendarEvent) -> dict:
+    return {
+        "id": ev.event_id,
+        "summary": ev.summary,
+        "start": ev.start_raw,
+        "end": ev.end_raw,
+        "status": ev.status,
+    }
+
+async def mirror_events(
+    db: AsyncSession,
+    http: httpx.AsyncClient,
+    access_token: str,
+    time_min_iso: str,
+    time_max_iso: str,
+    *,
+    max_age_sec: int,
+    mirror_key: str = PRIMARY_CALENDAR,
+) -> list[CalendarEvent]:
+    # reads are served from the local mirror; Google is only asked for deltas
+    await ensure_synced(
+        http,
+        access_token,
+        db,
+        tz_name=settings.user_timezone,
+        max_age_sec=max_age_sec,
+        calendar_id=PRIMARY_CALENDAR,
+        mirror_key=mirror_key,
+    )
+    repo = CalendarEventsRepo(db)
+    return await repo.list_range(
+        mirror_key,
+        datetime.fromisoformat(time_min_iso),
+        datetime.fromisoformat(time_max_iso),
+    )
+
+def _item_out(it: dict) -> dict:
+    start = (it.get("start") or {}).get("dateTime") or (it.get("start") or {}).get("date")
+    end = (it.get("end") or {}).get("dateTime") or (it.get("end") or {}).get("date")
+    return {
+        "id": it.get("id"),
+        "summary": it.get("summary"),
+        "start": start,
+        "end": end,
+        "status": it.get("status"),
+    }
+
+async def day_events(
+    source: str,
+    db: AsyncSession,
+    http: httpx.AsyncClient,
+    access_token: str,
+    etag_cache: ETagCache,
+    time_min_iso: str,
+    time_max_iso: str,
+    *,
+    account_id: str,
+    max_age_sec: int,
+    mirror_key: str = PRIMARY_CALENDAR,
+) -> list[dict]:
+    if source == "live":
+        # straight from Google, revalidated with If-None-Match
+        data = await list_events(
+            http,
+            access_token,
+            time_min_iso,
+            time_max_iso,
+            page_size=settings.google_events_page_size,
+            cache=etag_cache,
+            cache_owner=account_id,
+        )
+        return [_item_out(it) for it in data["items"]]
+
+    async def load() -> list[dict]:
+        rows = await mirror_events(
+            db, http, access_token, time_min_iso, time_max_iso, max_age_sec=max_age_sec, mirror_key=mirror_key
+        )
+        return [_event_out(ev) for ev in rows]
+
+    # day view from the mirror goes through the shared read cache; a mirror sync with changes resets it
+    key = f"day:{mirror_key}:{time_min_iso}:{time_max_iso}"
+    return await read_cache.get_or_load(CALENDAR, key, load, ttl_sec=settings.cache_calendar_ttl_sec)
+
+
+def parse_work_hours(payload: dict) -> dict[str, tuple[str, str] | None] | None:
+    """
+    payload["work_hours"] -> {"mon": ("09:00", "18:00"), "sat": None, ...}; None means the default hours.
+
+    Shared by /free-slots/range, /free-slots/group and /planner/plan; a malformed value is a 400.
+    """
+    raw_hours = payload.get("work_hours")
+    if raw_hours is None:
+        return None
+    if not isinstance(raw_hours, dict) or any(k not in WEEKDAYS for k in raw_hours):
+        raise HTTPException(status_code=400, detail=f"work_hours keys must be one of {', '.join(WEEKDAYS)}")
+
+    work_hours: dict[str, tuple[str, str] | None] = {}
+    for day, window in raw_hours.items():
+        if not window:
+            work_hours[day] = None
+            continue
+        try:
+            start, end = window
+            parse_hhmm(start), parse_hhmm(end)
+        except (ValueError, TypeError, AttributeError):
+            raise HTTPException(status_code=400, detail="Invalid work_hours, expected [\"HH:MM\", \"HH:MM\"] per day")
+        work_hours[day] = (start, end)
+    return work_hours
+
+
+async def busy_source(
+    payload: dict,
+    db: AsyncSession,
+    http: httpx.AsyncClient,
+    access_token: str,
+    time_min_iso: str,
+    time_max_iso: str,
+    *,
+    max_age_sec: int,
+    mirror_key: str = PRIMARY_CALENDAR,
+) -> tuple[list[dict], dict[str, str]]:
+    """
+    Busy intervals for free-slot search: {"start", "end"} dicts plus per-calendar errors.
 
+    source="mirror" (default) reads the local primary mirror;
+    source="freebusy" asks Google freeBusy for payload.calendar_ids in one round trip.
+    """
+    source = payload.get("source", "mirror")
+    if source == "freebusy":
+        calendar_ids = payload.get("calendar_ids") or [PRIMARY_CALENDAR]
+        if not isinstance(calendar_ids, list) or not all(isinstance(c, str) and c for c in calendar_ids):
+            raise HTTPException(status_code=400, detail="calendar_ids must be a list of calendar ids")
+        fb = await query_freebusy(http, access_token, time_min_iso, time_max_iso, calendar_ids)
+        return fb.all_busy(), fb.errors
+    if source != "mirror":
+        raise HTTPException(status_code=400, detail="source must be 'mirror' or 'freebusy'")
+
+    rows = await mirror_events(
+        db, http, access_token, time_min_iso, time_max_iso, max_age_sec=max_age_sec, mirror_key=mirror_key
+    )
+    return [{"start": ev.start_raw, "end": ev.end_raw} for ev in rows], {}
+
+@router.get("/today")
+async def today(
+    source: Literal["mirror", "live"] = "mirror",
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_google_client),
+    access_token: str = Depends(get_access_token),
+    etag_cache: ETagCache = Depends(get_etag_cache),
+    max_age_sec: int = Depends(mirror_max_age),
+    mirror_key: str = Depends(get_mirror_key),
+    account_id: str = Depends(get_account_id),
+):
     time_min, time_max = day_range_iso(settings.user_timezone)
-    data = await list_events(tok.access_token, time_min, time_max)
-
-    items = data.get("items", [])
-    # normalize a bit
-    events = []
-    for it in items:
-        start = (it.get("start") or {}).get("dateTime") or (it.get("start") or {}).get("date")
-        end = (it.get("end") or {}).get("dateTime") or (it.get("end") or {}).get("date")
-        events.append({
-            "id": it.get("id"),
-            "summary": it.get("summary"),
-            "start": start,
-            "end": end,
-            "status": it.get("status"),
-        })
+    events = await day_events(
+        source, db, http, access_token, etag_cache, time_min, time_max,
+        account_id=account_id, max_age_sec=max_age_sec, mirror_key=mirror_key,
+    )
 
     return {"timezone": settings.user_timezone, "events": events}
 
 @router.get("/status")
-async def status(db: AsyncSession = Depends(get_db)):
-    repo = GoogleTokensRepo()
-    tok = await repo.get_latest(db)
-    if not tok:
-        return {"connected": False, "reason": "no_token"}
-
-    if tok.expiry_utc and datetime.utcnow() > (tok.expiry_utc - timedelta(seconds=30)):
-        if not tok.refresh_token:
-            return {
-                "connected": False,
-                "reason": "refresh_token_missing",
-                "expiry_utc": tok.expiry_utc.isoformat() if tok.expiry_utc else None,
-            }
-        try:
-            refreshed = await refresh_access_token(tok.refresh_token)
-            new_access = refreshed["access_token"]
-            new_expiry = compute_expiry_utc(refreshed.get("expires_in"))
-            tok = await repo.update_access(db, tok, access_token=new_access, expiry_utc=new_expiry)
-        except Exception:
-            return {
-                "connected": False,
-                "reason": "refresh_failed",
-                "expiry_utc": tok.expiry_utc.isoformat() if tok.expiry_utc else None,
-            }
+async def status(
+    tokens: GoogleTokenManager = Depends(get_token_manager),
+    x_helix_account: str | None = Header(default=None),
+):
+    try:
+        account_id = await tokens.resolve_account(x_helix_account)
+    except GoogleNotConnected as e:
+        return {"connected": False, "reason": e.reason}
 
+    try:
+        await tokens.get_access_token(account_id)
+    except GoogleNotConnected as e:
+        tok = tokens.current(account_id)
+        out = {"connected": False, "account_id": account_id, "reason": e.reason}
+        if tok:
+            out["expiry_utc"] = tok.expiry_utc.isoformat() if tok.expiry_utc else None
+        return out
+    except Exception:
+        tok = tokens.current(account_id)
+        return {
+            "connected": False,
+            "account_id": account_id,
+            "reason": "refresh_failed",
+            "expiry_utc": tok.expiry_utc.isoformat() if tok and tok.expiry_utc else None,
+        }
+
+    tok = tokens.current(account_id)
     return {
         "connected": True,
+        "account_id": account_id,
         "expiry_utc": tok.expiry_utc.isoformat() if tok.expiry_utc else None,
         "has_refresh_token": bool(tok.refresh_token),
     }
 
-@router.get("/day")
-async def day(date: str | None = None, db: AsyncSession = Depends(get_db)):
-    repo = GoogleTokensRepo()
-    tok = await repo.get_latest(db)
-    if not tok:
-        raise HTTPException(status_code=401, detail="Google Calendar not connected. Visit /oauth/google/start")
-
-    # refresh if expired (with small leeway)
-    if tok.expiry_utc and datetime.utcnow() > (tok.expiry_utc - timedelta(seconds=30)):
-        if not tok.refresh_token:
-            raise HTTPException(status_code=401, detail="No refresh token. Reconnect via /oauth/google/start")
-        refreshed = await refresh_access_token(tok.refresh_token)
-        new_access = refreshed["access_token"]
-        new_expiry = compute_expiry_utc(refreshed.get("expires_in"))
-        tok = await repo.update_access(db, tok, access_token=new_access, expiry_utc=new_expiry)
+@router.get("/cache/stats")
+async def cache_stats(etag_cache: ETagCache = Depends(get_etag_cache)):
+    return {"etag": etag_cache.stats(), "read": read_cache.stats()}
+
+@router.post("/webhook")
+async def webhook(
+    x_goog_channel_id: str = Header(...),
+    x_goog_resource_state: str = Header(...),
+    x_goog_channel_token: str | None = Header(None),
+    watcher: CalendarWatcher = Depends(get_calendar_watcher),
+):
+    """Google Calendar push notifications (events.watch); body is empty, all data is in headers."""
+    try:
+        await watcher.handle_notification(
+            channel_id=x_goog_channel_id,
+            token=x_goog_channel_token,
+            resource_state=x_goog_resource_state,
+        )
+    except UnknownChannel:
+        raise HTTPException(status_code=404, detail="Unknown channel")
+    except PermissionError:
+        raise HTTPException(status_code=403, detail="Invalid channel token")
+    return Response(status_code=204)
 
+@router.get("/day")
+async def day(
+    date: str | None = None,
+    source: Literal["mirror", "live"] = "mirror",
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_google_client),
+    access_token: str = Depends(get_access_token),
+    etag_cache: ETagCache = Depends(get_etag_cache),
+    max_age_sec: int = Depends(mirror_max_age),
+    mirror_key: str = Depends(get_mirror_key),
+    account_id: str = Depends(get_account_id),
+):
     try:
         time_min, time_max = day_range_iso(settings.user_timezone, date)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
 
-    data = await list_events(tok.access_token, time_min, time_max)
-
-    items = data.get("items", [])
-    events = []
-    for it in items:
-        start = (it.get("start") or {}).get("dateTime") or (it.get("start") or {}).get("date")
-        end = (it.get("end") or {}).get("dateTime") or (it.get("end") or {}).get("date")
-        events.append({
-            "id": it.get("id"),
-            "summary": it.get("summary"),
-            "start": start,
-            "end": end,
-            "status": it.get("status"),
-        })
+    events = await day_events(
+        source, db, http, access_token, etag_cache, time_min, time_max,
+        account_id=account_id, max_age_sec=max_age_sec, mirror_key=mirror_key,
+    )
 
     return {"date": date, "timezone": settings.user_timezone, "events": events}
 
 @router.post("/free-slots")
-async def free_slots(payload: dict, db: AsyncSession = Depends(get_db)):
+async def free_slots(
+    payload: dict,
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_google_client),
+    access_token: str = Depends(get_access_token),
+    max_age_sec: int = Depends(mirror_max_age),
+    mirror_key: str = Depends(get_mirror_key),
+):
     """
     payload:
       date: "YYYY-MM-DD" (optional; default today in user TZ)
@@ -143,21 +348,10 @@ async def free_slots(payload: dict, db: AsyncSession = Depends(get_db)):
       work_end: "18:00"
       buffer_min: 10
       max_slots: 3
+      step_min: 15 (optional; every slot start on this grid, not just gap starts)
+      source: "mirror" | "freebusy" (default "mirror")
+      calendar_ids: ["primary", "team@example.com"] (freebusy only)
     """
-    repo = GoogleTokensRepo()
-    tok = await repo.get_latest(db)
-    if not tok:
-        raise HTTPException(status_code=401, detail="Google Calendar not connected. Visit /oauth/google/start")
-
-    # refresh if needed
-    if tok.expiry_utc and datetime.utcnow() > (tok.expiry_utc - timedelta(seconds=30)):
-        if not tok.refresh_token:
-            raise HTTPException(status_code=401, detail="No refresh token. Reconnect via /oauth/google/start")
-        refreshed = await refresh_access_token(tok.refresh_token)
-        new_access = refreshed["access_token"]
-        new_expiry = compute_expiry_utc(refreshed.get("expires_in"))
-        tok = await repo.update_access(db, tok, access_token=new_access, expiry_utc=new_expiry)
-
     tz = ZoneInfo(settings.user_timezone)
     today = datetime.now(tz).date().isoformat()
 
@@ -167,6 +361,7 @@ async def free_slots(payload: dict, db: AsyncSession = Depends(get_db)):
     work_end = payload.get("work_end", "18:00")
     buffer_min = int(payload.get("buffer_min", 10))
     max_slots = int(payload.get("max_slots", 3))
+    step_min = int(payload["step_min"]) if payload.get("step_min") else None
 
     # list events for that day
     # reuse today_range_iso but for custom day:
@@ -175,15 +370,13 @@ async def free_slots(payload: dict, db: AsyncSession = Depends(get_db)):
     time_min = day_start.isoformat()
     time_max = day_end.isoformat()
 
-    data = await list_events(tok.access_token, time_min, time_max)
-    items = data.get("items", [])
-    events = []
-    for it in items:
-        start = (it.get("start") or {}).get("dateTime") or (it.get("start") or {}).get("date")
-        end = (it.get("end") or {}).get("dateTime") or (it.get("end") or {}).get("date")
-        events.append({"start": start, "end": end})
+    events, errors = await busy_source(
+        payload, db, http, access_token, time_min, time_max, max_age_sec=max_age_sec, mirror_key=mirror_key,
+    )
 
-    slots = find_free_slots(
+    find = find_free_slots_grid if step_min else find_free_slots
+    extra = {"step_min": step_min} if step_min else {}
+    slots = find(
         events=events,
         tz_name=settings.user_timezone,
         date_iso=date_iso,
@@ -192,73 +385,341 @@ async def free_slots(payload: dict, db: AsyncSession = Depends(get_db)):
         work_end=work_end,
         buffer_min=buffer_min,
         max_slots=max_slots,
+        **extra,
     )
 
-    return {"date": date_iso, "timezone": settings.user_timezone, "slots": [s.__dict__ for s in slots]}
+    out = {"date": date_iso, "timezone": settings.user_timezone, "slots": [s.__dict__ for s in slots]}
+    if errors:
+        out["calendar_errors"] = errors
+    return out
+
+
+@router.post("/free-slots/range")
+async def free_slots_range(
+    payload: dict,
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_google_client),
+    access_token: str = Depends(get_access_token),
+    max_age_sec: int = Depends(mirror_max_age),
+    mirror_key: str = Depends(get_mirror_key),
+):
+    """
+    payload:
+      start_date: "YYYY-MM-DD" (optional; default today in user TZ)
+      end_date: "YYYY-MM-DD" (inclusive; default start_date + 6 days)
+      duration_min: 30
+      work_hours: {"mon": ["09:00", "18:00"], ..., "sat": null}  (default Mon-Fri 09:00-18:00)
+      buffer_min: 10
+      max_slots_per_day: 3
+      max_total: 20 (optional)
+      step_min: 15 (optional; minute-grid engine, every slot start on this grid)
+      source: "mirror" | "freebusy" (default "mirror")
+      calendar_ids: ["primary", "team@example.com"] (freebusy only)
+    """
+    tz = ZoneInfo(settings.user_timezone)
+    today = datetime.now(tz).date()
+
+    try:
+        start_day = datetime.fromisoformat(payload["start_date"]).date() if payload.get("start_date") else today
+        end_day = (
+            datetime.fromisoformat(payload["end_date"]).date()
+            if payload.get("end_date")
+            else start_day + timedelta(days=6)
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
+    if end_day < start_day:
+        raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+    if (end_day - start_day).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
 
+    work_hours = parse_work_hours(payload)
 
-@router.post("/create")
-async def create_calendar_event(payload: dict, db: AsyncSession = Depends(get_db)):
+    duration_min = int(payload.get("duration_min", 30))
+    buffer_min = int(payload.get("buffer_min", 10))
+    max_slots_per_day = int(payload.get("max_slots_per_day", 3))
+    max_total = int(payload["max_total"]) if payload.get("max_total") is not None else None
+    step_min = int(payload["step_min"]) if payload.get("step_min") else None
+
+    # one mirror query for the whole range
+    time_min = datetime.combine(start_day, time(0, 0), tzinfo=tz).isoformat()
+    time_max = datetime.combine(end_day + timedelta(days=1), time(0, 0), tzinfo=tz).isoformat()
+    events, errors = await busy_source(
+        payload, db, http, access_token, time_min, time_max, max_age_sec=max_age_sec, mirror_key=mirror_key,
+    )
+
+    try:
+        find = grid_free_slots if step_min else find_free_slots_range
+        extra = {"step_min": step_min} if step_min else {}
+        by_day = find(
+            events=events,
+            tz_name=settings.user_timezone,
+            start_date_iso=start_day.isoformat(),
+            end_date_iso=end_day.isoformat(),
+            duration_min=duration_min,
+            work_hours=work_hours,
+            buffer_min=buffer_min,
+            max_slots_per_day=max_slots_per_day,
+            max_total=max_total,
+            **extra,
+        )
+    except (ValueError, IndexError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid work_hours, expected [\"HH:MM\", \"HH:MM\"] per day")
+
+    days = [{"date": d, "slots": [s.__dict__ for s in slots]} for d, slots in by_day.items()]
+    out = {
+        "start_date": start_day.isoformat(),
+        "end_date": end_day.isoformat(),
+        "timezone": settings.user_timezone,
+        "days": days,
+        "total": sum(len(d["slots"]) for d in days),
+    }
+    if errors:
+        out["calendar_errors"] = errors
+    return out
+
+
+@router.post("/free-slots/group")
+async def free_slots_group(
+    payload: dict,
+    http: httpx.AsyncClient = Depends(get_google_client),
+    access_token: str = Depends(get_access_token),
+):
     """
+    Common free slots across many calendars: one freeBusy round + one sweep-line pass.
+
     payload:
-      date: "YYYY-MM-DD"
-      start_time: "HH:MM"
+      calendar_ids: ["primary", "alice@example.com", ...] (required)
+      start_date: "YYYY-MM-DD" (optional; default today in user TZ)
+      end_date: "YYYY-MM-DD" (inclusive; default start_date)
       duration_min: 30
-      title: "Meeting title"
+      work_hours: {"mon": ["09:00", "18:00"], ..., "sat": null}  (default Mon-Fri 09:00-18:00)
+      buffer_min: 10
+      quorum: 5 (optional; how many of calendar_ids must be free, default all)
+      max_slots_per_day: 3
+      max_total: 20 (optional)
+
+    Calendars freeBusy could not read are listed in calendar_errors / dropped_calendars and
+    never count as free: the quorum is still out of all calendar_ids. 502 if no calendar
+    could be read or the quorum can no longer be met by the readable ones.
     """
-    repo = GoogleTokensRepo()
-    tok = await repo.get_latest(db)
-    if not tok:
-        raise HTTPException(status_code=401, detail="Google Calendar not connected. Visit /oauth/google/start")
-
-    if tok.expiry_utc and datetime.utcnow() > (tok.expiry_utc - timedelta(seconds=30)):
-        if not tok.refresh_token:
-            raise HTTPException(status_code=401, detail="No refresh token. Reconnect via /oauth/google/start")
-        refreshed = await refresh_access_token(tok.refresh_token)
-        new_access = refreshed["access_token"]
-        new_expiry = compute_expiry_utc(refreshed.get("expires_in"))
-        tok = await repo.update_access(db, tok, access_token=new_access, expiry_utc=new_expiry)
+    calendar_ids = payload.get("calendar_ids")
+    if not isinstance(calendar_ids, list) or not calendar_ids or not all(isinstance(c, str) and c for c in calendar_ids):
+        raise HTTPException(status_code=400, detail="calendar_ids must be a non-empty list of calendar ids")
+    calendar_ids = list(dict.fromkeys(calendar_ids))
+    if len(calendar_ids) > MAX_GROUP_CALENDARS:
+        raise HTTPException(status_code=400, detail=f"Up to {MAX_GROUP_CALENDARS} calendars per request")
+
+    tz = ZoneInfo(settings.user_timezone)
+    today = datetime.now(tz).date()
+    try:
+        start_day = datetime.fromisoformat(payload["start_date"]).date() if payload.get("start_date") else today
+        end_day = datetime.fromisoformat(payload["end_date"]).date() if payload.get("end_date") else start_day
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
+    if end_day < start_day:
+        raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+    if (end_day - start_day).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+
+    work_hours = parse_work_hours(payload)
+
+    quorum = int(payload["quorum"]) if payload.get("quorum") is not None else None
+    if quorum is not None and not 1 <= quorum <= len(calendar_ids):
+        raise HTTPException(status_code=400, detail="quorum must be between 1 and the number of calendars")
+
+    time_min = datetime.combine(start_day, time(0, 0), tzinfo=tz).isoformat()
+    time_max = datetime.combine(end_day + timedelta(days=1), time(0, 0), tzinfo=tz).isoformat()
+    fb = await query_freebusy(http, access_token, time_min, time_max, calendar_ids)
+    busy_by_calendar = {cid: busy_intervals(intervals, tz) for cid, intervals in fb.busy.items()}
+    # freeBusy may also silently omit a calendar — that is as unknown as an error
+    calendar_errors = dict(fb.errors)
+    for cid in calendar_ids:
+        if cid not in busy_by_calendar and cid not in calendar_errors:
+            calendar_errors[cid] = "missing"
+    dropped = [cid for cid in calendar_ids if cid in calendar_errors]
+
+    if not busy_by_calendar:
+        raise HTTPException(
+            status_code=502,
+            detail={"message": "None of the calendars could be read", "calendar_errors": calendar_errors},
+        )
+    # unreadable calendars are not free: N of calendar_ids free <=> N of the readable ones free
+    needed = len(calendar_ids) if quorum is None else quorum
+    if needed > len(busy_by_calendar):
+        raise HTTPException(
+            status_code=502,
+            detail={
+                "message": (
+                    f"Quorum {needed} cannot be met: only {len(busy_by_calendar)} "
+                    f"of {len(calendar_ids)} calendars could be read"
+                ),
+                "calendar_errors": calendar_errors,
+            },
+        )
 
+    try:
+        by_day = group_free_slots(
+            busy_by_calendar=busy_by_calendar,
+            tz_name=settings.user_timezone,
+            start_date_iso=start_day.isoformat(),
+            end_date_iso=end_day.isoformat(),
+            duration_min=int(payload.get("duration_min", 30)),
+            work_hours=work_hours,
+            buffer_min=int(payload.get("buffer_min", 10)),
+            quorum=needed,
+            max_slots_per_day=int(payload.get("max_slots_per_day", 3)),
+            max_total=int(payload["max_total"]) if payload.get("max_total") is not None else None,
+        )
+    except (ValueError, IndexError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid work_hours, expected [\"HH:MM\", \"HH:MM\"] per day")
+
+    days = [{"date": d, "slots": [s.__dict__ for s in slots]} for d, slots in by_day.items()]
+    out = {
+        "start_date": start_day.isoformat(),
+        "end_date": end_day.isoformat(),
+        "timezone": settings.user_timezone,
+        "calendars": len(calendar_ids),
+        "calendars_read": len(busy_by_calendar),
+        "quorum": needed,
+        "days": days,
+        "total": sum(len(d["slots"]) for d in days),
+    }
+    if dropped:
+        out["dropped_calendars"] = dropped
+        out["calendar_errors"] = calendar_errors
+    return out
+
+
+def parse_new_event(payload: dict, tz: ZoneInfo) -> NewEvent:
+    """date/start_time/duration_min/title -> NewEvent; ValueError with a client-facing message."""
     date_iso = payload.get("date")
     start_time = payload.get("start_time")
     duration_min = payload.get("duration_min")
     title = payload.get("title")
 
     if not date_iso or not start_time or not duration_min or not title:
-        raise HTTPException(status_code=400, detail="Missing required fields: date, start_time, duration_min, title")
+        raise ValueError("Missing required fields: date, start_time, duration_min, title")
 
     try:
         duration_min = int(duration_min)
         if duration_min <= 0:
             raise ValueError("duration_min must be > 0")
     except Exception:
-        raise HTTPException(status_code=400, detail="Invalid duration_min")
+        raise ValueError("Invalid duration_min")
 
-    tz = ZoneInfo(settings.user_timezone)
     try:
         day = datetime.fromisoformat(date_iso).date()
         start_hour, start_minute = map(int, start_time.split(":"))
         start_dt = datetime.combine(day, time(start_hour, start_minute), tzinfo=tz)
     except Exception:
-        raise HTTPException(status_code=400, detail="Invalid date or start_time format")
+        raise ValueError("Invalid date or start_time format")
+
+    field_id = payload.get("field_id")
+    if field_id is not None and (isinstance(field_id, bool) or not isinstance(field_id, int)):
+        raise ValueError("field_id must be an integer")
 
     end_dt = start_dt + timedelta(minutes=duration_min)
+    return NewEvent(summary=title, start_iso=start_dt.isoformat(), end_iso=end_dt.isoformat(), field_id=field_id)
+
+def _created_out(created: dict) -> dict:
+    return {
+        "id": created.get("id"),
+        "summary": created.get("summary"),
+        "start": (created.get("start") or {}).get("dateTime"),
+        "end": (created.get("end") or {}).get("dateTime"),
+        "status": created.get("status"),
+        "htmlLink": created.get("htmlLink"),
+    }
+
+@router.post("/create")
+async def create_calendar_event(
+    payload: dict,
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_google_client),
+    access_token: str = Depends(get_access_token),
+    mirror_key: str = Depends(get_mirror_key),
+):
+    """
+    payload:
+      date: "YYYY-MM-DD"
+      start_time: "HH:MM"
+      duration_min: 30
+      title: "Meeting title"
+      field_id: 1 (optional; baseline field the time counts towards)
+    """
+    try:
+        ev = parse_new_event(payload, ZoneInfo(settings.user_timezone))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     created = await create_event(
-        tok.access_token,
-        summary=title,
-        start_iso=start_dt.isoformat(),
-        end_iso=end_dt.isoformat(),
+        http,
+        access_token,
+        summary=ev.summary,
+        start_iso=ev.start_iso,
+        end_iso=ev.end_iso,
+        field_id=ev.field_id,
     )
+    # write-through: the event is visible in mirror reads right away
+    await CalendarEventsRepo(db).apply_changes(mirror_key, [created], tz_name=settings.user_timezone)
+
+    return {
+        "timezone": settings.user_timezone,
+        "event": _created_out(created),
+    }
+
+
+@router.post("/create/bulk")
+async def create_calendar_events_bulk(
+    payload: dict,
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_google_client),
+    access_token: str = Depends(get_access_token),
+    mirror_key: str = Depends(get_mirror_key),
+):
+    """
+    payload:
+      events: [{"date": "YYYY-MM-DD", "start_time": "HH:MM", "duration_min": 30, "title": "...", "field_id": 1}, ...]
+
+    One token resolution for the whole batch, inserts run concurrently.
+    The batch is validated up front (400 -> nothing created); Google errors are reported per item.
+    """
+    items = payload.get("events")
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="events must be a non-empty list")
+    if len(items) > MAX_BULK_EVENTS:
+        raise HTTPException(status_code=400, detail=f"Batch is limited to {MAX_BULK_EVENTS} events")
+
+    tz = ZoneInfo(settings.user_timezone)
+    new_events: list[NewEvent] = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise HTTPException(status_code=400, detail=f"events[{i}]: expected an object")
+        try:
+            new_events.append(parse_new_event(item, tz))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"events[{i}]: {e}")
+
+    results = await create_events(
+        http, access_token, new_events, concurrency=settings.google_bulk_create_concurrency
+    )
+
+    created = [r.event for r in results if r.ok]
+    if created:
+        # write-through in one upsert for the whole batch
+        await CalendarEventsRepo(db).apply_changes(mirror_key, created, tz_name=settings.user_timezone)
+
+    out_items = []
+    for r in results:
+        if r.ok:
+            out_items.append({"index": r.index, "ok": True, "event": _created_out(r.event)})
+        else:
+            out_items.append({"index": r.index, "ok": False, "status_code": r.status_code, "error": r.error})
 
     return {
         "timezone": settings.user_timezone,
-        "event": {
-            "id": created.get("id"),
-            "summary": created.get("summary"),
-            "start": (created.get("start") or {}).get("dateTime"),
-            "end": (created.get("end") or {}).get("dateTime"),
-            "status": created.get("status"),
-            "htmlLink": created.get("htmlLink"),
-        },
+        "created": len(created),
+        "failed": len(results) - len(created),
+        "results": out_items,
     }
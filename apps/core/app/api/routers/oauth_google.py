@@ -1,12 +1,17 @@
+import html
+
+import httpx
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import RedirectResponse, HTMLResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infra.db.session import SessionLocal
+from app.infra.http_clients import get_google_client
 from app.infra.repos.google_tokens_repo import GoogleTokensRepo
 from app.domain.services.google_oauth import (
-    build_google_auth_url, exchange_code_for_tokens, compute_expiry_utc
+    account_from_id_token, build_google_auth_url, exchange_code_for_tokens, compute_expiry_utc
 )
+from app.domain.services.google_token_manager import GoogleNotConnected, GoogleTokenManager, get_token_manager
 
 router = APIRouter(prefix="/oauth/google", tags=["oauth"])
 
@@ -21,26 +26,62 @@ async def start():
     return RedirectResponse(url)
 
 @router.get("/callback")
-async def callback(code: str = Query(...), state: str | None = Query(None), db: AsyncSession = Depends(get_db)):
+async def callback(
+    code: str = Query(...),
+    state: str | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    http: httpx.AsyncClient = Depends(get_google_client),
+    tokens: GoogleTokenManager = Depends(get_token_manager),
+):
     repo = GoogleTokensRepo()
-    data = await exchange_code_for_tokens(code)
+    data = await exchange_code_for_tokens(http, code)
 
     access_token = data["access_token"]
     refresh_token = data.get("refresh_token")  # может быть None, если Google не дал — но мы просим prompt=consent
     token_type = data.get("token_type", "Bearer")
     scope = data.get("scope")
     expiry_utc = compute_expiry_utc(data.get("expires_in"))
+    account_id = account_from_id_token(data.get("id_token"))
 
-    await repo.upsert_single(
+    await repo.upsert_account(
         db,
+        account_id=account_id,
         access_token=access_token,
         refresh_token=refresh_token,
         token_type=token_type,
         scope=scope,
         expiry_utc=expiry_utc,
     )
+    tokens.set_token(
+        account_id=account_id,
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expiry_utc=expiry_utc,
+    )
 
     return HTMLResponse(
-        "<h3>HELIX: Google Calendar connected ✅</h3>"
+        f"<h3>HELIX: Google Calendar connected ✅ ({html.escape(account_id)})</h3>"
         "<p>You can close this tab and go back to HELIX.</p>"
     )
+
+@router.get("/accounts")
+async def accounts(
+    db: AsyncSession = Depends(get_db),
+    tokens: GoogleTokenManager = Depends(get_token_manager),
+):
+    rows = await GoogleTokensRepo().list_accounts(db)
+    try:
+        default = await tokens.resolve_account(None)
+    except GoogleNotConnected:
+        default = None
+    return {
+        "default": default,
+        "accounts": [
+            {
+                "account_id": row.account_id,
+                "has_refresh_token": bool(row.refresh_token),
+                "expiry_utc": row.expiry_utc.isoformat() if row.expiry_utc else None,
+            }
+            for row in rows
+        ],
+    }
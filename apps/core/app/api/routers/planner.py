@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import httpx
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.routers.calendar import (
+    busy_source, get_access_token, get_mirror_key, mirror_max_age, parse_work_hours
+)
+from app.domain.services.field_windows import field_windows_cache
+from app.domain.services.planner import (
+    DEFAULT_DURATIONS, PlanField, PlanTension, plan_tensions
+)
+from app.infra.db.session import SessionLocal
+from app.infra.http_clients import get_google_client
+from app.infra.repos.baseline_fields_repo import BaselineFieldsRepo
+from app.infra.repos.tensions_repo import TensionsRepo
+from app.settings import settings
+
+MAX_WEEKS = 4
+MAX_TENSIONS = 1000
+
+
+async def get_db_session() -> AsyncSession:
+    async with SessionLocal() as db:
+        yield db
+
+
+router = APIRouter(prefix="/planner", tags=["planner"])
+
+
+@router.post("/plan")
+async def plan(
+    payload: dict,
+    session: AsyncSession = Depends(get_db_session),
+    http: httpx.AsyncClient = Depends(get_google_client),
+    access_token: str = Depends(get_access_token),
+    max_age_sec: int = Depends(mirror_max_age),
+    mirror_key: str = Depends(get_mirror_key),
+):
+    """
+    Раскладывает активные напряжения (focus_block / meeting / research / decision) по свободным слотам.
+
+    payload:
+      start_date: "YYYY-MM-DD" (optional; default today in user TZ)
+      weeks: 1 (1..4)
+      work_hours: {"mon": ["09:00", "18:00"], ..., "sat": null}  (default Mon-Fri 09:00-18:00)
+      buffer_min: 10
+      durations: {"focus_block": 90, "research": 60, "meeting": 30, "decision": 30}
+      source: "mirror" | "freebusy" (default "mirror")
+      calendar_ids: ["primary", "team@example.com"] (freebusy only)
+
+    Ничего не создаёт в календаре — только план; блоки можно отправить в POST /calendar/create/bulk.
+    """
+    tz = ZoneInfo(settings.user_timezone)
+    try:
+        start_day = (
+            datetime.fromisoformat(payload["start_date"]).date()
+            if payload.get("start_date")
+            else datetime.now(tz).date()
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
+
+    weeks = int(payload.get("weeks", 1))
+    if not 1 <= weeks <= MAX_WEEKS:
+        raise HTTPException(status_code=400, detail=f"weeks must be between 1 and {MAX_WEEKS}")
+    end_day = start_day + timedelta(days=7 * weeks - 1)
+
+    work_hours = parse_work_hours(payload)
+
+    durations = payload.get("durations") or {}
+    if not isinstance(durations, dict) or not all(isinstance(v, int) and v > 0 for v in durations.values()):
+        raise HTTPException(status_code=400, detail="durations must map vector -> positive minutes")
+    vectors = tuple({**DEFAULT_DURATIONS, **durations})
+
+    buffer_min = int(payload.get("buffer_min", 10))
+
+    tension_rows = await TensionsRepo(session).list_schedulable(vectors, limit=MAX_TENSIONS)
+    field_rows = await BaselineFieldsRepo(session).list_fields()
+
+    time_min = datetime.combine(start_day, time(0, 0), tzinfo=tz).isoformat()
+    time_max = datetime.combine(end_day + timedelta(days=1), time(0, 0), tzinfo=tz).isoformat()
+    events, errors = await busy_source(
+        payload, session, http, access_token, time_min, time_max,
+        max_age_sec=max_age_sec, mirror_key=mirror_key,
+    )
+
+    try:
+        result = plan_tensions(
+            tensions=[
+                PlanTension(id=t.id, title=t.title, charge=t.charge, vector=t.vector, field_id=t.field_id)
+                for t in tension_rows
+            ],
+            fields=[
+                PlanField(
+                    id=f.id,
+                    name=f.name,
+                    min_quota_min_per_week=f.min_quota_min_per_week,
+                    max_quota_min_per_week=f.max_quota_min_per_week,
+                    windows=field_windows_cache.get(f),
+                )
+                for f in field_rows
+            ],
+            events=events,
+            tz_name=settings.user_timezone,
+            start_date_iso=start_day.isoformat(),
+            end_date_iso=end_day.isoformat(),
+            work_hours=work_hours,
+            buffer_min=buffer_min,
+            durations=durations,
+        )
+    except (ValueError, IndexError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid work_hours, expected [\"HH:MM\", \"HH:MM\"] per day")
+
+    by_id = {t.id: t for t in tension_rows}
+    blocks = [
+        {
+            "tension_id": b.tension_id,
+            "title": by_id[b.tension_id].title,
+            "vector": by_id[b.tension_id].vector,
+            "charge": by_id[b.tension_id].charge,
+            "field_id": by_id[b.tension_id].field_id,
+            "start": b.start.isoformat(),
+            "end": b.end.isoformat(),
+        }
+        for b in result.blocks
+    ]
+
+    # понедельники всех недель горизонта (как ключи в field_minutes)
+    horizon = (start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1))
+    week_labels = sorted({(d - timedelta(days=d.weekday())).isoformat() for d in horizon})
+
+    fields_out = []
+    for f in field_rows:
+        planned = result.field_minutes.get(f.id, {})
+        fields_out.append({
+            "id": f.id,
+            "name": f.name,
+            "min_quota_min_per_week": f.min_quota_min_per_week,
+            "max_quota_min_per_week": f.max_quota_min_per_week,
+            "planned_min_by_week": planned,
+            "under_min": any(planned.get(w, 0) < f.min_quota_min_per_week for w in week_labels),
+        })
+
+    out = {
+        "start_date": start_day.isoformat(),
+        "end_date": end_day.isoformat(),
+        "timezone": settings.user_timezone,
+        "blocks": blocks,
+        "unplaced": [{"tension_id": tid, "reason": reason} for tid, reason in result.unplaced.items()],
+        "fields": fields_out,
+    }
+    if errors:
+        out["calendar_errors"] = errors
+    return out
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infra.db.session import SessionLocal
-from app.infra.repos.tensions_repo import TensionsRepo
+from app.infra.repos.keyset import InvalidCursor
+from app.infra.repos.tensions_repo import ACTIVE_STATUSES, TensionsRepo
+from app.settings import settings
 
 async def get_db_session() -> AsyncSession:
     async with SessionLocal() as db:
@@ -33,6 +36,25 @@ class CreateTensionIn(BaseModel):
         "drop",
     ] = "unknown"
     status: Literal["held", "forming", "released", "parked", "dropped"] = "held"
+    # похожее активное уже есть: create — всё равно создать, reject — 409 со списком похожих,
+    # merge — дописать захват в самое похожее
+    on_duplicate: Literal["create", "reject", "merge"] = "create"
+    # явно дописать захват в это активное напряжение (например, выбранное из 409)
+    merge_into: Optional[int] = None
+
+
+TensionStatus = Literal["held", "forming", "released", "parked", "dropped"]
+TensionVector = Literal[
+    "unknown",
+    "action",
+    "message",
+    "meeting",
+    "focus_block",
+    "decision",
+    "research",
+    "delegate",
+    "drop",
+]
 
 
 class TensionOut(BaseModel):
@@ -41,11 +63,31 @@ class TensionOut(BaseModel):
     status: str
     charge: int
     vector: str
+    urgency: int
 
     class Config:
         from_attributes = True
 
 
+class TensionsPageOut(BaseModel):
+    items: list[TensionOut]
+    # передать в ?cursor= за следующей страницей; None — страниц больше нет
+    next_cursor: Optional[str] = None
+
+
+class SimilarTensionOut(TensionOut):
+    similarity: float
+
+
+class TensionSearchHitOut(TensionOut):
+    rank: float
+
+
+class TensionsSearchOut(BaseModel):
+    items: list[TensionSearchHitOut]
+    next_cursor: Optional[str] = None
+
+
 class UpdateTensionIn(BaseModel):
     charge: Optional[int] = Field(default=None, ge=0, le=5)
     vector: Optional[
@@ -68,9 +110,40 @@ class ReleaseTensionIn(BaseModel):
     note: Optional[str] = Field(default=None, max_length=5000)
 
 
+class PostponeTensionIn(BaseModel):
+    # на сколько отложить возврат ("postpone 2h" -> 120)
+    minutes: int = Field(ge=1, le=30 * 24 * 60)
+
+
+def _similar_out(similar) -> list[dict]:
+    return [
+        {**TensionOut.model_validate(t).model_dump(), "similarity": round(sim, 3)} for t, sim in similar
+    ]
+
+
 @router.post("", response_model=TensionOut)
 async def create_tension(payload: CreateTensionIn, session: AsyncSession = Depends(get_db_session)):
     repo = TensionsRepo(session)
+
+    merge_into = payload.merge_into
+    if merge_into is None and payload.on_duplicate != "create":
+        similar = await repo.find_similar(payload.title, threshold=settings.tension_duplicate_threshold)
+        if similar and payload.on_duplicate == "reject":
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Similar active tension exists", "similar": _similar_out(similar)},
+            )
+        if similar:
+            merge_into = similar[0][0].id
+
+    if merge_into is not None:
+        t = await repo.merge_capture(
+            merge_into, title=payload.title, note=payload.note, charge=payload.charge, actor="user"
+        )
+        if not t:
+            raise HTTPException(status_code=404, detail="Active tension to merge into not found")
+        return t
+
     t = await repo.create_tension(
         title=payload.title,
         note=payload.note,
@@ -82,10 +155,136 @@ async def create_tension(payload: CreateTensionIn, session: AsyncSession = Depen
     return t
 
 
-@router.get("/active", response_model=list[TensionOut])
-async def list_active(limit: int = 50, session: AsyncSession = Depends(get_db_session)):
+async def _page(
+    session: AsyncSession,
+    *,
+    statuses: tuple[str, ...],
+    vector: str | None,
+    field_id: int | None,
+    limit: int | None,
+    cursor: str | None,
+    cached: bool = False,
+):
+    limit = limit or settings.tensions_page_size
+    if not 1 <= limit <= settings.tensions_max_page_size:
+        raise HTTPException(
+            status_code=400, detail=f"limit must be between 1 and {settings.tensions_max_page_size}"
+        )
     repo = TensionsRepo(session)
-    return await repo.list_active(limit=limit)
+    try:
+        if cached:
+            return await repo.list_page_cached(
+                ttl_sec=settings.cache_tensions_ttl_sec,
+                statuses=statuses,
+                vector=vector,
+                field_id=field_id,
+                limit=limit,
+                cursor=cursor,
+            )
+        return await repo.list_page(
+            statuses=statuses, vector=vector, field_id=field_id, limit=limit, cursor=cursor
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("", response_model=TensionsPageOut)
+async def list_tensions(
+    status: list[TensionStatus] | None = Query(default=None),
+    vector: TensionVector | None = None,
+    field_id: int | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_db_session),
+):
+    """
+    Страница напряжений, новые сверху (keyset по created_at, id).
+
+    status можно повторять (?status=held&status=parked); по умолчанию — активные (held, forming).
+    """
+    items, next_cursor = await _page(
+        session,
+        statuses=tuple(status) if status else ACTIVE_STATUSES,
+        vector=vector,
+        field_id=field_id,
+        limit=limit,
+        cursor=cursor,
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/active", response_model=list[TensionOut])
+async def list_active(
+    response: Response,
+    limit: int | None = None,
+    cursor: str | None = None,
+    vector: TensionVector | None = None,
+    field_id: int | None = None,
+    session: AsyncSession = Depends(get_db_session),
+):
+    # тело — по-прежнему список; курсор следующей страницы — в заголовке X-Next-Cursor
+    items, next_cursor = await _page(
+        session,
+        statuses=ACTIVE_STATUSES,
+        vector=vector,
+        field_id=field_id,
+        limit=limit,
+        cursor=cursor,
+        cached=True,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+
+@router.get("/similar", response_model=list[SimilarTensionOut])
+async def similar_tensions(
+    title: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(default=3, ge=1, le=20),
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Похожие активные напряжения (по заголовку) — проверить захват до POST /tensions."""
+    similar = await TensionsRepo(session).find_similar(
+        title, threshold=settings.tension_duplicate_threshold, limit=limit
+    )
+    return _similar_out(similar)
+
+
+@router.get("/search", response_model=TensionsSearchOut)
+async def search_tensions(
+    q: str = Query(..., min_length=1, max_length=200),
+    status: list[TensionStatus] | None = Query(default=None),
+    limit: int | None = None,
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_db_session),
+):
+    """
+    Поиск по заголовку и заметкам (captured/released), самые релевантные сверху.
+
+    Слова ищутся по префиксу; если точных совпадений нет — нечётко (опечатки).
+    status как в GET /tensions (по умолчанию активные); страницы — через next_cursor.
+    """
+    limit = limit or settings.tensions_page_size
+    if not 1 <= limit <= settings.tensions_max_page_size:
+        raise HTTPException(
+            status_code=400, detail=f"limit must be between 1 and {settings.tensions_max_page_size}"
+        )
+    try:
+        hits, next_cursor = await TensionsRepo(session).search_page(
+            q, statuses=tuple(status) if status else ACTIVE_STATUSES, limit=limit, cursor=cursor
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    items = [{**TensionOut.model_validate(t).model_dump(), "rank": float(rank)} for t, rank in hits]
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/top", response_model=list[TensionOut])
+async def list_top(limit: int = 10, session: AsyncSession = Depends(get_db_session)):
+    """Самые срочные активные напряжения (по urgency, затем самые старые)."""
+    if not 1 <= limit <= settings.tensions_top_max:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {settings.tensions_top_max}")
+    return await TensionsRepo(session).list_top(limit)
 
 
 @router.patch("/{tension_id}", response_model=TensionOut)
@@ -110,6 +309,19 @@ async def update_tension(
     return t
 
 
+@router.post("/{tension_id}/postpone", response_model=TensionOut)
+async def postpone_tension(
+    tension_id: int,
+    payload: PostponeTensionIn,
+    session: AsyncSession = Depends(get_db_session),
+):
+    repo = TensionsRepo(session)
+    t = await repo.postpone_tension(tension_id, delay=timedelta(minutes=payload.minutes), actor="user")
+    if not t:
+        raise HTTPException(status_code=404, detail="Active tension not found")
+    return t
+
+
 @router.post("/{tension_id}/release", response_model=TensionOut)
 async def release_tension(
     tension_id: int,
@@ -0,0 +1,96 @@
+"""
+Синхронизация локального зеркала Google Calendar (calendar_events).
+
+- первый запуск / 410 Gone -> полная выгрузка и замена зеркала;
+- дальше — только дельты по nextSyncToken.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.services.google_calendar import SyncTokenExpired, list_event_changes
+from app.infra.repos.calendar_events_repo import CalendarEventsRepo
+from app.settings import settings
+
+logger = logging.getLogger("helix.calendar_sync")
+
+# одна синхронизация на процесс за раз: параллельные чтения ждут её, а не дублируют
+_sync_lock = asyncio.Lock()
+
+
+async def sync_calendar(
+    client: httpx.AsyncClient,
+    access_token: str,
+    session: AsyncSession,
+    *,
+    tz_name: str,
+    calendar_id: str = "primary",
+    mirror_key: str | None = None,
+) -> int:
+    # mirror_key — под каким id календарь лежит в зеркале (для не-дефолтных аккаунтов)
+    key = mirror_key or calendar_id
+    repo = CalendarEventsRepo(session)
+    state = await repo.get_sync_state(key)
+    sync_token = state.sync_token if state else None
+
+    if sync_token:
+        try:
+            items, next_token = await list_event_changes(
+                client,
+                access_token,
+                calendar_id=calendar_id,
+                sync_token=sync_token,
+                page_size=settings.google_events_page_size,
+            )
+            return await repo.apply_changes(key, items, tz_name=tz_name, sync_token=next_token)
+        except SyncTokenExpired:
+            logger.info("syncToken expired for calendar %s, doing full resync", calendar_id)
+
+    items, next_token = await list_event_changes(
+        client,
+        access_token,
+        calendar_id=calendar_id,
+        page_size=settings.google_events_page_size,
+    )
+    return await repo.apply_changes(key, items, tz_name=tz_name, sync_token=next_token, full=True)
+
+
+async def ensure_synced(
+    client: httpx.AsyncClient,
+    access_token: str,
+    session: AsyncSession,
+    *,
+    tz_name: str,
+    max_age_sec: int,
+    calendar_id: str = "primary",
+    mirror_key: str | None = None,
+) -> None:
+    """
+    Подтягивает дельты, если зеркало старше max_age_sec.
+
+    Если Google недоступен, но зеркало уже есть — отдаём то, что есть.
+    """
+    async with _sync_lock:
+        repo = CalendarEventsRepo(session)
+        state = await repo.get_sync_state(mirror_key or calendar_id)
+        now = datetime.now(timezone.utc)
+        if state and state.last_synced_at and now - state.last_synced_at < timedelta(seconds=max_age_sec):
+            return
+
+        has_mirror = bool(state and state.sync_token)
+        last_synced_at = state.last_synced_at if state else None
+        try:
+            await sync_calendar(
+                client, access_token, session, tz_name=tz_name, calendar_id=calendar_id, mirror_key=mirror_key
+            )
+        except httpx.HTTPError:
+            if not has_mirror:
+                raise
+            await session.rollback()
+            logger.warning("calendar %s sync failed, serving mirror as of %s", calendar_id, last_synced_at)
@@ -0,0 +1,235 @@
+"""
+Push-уведомления Google Calendar (events.watch) -> инвалидация и ресинк зеркала.
+
+- при старте и заранее до expiration регистрируем канал на settings.google_webhook_url;
+- Google шлёт POST /calendar/webhook с заголовками X-Goog-*;
+- на каждое "exists" уведомление — инкрементальный sync зеркала в фоне
+  (схлопываем пачку уведомлений в один sync) и сброс ETag-кэша;
+- пока канал жив, чтения не ходят в Google по таймеру
+  (только страховочный sync раз в calendar_watch_fallback_sync_sec).
+
+Каналы живут в таблице calendar_watch_channels, а не в памяти процесса: при
+нескольких воркерах уведомление приходит в любой из них, и канал ищется в БД.
+Регистрирует и продлевает канал один процесс на базу (advisory lock на шаг
+продления, как у UrgencyRefresher), остальные только перечитывают каналы раз
+в RELOAD_SEC — для mirror_max_age_sec.
+
+Локально канал можно проверить без Google: достаточно POST с заголовками
+X-Goog-Channel-ID / X-Goog-Channel-Token из таблицы calendar_watch_channels
+и X-Goog-Resource-State: exists.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from fastapi import Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.services.calendar_sync import ensure_synced
+from app.domain.services.google_calendar import stop_channel, watch_events
+from app.domain.services.google_token_manager import GoogleNotConnected, GoogleTokenManager
+from app.infra.db.models.calendar_watch_channels import CalendarWatchChannel
+from app.infra.db.session import SessionLocal
+from app.infra.etag_cache import ETagCache
+from app.infra.repos.calendar_watch_repo import CalendarWatchRepo
+from app.settings import settings
+
+logger = logging.getLogger("helix.calendar_watch")
+
+RETRY_SEC = 300
+# как часто воркер перечитывает каналы из БД (их мог продлить другой процесс)
+RELOAD_SEC = 300
+# канала нет, а lock держит другой процесс — он как раз регистрирует новый
+LEADER_WAIT_SEC = 5
+WATCH_LOCK = "helix_calendar_watch"
+
+
+class UnknownChannel(Exception):
+    pass
+
+
+class CalendarWatcher:
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        tokens: GoogleTokenManager,
+        etag_cache: ETagCache,
+        *,
+        calendar_id: str = "primary",
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+    ):
+        self._http = http
+        self._tokens = tokens
+        self._etag_cache = etag_cache
+        self._calendar_id = calendar_id
+        self._session_factory = session_factory
+
+        self._channels: dict[str, CalendarWatchChannel] = {}
+        self._renewer: asyncio.Task[None] | None = None
+        self._sync_task: asyncio.Task[None] | None = None
+        self._dirty = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.google_webhook_url)
+
+    def is_active(self) -> bool:
+        now = datetime.now(timezone.utc)
+        return any(ch.expiration > now for ch in self._channels.values())
+
+    def mirror_max_age_sec(self, mirror_key: str) -> int:
+        # push освежает только зеркало, за которым следит канал (primary дефолтного аккаунта);
+        # зеркала других аккаунтов живут на обычном max age
+        if mirror_key == self._calendar_id and self.is_active():
+            return settings.calendar_watch_fallback_sync_sec
+        return settings.calendar_sync_max_age_sec
+
+    async def start(self) -> None:
+        await self._reload()
+        if self.enabled:
+            self._renewer = asyncio.create_task(self._renew_loop(), name="calendar-watch-renewer")
+
+    async def stop(self) -> None:
+        for task in (self._renewer, self._sync_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._renewer = None
+        self._sync_task = None
+
+    async def _reload(self) -> None:
+        async with self._session_factory() as db:
+            channels = await CalendarWatchRepo(db).list_channels(self._calendar_id)
+        self._channels = {ch.channel_id: ch for ch in channels}
+
+    async def handle_notification(self, *, channel_id: str, token: str | None, resource_state: str) -> None:
+        # канал мог зарегистрировать другой воркер — смотрим в БД, а не в память
+        async with self._session_factory() as db:
+            ch = await CalendarWatchRepo(db).get_channel(channel_id)
+        if ch is None:
+            raise UnknownChannel(channel_id)
+        if not token or not secrets.compare_digest(token, ch.token):
+            raise PermissionError(channel_id)
+
+        # "sync" — служебное первое сообщение после регистрации канала
+        if resource_state == "sync":
+            return
+
+        self._etag_cache.clear()
+        self._dirty = True
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_pending())
+
+    async def _sync_pending(self) -> None:
+        # пачка уведомлений подряд -> один-два sync, а не по sync на каждое
+        while self._dirty:
+            self._dirty = False
+            try:
+                access_token = await self._tokens.get_access_token()
+                async with self._session_factory() as db:
+                    await ensure_synced(
+                        self._http,
+                        access_token,
+                        db,
+                        tz_name=settings.user_timezone,
+                        max_age_sec=0,
+                        calendar_id=self._calendar_id,
+                    )
+            except Exception:
+                logger.exception("push-triggered calendar sync failed")
+
+    async def _register(self) -> CalendarWatchChannel:
+        access_token = await self._tokens.get_access_token()
+        channel_id = str(uuid.uuid4())
+        token = secrets.token_urlsafe(32)
+        data = await watch_events(
+            self._http,
+            access_token,
+            calendar_id=self._calendar_id,
+            channel_id=channel_id,
+            address=settings.google_webhook_url,
+            token=token,
+            ttl_sec=settings.calendar_watch_ttl_sec,
+        )
+        now = datetime.now(timezone.utc)
+        expiration = (
+            datetime.fromtimestamp(int(data["expiration"]) / 1000, tz=timezone.utc)
+            if data.get("expiration")
+            else now + timedelta(seconds=settings.calendar_watch_ttl_sec)
+        )
+        async with self._session_factory() as db:
+            ch = await CalendarWatchRepo(db).add_channel(
+                channel_id=channel_id,
+                calendar_id=self._calendar_id,
+                resource_id=data["resourceId"],
+                token=token,
+                expiration=expiration,
+                created_at=now,
+            )
+        self._channels[channel_id] = ch
+        logger.info("calendar watch channel %s registered until %s", channel_id, expiration)
+        return ch
+
+    async def _retire(self, ch: CalendarWatchChannel) -> None:
+        self._channels.pop(ch.channel_id, None)
+        try:
+            if ch.expiration > datetime.now(timezone.utc):
+                access_token = await self._tokens.get_access_token()
+                await stop_channel(self._http, access_token, channel_id=ch.channel_id, resource_id=ch.resource_id)
+        except Exception:
+            logger.warning("failed to stop calendar watch channel %s", ch.channel_id, exc_info=True)
+        async with self._session_factory() as db:
+            await CalendarWatchRepo(db).delete_channel(ch.channel_id)
+
+    async def renew(self) -> float:
+        """
+        Шаг продления: перечитать каналы и, если свежего нет, зарегистрировать новый.
+
+        Регистрирует только держатель advisory lock — один процесс на базу.
+        Возвращает, через сколько секунд повторить.
+        """
+        renew_ahead = timedelta(seconds=settings.calendar_watch_renew_ahead_sec)
+        async with self._session_factory() as lock_db:
+            # xact lock держится до конца транзакции lock_db (закрытие сессии) — не утечёт в пул
+            leader = await lock_db.scalar(select(func.pg_try_advisory_xact_lock(func.hashtext(WATCH_LOCK))))
+            await self._reload()
+            now = datetime.now(timezone.utc)
+            fresh = [ch for ch in self._channels.values() if ch.expiration - renew_ahead > now]
+            if not fresh:
+                if not leader:
+                    return LEADER_WAIT_SEC
+                new_ch = await self._register()
+                # новый канал уже принимает уведомления — старые можно гасить
+                for ch in list(self._channels.values()):
+                    if ch.channel_id != new_ch.channel_id:
+                        await self._retire(ch)
+                fresh = [new_ch]
+
+        next_renew = min(ch.expiration for ch in fresh) - renew_ahead
+        return min(RELOAD_SEC, max(1.0, (next_renew - datetime.now(timezone.utc)).total_seconds()))
+
+    async def _renew_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(await self.renew())
+            except asyncio.CancelledError:
+                raise
+            except GoogleNotConnected:
+                await asyncio.sleep(RETRY_SEC)
+            except Exception:
+                logger.exception("calendar watch renewal failed")
+                await asyncio.sleep(RETRY_SEC)
+
+
+def get_calendar_watcher(request: Request) -> CalendarWatcher:
+    return request.app.state.calendar_watcher
@@ -0,0 +1,107 @@
+"""
+Учёт недельных квот baseline-полей по времени в календаре.
+
+Событие относится к полю:
+- по extendedProperties.private.helix_field_id (так помечаем события, созданные HELIX);
+- иначе по префиксу "[Имя поля]" в summary (без учёта регистра).
+
+Минуты события режутся по границам недель (понедельник 00:00 в TZ пользователя)
+и хранятся в field_week_minutes. При изменении события в таблицу пишется только
+дельта (новый вклад - старый) — см. CalendarEventsRepo.apply_changes.
+All-day события в квоты не идут.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable
+from zoneinfo import ZoneInfo
+
+FIELD_ID_PROPERTY = "helix_field_id"
+
+WeekKey = tuple[int, date]  # (field_id, понедельник недели)
+
+
+class FieldAttributor:
+    def __init__(self, fields: Iterable[tuple[int, str]]):
+        self.ids: set[int] = set()
+        self.by_name: dict[str, int] = {}
+        for field_id, name in fields:
+            self.ids.add(field_id)
+            self.by_name.setdefault(name.strip().lower(), field_id)
+
+    def field_for(self, item: dict) -> int | None:
+        private = (item.get("extendedProperties") or {}).get("private") or {}
+        raw = private.get(FIELD_ID_PROPERTY)
+        if raw is not None:
+            try:
+                field_id = int(raw)
+            except (TypeError, ValueError):
+                field_id = None
+            if field_id in self.ids:
+                return field_id
+
+        summary = (item.get("summary") or "").lstrip()
+        if summary.startswith("["):
+            tag, sep, _ = summary[1:].partition("]")
+            if sep:
+                return self.by_name.get(tag.strip().lower())
+        return None
+
+
+def week_start(moment: datetime, tz: ZoneInfo) -> date:
+    local = moment.astimezone(tz).date()
+    return local - timedelta(days=local.weekday())
+
+
+def minutes_by_week(start_utc: datetime, end_utc: datetime, tz: ZoneInfo) -> dict[date, int]:
+    """Минуты [start, end), разрезанные по неделям в TZ пользователя."""
+    out: dict[date, int] = {}
+    cursor = start_utc
+    while cursor < end_utc:
+        monday = week_start(cursor, tz)
+        next_week = datetime.combine(monday + timedelta(days=7), time(0, 0), tzinfo=tz).astimezone(timezone.utc)
+        piece_end = min(end_utc, next_week)
+        minutes = int((piece_end - cursor).total_seconds() // 60)
+        if minutes > 0:
+            out[monday] = out.get(monday, 0) + minutes
+        cursor = piece_end
+    return out
+
+
+def add_contribution(
+    deltas: dict[WeekKey, int],
+    field_id: int | None,
+    start_utc: datetime,
+    end_utc: datetime,
+    is_all_day: bool,
+    tz: ZoneInfo,
+    sign: int,
+) -> None:
+    if field_id is None or is_all_day:
+        return
+    for monday, minutes in minutes_by_week(start_utc, end_utc, tz).items():
+        deltas[(field_id, monday)] += sign * minutes
+
+
+def new_deltas() -> dict[WeekKey, int]:
+    return defaultdict(int)
+
+
+@dataclass(frozen=True)
+class QuotaStatus:
+    field_id: int
+    name: str
+    minutes: int
+    min_quota: int
+    max_quota: int
+
+    @property
+    def status(self) -> str:
+        if self.minutes < self.min_quota:
+            return "under"
+        if self.max_quota and self.minutes > self.max_quota:
+            return "over"
+        return "ok"
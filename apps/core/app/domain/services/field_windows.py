@@ -0,0 +1,274 @@
+"""
+preferred_windows полей в скомпилированном виде.
+
+JSONB вида
+  {"timezone": "Europe/Bucharest",
+   "windows": [{"days": ["mon", "tue"], "start": "10:00", "end": "12:00"}]}
+валидируется при записи (validate_preferred_windows) и один раз компилируется
+в отсортированные непересекающиеся интервалы "минута недели" [0, 10080)
+в таймзоне поля. Дальше все вопросы — через bisect, O(log n):
+
+- CompiledWindows.contains(t) / overlap_minutes(start, end) — одно поле
+  (окна — по настенным часам TZ поля, overlap — в реальных минутах, в дни DST тоже);
+- WindowIndex.active_at(t) — какие поля предпочтительны в момент t.
+
+Скомпилированное кэшируется в field_windows_cache (ключ — id поля + updated_at),
+BaselineFieldsRepo.update_field/delete_field сбрасывают запись сразу.
+End "24:00" — конец суток; end < start — окно через полночь.
+"""
+
+from __future__ import annotations
+
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterable, Protocol
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.domain.services.free_slots import WEEKDAYS
+from app.settings import settings
+
+logger = logging.getLogger("helix.field_windows")
+
+DAY_MIN = 24 * 60
+WEEK_MIN = 7 * DAY_MIN
+# понедельник — точка отсчёта для "абсолютных" локальных минут
+_EPOCH_MONDAY = datetime(2001, 1, 1)
+
+
+def _parse_minute(value: str) -> int:
+    h, sep, m = value.partition(":")
+    if not sep or len(m) != 2:
+        raise ValueError(f"expected HH:MM, got {value!r}")
+    hh, mm = int(h), int(m)
+    if not (0 <= hh <= 24 and 0 <= mm < 60) or (hh == 24 and mm):
+        raise ValueError(f"expected HH:MM, got {value!r}")
+    return hh * 60 + mm
+
+
+def validate_preferred_windows(raw: dict) -> dict:
+    """Проверка формата; возвращает нормализованный dict, кривой формат -> ValueError."""
+    if not raw:
+        return {}
+    if not isinstance(raw, dict):
+        raise ValueError("preferred_windows must be an object")
+
+    out: dict = {}
+    tz_name = raw.get("timezone")
+    if tz_name is not None:
+        try:
+            ZoneInfo(tz_name)
+        except (ZoneInfoNotFoundError, ValueError, TypeError):
+            raise ValueError(f"unknown timezone {tz_name!r}")
+        out["timezone"] = tz_name
+
+    windows = raw.get("windows") or []
+    if not isinstance(windows, list):
+        raise ValueError("preferred_windows.windows must be a list")
+    out["windows"] = []
+    for i, w in enumerate(windows):
+        if not isinstance(w, dict) or "start" not in w or "end" not in w:
+            raise ValueError(f"windows[{i}] must have start and end")
+        days = w.get("days") or list(WEEKDAYS)
+        if not isinstance(days, list) or any(d not in WEEKDAYS for d in days):
+            raise ValueError(f"windows[{i}].days must be a list of {', '.join(WEEKDAYS)}")
+        try:
+            start, end = _parse_minute(w["start"]), _parse_minute(w["end"])
+        except (AttributeError, ValueError):
+            raise ValueError(f"windows[{i}]: start/end must be HH:MM")
+        if start == end or start == DAY_MIN:
+            raise ValueError(f"windows[{i}]: empty window")
+        out["windows"].append({"days": days, "start": w["start"], "end": w["end"]})
+    return out
+
+
+def _merge(intervals: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for a, b in sorted(intervals):
+        if merged and a <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+        else:
+            merged.append((a, b))
+    return merged
+
+
+@dataclass(frozen=True)
+class CompiledWindows:
+    tz: ZoneInfo
+    starts: tuple[int, ...]
+    ends: tuple[int, ...]
+    # prefix[i] — сколько минут покрыто интервалами до i-го
+    prefix: tuple[int, ...]
+
+    @property
+    def total(self) -> int:
+        return self.prefix[-1] if self.prefix else 0
+
+    def local_minute(self, moment: datetime) -> int:
+        """Локальная (wall-clock) минута от _EPOCH_MONDAY в TZ поля."""
+        local = moment.astimezone(self.tz).replace(tzinfo=None)
+        return int((local - _EPOCH_MONDAY).total_seconds() // 60)
+
+    def contains(self, moment: datetime) -> bool:
+        m = self.local_minute(moment) % WEEK_MIN
+        i = bisect_right(self.starts, m) - 1
+        return i >= 0 and m < self.ends[i]
+
+    def _covered(self, minute: int) -> int:
+        # минут окон на [0, minute) — неделями целиком + хвост через bisect
+        weeks, m = divmod(minute, WEEK_MIN)
+        i = bisect_right(self.starts, m) - 1
+        tail = 0 if i < 0 else self.prefix[i] + min(m, self.ends[i]) - self.starts[i]
+        return weeks * self.total + tail
+
+    def overlap_minutes(self, start: datetime, end: datetime) -> int:
+        """Сколько реальных минут [start, end) попадает в окна поля (и в дни перехода DST)."""
+        total = 0
+        for a, b in self._constant_offset_runs(start, end):
+            # внутри куска локальные часы идут вровень с реальными — считаем от локальной минуты начала
+            m = self.local_minute(a)
+            total += self._covered(m + int((b - a).total_seconds() // 60)) - self._covered(m)
+        return max(0, total)
+
+    def _constant_offset_runs(self, start: datetime, end: datetime) -> Iterable[tuple[datetime, datetime]]:
+        """[start, end), разрезанный в моменты смены UTC offset (шаг — сутки, переход ищется bisect по минутам)."""
+        cursor = start
+        while cursor < end:
+            offset = cursor.astimezone(self.tz).utcoffset()
+            nxt = min(end, cursor + timedelta(days=1))
+            if nxt.astimezone(self.tz).utcoffset() != offset:
+                lo, hi = 0, int((nxt - cursor).total_seconds() // 60)
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if (cursor + timedelta(minutes=mid)).astimezone(self.tz).utcoffset() == offset:
+                        lo = mid
+                    else:
+                        hi = mid
+                nxt = min(end, cursor + timedelta(minutes=max(hi, 1)))
+            yield cursor, nxt
+            cursor = nxt
+
+    def intervals(self, first: date, last: date) -> list[tuple[datetime, datetime]]:
+        """Конкретные окна на днях [first, last] (aware datetime в TZ поля)."""
+        lo = datetime.combine(first, datetime.min.time())
+        hi = datetime.combine(last + timedelta(days=1), datetime.min.time())
+        monday = lo - timedelta(days=lo.weekday())
+        out: list[tuple[datetime, datetime]] = []
+        while monday < hi:
+            for s, e in zip(self.starts, self.ends):
+                a = max(lo, monday + timedelta(minutes=s))
+                b = min(hi, monday + timedelta(minutes=e))
+                if b <= a:
+                    continue
+                a, b = a.replace(tzinfo=self.tz), b.replace(tzinfo=self.tz)
+                if out and out[-1][1] == a:
+                    # окно через полночь воскресенья — одним интервалом
+                    out[-1] = (out[-1][0], b)
+                else:
+                    out.append((a, b))
+            monday += timedelta(days=7)
+        return out
+
+
+def compile_windows(preferred_windows: dict, default_tz: str) -> CompiledWindows | None:
+    """None — у поля нет окон (ограничений нет)."""
+    pw = validate_preferred_windows(preferred_windows)
+    if not pw.get("windows"):
+        return None
+    tz = ZoneInfo(pw.get("timezone") or default_tz)
+
+    raw: list[tuple[int, int]] = []
+    for w in pw["windows"]:
+        start, end = _parse_minute(w["start"]), _parse_minute(w["end"])
+        if end < start:
+            end += DAY_MIN  # через полночь
+        for d in w["days"]:
+            a, b = WEEKDAYS.index(d) * DAY_MIN + start, WEEKDAYS.index(d) * DAY_MIN + end
+            if b > WEEK_MIN:
+                # воскресенье через полночь -> хвост в понедельник
+                raw.append((0, b - WEEK_MIN))
+                b = WEEK_MIN
+            raw.append((a, b))
+
+    merged = _merge(raw)
+    prefix = [0]
+    for a, b in merged:
+        prefix.append(prefix[-1] + b - a)
+    return CompiledWindows(
+        tz=tz,
+        starts=tuple(a for a, _ in merged),
+        ends=tuple(b for _, b in merged),
+        prefix=tuple(prefix),
+    )
+
+
+class WindowIndex:
+    """Все поля сразу: границы окон одной TZ сведены в один отсортированный массив."""
+
+    def __init__(self, compiled: dict[int, CompiledWindows]):
+        by_tz: dict[str, dict[int, CompiledWindows]] = {}
+        for field_id, cw in compiled.items():
+            by_tz.setdefault(cw.tz.key, {})[field_id] = cw
+
+        # tz -> (границы, активные поля на [bounds[i], bounds[i+1]))
+        self._groups: list[tuple[ZoneInfo, list[int], list[frozenset[int]]]] = []
+        for group in by_tz.values():
+            tz = next(iter(group.values())).tz
+            bounds = sorted({0, WEEK_MIN} | {m for cw in group.values() for m in (*cw.starts, *cw.ends)})
+            active: list[frozenset[int]] = []
+            for m in bounds:
+                active.append(frozenset(
+                    fid for fid, cw in group.items()
+                    if (i := bisect_right(cw.starts, m) - 1) >= 0 and m < cw.ends[i]
+                ))
+            self._groups.append((tz, bounds, active))
+
+    def active_at(self, moment: datetime) -> set[int]:
+        out: set[int] = set()
+        for tz, bounds, active in self._groups:
+            local = moment.astimezone(tz).replace(tzinfo=None)
+            m = int((local - _EPOCH_MONDAY).total_seconds() // 60) % WEEK_MIN
+            out |= active[bisect_right(bounds, m) - 1]
+        return out
+
+
+class _FieldRow(Protocol):
+    id: int
+    preferred_windows: dict
+    updated_at: datetime
+
+
+class FieldWindowsCache:
+    def __init__(self):
+        self._entries: dict[int, tuple[datetime, CompiledWindows | None]] = {}
+        self._index: tuple[frozenset, WindowIndex] | None = None
+
+    def get(self, field: _FieldRow) -> CompiledWindows | None:
+        entry = self._entries.get(field.id)
+        if entry is not None and entry[0] == field.updated_at:
+            return entry[1]
+        try:
+            compiled = compile_windows(field.preferred_windows or {}, settings.user_timezone)
+        except (ValueError, ZoneInfoNotFoundError):
+            # старые строки до валидации на записи
+            logger.warning("baseline field %s has malformed preferred_windows, ignoring them", field.id)
+            compiled = None
+        self._entries[field.id] = (field.updated_at, compiled)
+        return compiled
+
+    def index(self, fields: Iterable[_FieldRow]) -> WindowIndex:
+        fields = list(fields)
+        key = frozenset((f.id, f.updated_at) for f in fields)
+        if self._index is None or self._index[0] != key:
+            compiled = {f.id: cw for f in fields if (cw := self.get(f)) is not None}
+            self._index = (key, WindowIndex(compiled))
+        return self._index[1]
+
+    def invalidate(self, field_id: int) -> None:
+        self._entries.pop(field_id, None)
+        self._index = None
+
+
+# один на процесс (API и бот живут в разных процессах — там ключ updated_at)
+field_windows_cache = FieldWindowsCache()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from datetime import datetime, timedelta, time
+from datetime import date, datetime, timedelta, time
 from zoneinfo import ZoneInfo
 
 @dataclass(frozen=True)
@@ -12,30 +12,24 @@ def _parse_iso(dt: str) -> datetime:
     # dt from Google includes timezone offset; datetime.fromisoformat handles it
     return datetime.fromisoformat(dt)
 
-def find_free_slots(
-    *,
-    events: list[dict],
-    tz_name: str,
-    date_iso: str,           # "2026-02-08"
-    duration_min: int,
-    work_start: str = "09:00",
-    work_end: str = "18:00",
-    buffer_min: int = 10,
-    max_slots: int = 3,
-) -> list[Slot]:
-    tz = ZoneInfo(tz_name)
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
 
-    ws_h, ws_m = map(int, work_start.split(":"))
-    we_h, we_m = map(int, work_end.split(":"))
+# по умолчанию: будни 09:00-18:00, выходные не планируем
+DEFAULT_WORK_HOURS: dict[str, tuple[str, str] | None] = {
+    "mon": ("09:00", "18:00"),
+    "tue": ("09:00", "18:00"),
+    "wed": ("09:00", "18:00"),
+    "thu": ("09:00", "18:00"),
+    "fri": ("09:00", "18:00"),
+    "sat": None,
+    "sun": None,
+}
 
-    day = datetime.fromisoformat(date_iso).date()
-    day_start = datetime.combine(day, time(ws_h, ws_m), tzinfo=tz)
-    day_end = datetime.combine(day, time(we_h, we_m), tzinfo=tz)
-
-    dur = timedelta(minutes=duration_min)
-    buf = timedelta(minutes=buffer_min)
+def parse_hhmm(value: str) -> time:
+    h, m = map(int, value.split(":"))
+    return time(h, m)
 
-    # Build busy intervals (clipped to workday)
+def busy_intervals(events: list[dict], tz: ZoneInfo) -> list[tuple[datetime, datetime]]:
     busy: list[tuple[datetime, datetime]] = []
     for e in events:
         s = e.get("start")
@@ -47,23 +41,31 @@ def find_free_slots(
         if len(s) == 10 or len(en) == 10:
             continue
 
-        a = _parse_iso(s).astimezone(tz)
-        b = _parse_iso(en).astimezone(tz)
+        busy.append((_parse_iso(s).astimezone(tz), _parse_iso(en).astimezone(tz)))
+    return busy
 
-        # clamp to work window
+def _day_slots(
+    busy: list[tuple[datetime, datetime]],
+    day_start: datetime,
+    day_end: datetime,
+    dur: timedelta,
+    buf: timedelta,
+    max_slots: int,
+) -> list[Slot]:
+    # clip busy intervals to workday, then add buffer around meetings
+    clipped: list[tuple[datetime, datetime]] = []
+    for a, b in busy:
         a2 = max(a, day_start)
         b2 = min(b, day_end)
         if b2 <= a2:
             continue
+        clipped.append((a2 - buf, b2 + buf))
 
-        # add buffer around meetings
-        busy.append((a2 - buf, b2 + buf))
-
-    busy.sort(key=lambda x: x[0])
+    clipped.sort(key=lambda x: x[0])
 
     # merge overlaps
     merged: list[tuple[datetime, datetime]] = []
-    for a, b in busy:
+    for a, b in clipped:
         if not merged or a > merged[-1][1]:
             merged.append((a, b))
         else:
@@ -90,3 +92,83 @@ def find_free_slots(
         slots.append(Slot(start=start.isoformat(), end=(start + dur).isoformat()))
 
     return slots
+
+def find_free_slots(
+    *,
+    events: list[dict],
+    tz_name: str,
+    date_iso: str,           # "2026-02-08"
+    duration_min: int,
+    work_start: str = "09:00",
+    work_end: str = "18:00",
+    buffer_min: int = 10,
+    max_slots: int = 3,
+) -> list[Slot]:
+    tz = ZoneInfo(tz_name)
+
+    day = datetime.fromisoformat(date_iso).date()
+    day_start = datetime.combine(day, parse_hhmm(work_start), tzinfo=tz)
+    day_end = datetime.combine(day, parse_hhmm(work_end), tzinfo=tz)
+
+    return _day_slots(
+        busy_intervals(events, tz),
+        day_start,
+        day_end,
+        timedelta(minutes=duration_min),
+        timedelta(minutes=buffer_min),
+        max_slots,
+    )
+
+def find_free_slots_range(
+    *,
+    events: list[dict],
+    tz_name: str,
+    start_date_iso: str,     # "2026-02-09"
+    end_date_iso: str,       # "2026-02-15" (inclusive)
+    duration_min: int,
+    work_hours: dict[str, tuple[str, str] | None] | None = None,
+    buffer_min: int = 10,
+    max_slots_per_day: int = 3,
+    max_total: int | None = None,
+) -> dict[str, list[Slot]]:
+    """
+    Свободные слоты по дням диапазона за один проход по событиям.
+
+    work_hours: {"mon": ("09:00", "18:00"), ..., "sun": None}; None/нет ключа — день пропускаем.
+    Результат: {"YYYY-MM-DD": [Slot, ...]} в порядке дней.
+    """
+    tz = ZoneInfo(tz_name)
+    hours = DEFAULT_WORK_HOURS if work_hours is None else work_hours
+
+    first = datetime.fromisoformat(start_date_iso).date()
+    last = datetime.fromisoformat(end_date_iso).date()
+    dur = timedelta(minutes=duration_min)
+    buf = timedelta(minutes=buffer_min)
+
+    # bucket busy intervals by the local days they touch (one pass over events)
+    by_day: dict[date, list[tuple[datetime, datetime]]] = {}
+    for a, b in busy_intervals(events, tz):
+        d = max(a.date(), first)
+        end_d = min(b.date(), last)
+        while d <= end_d:
+            by_day.setdefault(d, []).append((a, b))
+            d += timedelta(days=1)
+
+    out: dict[str, list[Slot]] = {}
+    remaining = max_total
+    day = first
+    while day <= last:
+        if remaining is not None and remaining <= 0:
+            break
+        window = hours.get(WEEKDAYS[day.weekday()])
+        if window:
+            day_start = datetime.combine(day, parse_hhmm(window[0]), tzinfo=tz)
+            day_end = datetime.combine(day, parse_hhmm(window[1]), tzinfo=tz)
+            limit = max_slots_per_day if remaining is None else min(max_slots_per_day, remaining)
+            slots = _day_slots(by_day.get(day, []), day_start, day_end, dur, buf, limit)
+            out[day.isoformat()] = slots
+            if remaining is not None:
+                remaining -= len(slots)
+        day += timedelta(days=1)
+
+    return out
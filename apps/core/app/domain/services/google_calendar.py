@@ -1,33 +1,344 @@
+import asyncio
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import AsyncIterator
+from urllib.parse import quote
 import httpx
 
+from app.domain.services.field_quota import FIELD_ID_PROPERTY
+from app.infra.etag_cache import ETagCache
+
 GOOGLE_CAL_EVENTS_URL = "https://www.googleapis.com/calendar/v3/calendars/primary/events"
+GOOGLE_CAL_BASE_URL = "https://www.googleapis.com/calendar/v3/calendars"
+GOOGLE_FREEBUSY_URL = "https://www.googleapis.com/calendar/v3/freeBusy"
+GOOGLE_CHANNELS_STOP_URL = "https://www.googleapis.com/calendar/v3/channels/stop"
+
+# freeBusy.query принимает не больше 50 календарей за запрос
+FREEBUSY_MAX_ITEMS = 50
+
+
+class SyncTokenExpired(Exception):
+    """Google ответил 410 Gone на syncToken — нужен полный ресинк."""
+
+
+def calendar_events_url(calendar_id: str = "primary") -> str:
+    return f"{GOOGLE_CAL_BASE_URL}/{quote(calendar_id, safe='@')}/events"
+
+
+# partial response: только то, что реально читаем (id/summary/status/start/end + метка поля)
+EVENT_ITEM_FIELDS = "items(id,summary,status,start,end,extendedProperties/private)"
+LIST_EVENTS_FIELDS = f"{EVENT_ITEM_FIELDS},nextPageToken"
+SYNC_EVENTS_FIELDS = f"{EVENT_ITEM_FIELDS},nextPageToken,nextSyncToken"
+
+
+async def _iter_pages(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict,
+    headers: dict,
+    cache: ETagCache | None = None,
+    cache_owner: str | None = None,
+) -> AsyncIterator[dict]:
+    # чужой аккаунт не должен получить закэшированную страницу (в т.ч. на 304 и при сбое сети)
+    if cache is not None and not cache_owner:
+        raise ValueError("cache_owner (Google account id) is required with an ETag cache")
+    page_token: str | None = None
+    while True:
+        page_params = dict(params)
+        if page_token:
+            page_params["pageToken"] = page_token
+
+        key = cache.key(cache_owner, url, page_params) if cache else None
+        cached = cache.lookup(key) if cache else None
+        req_headers = {**headers, "If-None-Match": cached.etag} if cached else headers
+
+        try:
+            r = await client.get(url, params=page_params, headers=req_headers)
+        except httpx.TransportError:
+            # upstream недоступен / breaker открыт — лучше устаревшая страница, чем ошибка
+            if cached is None:
+                raise
+            yield cached.data
+            page_token = cached.data.get("nextPageToken")
+            if not page_token:
+                return
+            continue
+
+        if r.status_code == 304 and cached:
+            # не изменилось — отдаём уже распарсенный ответ
+            cache.mark_not_modified()
+            data = cached.data
+        else:
+            if r.status_code == 410:
+                raise SyncTokenExpired(url)
+            r.raise_for_status()
+            data = r.json()
+            etag = r.headers.get("ETag")
+            if cache and etag:
+                cache.store(key, etag, data, len(r.content))
+        yield data
+
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            return
+
 
-async def list_events(access_token: str, time_min_iso: str, time_max_iso: str) -> dict:
+async def iter_events(
+    client: httpx.AsyncClient,
+    access_token: str,
+    time_min_iso: str,
+    time_max_iso: str,
+    *,
+    calendar_id: str = "primary",
+    page_size: int = 250,
+    fields: str | None = LIST_EVENTS_FIELDS,
+    cache: ETagCache | None = None,
+    cache_owner: str | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Все события диапазона, постранично (nextPageToken), по мере прихода страниц.
+
+    fields=None — полные тела событий. cache — conditional GET по ETag;
+    cache_owner — аккаунт, чьим access_token идёт запрос (часть ключа кэша).
+    """
     params = {
         "timeMin": time_min_iso,
         "timeMax": time_max_iso,
         "singleEvents": "true",
         "orderBy": "startTime",
-        "maxResults": "50",
+        "maxResults": str(page_size),
     }
+    if fields:
+        params["fields"] = fields
     headers = {"Authorization": f"Bearer {access_token}"}
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.get(GOOGLE_CAL_EVENTS_URL, params=params, headers=headers)
-        r.raise_for_status()
-        return r.json()
+    async for page in _iter_pages(client, calendar_events_url(calendar_id), params, headers, cache, cache_owner):
+        for item in page.get("items", []):
+            yield item
+
+
+async def list_events(
+    client: httpx.AsyncClient,
+    access_token: str,
+    time_min_iso: str,
+    time_max_iso: str,
+    *,
+    calendar_id: str = "primary",
+    page_size: int = 250,
+    fields: str | None = LIST_EVENTS_FIELDS,
+    cache: ETagCache | None = None,
+    cache_owner: str | None = None,
+) -> dict:
+    items = [
+        it
+        async for it in iter_events(
+            client,
+            access_token,
+            time_min_iso,
+            time_max_iso,
+            calendar_id=calendar_id,
+            page_size=page_size,
+            fields=fields,
+            cache=cache,
+            cache_owner=cache_owner,
+        )
+    ]
+    return {"items": items}
+
+
+async def list_event_changes(
+    client: httpx.AsyncClient,
+    access_token: str,
+    *,
+    calendar_id: str = "primary",
+    sync_token: str | None = None,
+    page_size: int = 250,
+) -> tuple[list[dict], str | None]:
+    """
+    Инкрементальная выборка (events.list + syncToken).
+
+    Без sync_token — полная выгрузка календаря. Возвращает (items, nextSyncToken).
+    Удалённые события приходят со status="cancelled".
+    """
+    headers = {"Authorization": f"Bearer {access_token}"}
+    params = {
+        "singleEvents": "true",
+        "maxResults": str(page_size),
+        "fields": SYNC_EVENTS_FIELDS,
+    }
+    if sync_token:
+        params["syncToken"] = sync_token
+
+    items: list[dict] = []
+    next_sync_token: str | None = None
+    async for page in _iter_pages(client, calendar_events_url(calendar_id), params, headers):
+        items.extend(page.get("items", []))
+        next_sync_token = page.get("nextSyncToken")
+    return items, next_sync_token
+
+
+@dataclass
+class FreeBusy:
+    # calendar_id -> [{"start": RFC3339, "end": RFC3339}, ...] (тот же формат, что ждёт find_free_slots)
+    busy: dict[str, list[dict]] = field(default_factory=dict)
+    # calendar_id -> причина (notFound, forbidden, ...)
+    errors: dict[str, str] = field(default_factory=dict)
 
+    def all_busy(self) -> list[dict]:
+        return [interval for intervals in self.busy.values() for interval in intervals]
 
-async def create_event(access_token: str, summary: str, start_iso: str, end_iso: str) -> dict:
+
+async def _freebusy_chunk(
+    client: httpx.AsyncClient,
+    access_token: str,
+    time_min_iso: str,
+    time_max_iso: str,
+    calendar_ids: list[str],
+) -> dict:
+    headers = {"Authorization": f"Bearer {access_token}"}
+    body = {
+        "timeMin": time_min_iso,
+        "timeMax": time_max_iso,
+        "items": [{"id": cid} for cid in calendar_ids],
+    }
+    # freeBusy.query — чтение, повторять безопасно
+    r = await client.post(GOOGLE_FREEBUSY_URL, json=body, headers=headers, extensions={"idempotent": True})
+    r.raise_for_status()
+    return r.json()
+
+
+async def query_freebusy(
+    client: httpx.AsyncClient,
+    access_token: str,
+    time_min_iso: str,
+    time_max_iso: str,
+    calendar_ids: list[str],
+) -> FreeBusy:
+    """
+    Только интервалы занятости (freeBusy.query), без тел событий.
+
+    До 50 календарей — один запрос; больше — параллельные запросы по 50.
+    """
+    chunks = [calendar_ids[i:i + FREEBUSY_MAX_ITEMS] for i in range(0, len(calendar_ids), FREEBUSY_MAX_ITEMS)]
+    responses = await asyncio.gather(
+        *(_freebusy_chunk(client, access_token, time_min_iso, time_max_iso, chunk) for chunk in chunks)
+    )
+
+    out = FreeBusy()
+    for data in responses:
+        for cid, cal in (data.get("calendars") or {}).items():
+            errors = cal.get("errors") or []
+            if errors:
+                out.errors[cid] = errors[0].get("reason", "unknown")
+                continue
+            out.busy[cid] = [{"start": b["start"], "end": b["end"]} for b in cal.get("busy", [])]
+    return out
+
+
+async def create_event(
+    client: httpx.AsyncClient,
+    access_token: str,
+    summary: str,
+    start_iso: str,
+    end_iso: str,
+    field_id: int | None = None,
+) -> dict:
     headers = {"Authorization": f"Bearer {access_token}"}
     payload = {
         "summary": summary,
         "start": {"dateTime": start_iso},
         "end": {"dateTime": end_iso},
     }
+    if field_id is not None:
+        # метка baseline-поля: по ней время события идёт в недельную квоту поля
+        payload["extendedProperties"] = {"private": {FIELD_ID_PROPERTY: str(field_id)}}
+
+    r = await client.post(GOOGLE_CAL_EVENTS_URL, json=payload, headers=headers)
+    r.raise_for_status()
+    return r.json()
+
+
+@dataclass
+class NewEvent:
+    summary: str
+    start_iso: str
+    end_iso: str
+    field_id: int | None = None
+
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.post(GOOGLE_CAL_EVENTS_URL, json=payload, headers=headers)
+@dataclass
+class CreateResult:
+    index: int
+    event: dict | None = None
+    status_code: int | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.event is not None
+
+
+async def create_events(
+    client: httpx.AsyncClient,
+    access_token: str,
+    events: list[NewEvent],
+    *,
+    concurrency: int = 8,
+) -> list[CreateResult]:
+    """
+    Пачка events.insert параллельно (не больше concurrency одновременно).
+
+    Ошибка одного события не роняет остальные — результат по каждому, в порядке входа.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(index: int, ev: NewEvent) -> CreateResult:
+        async with sem:
+            try:
+                created = await create_event(
+                    client, access_token, ev.summary, ev.start_iso, ev.end_iso, field_id=ev.field_id
+                )
+            except httpx.HTTPStatusError as e:
+                return CreateResult(index=index, status_code=e.response.status_code, error=e.response.reason_phrase)
+            except httpx.TransportError as e:
+                return CreateResult(index=index, error=type(e).__name__)
+        return CreateResult(index=index, event=created)
+
+    return list(await asyncio.gather(*(one(i, ev) for i, ev in enumerate(events))))
+
+
+async def watch_events(
+    client: httpx.AsyncClient,
+    access_token: str,
+    *,
+    calendar_id: str,
+    channel_id: str,
+    address: str,
+    token: str,
+    ttl_sec: int,
+) -> dict:
+    """events.watch: Google будет слать POST на address при изменениях календаря."""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    payload = {
+        "id": channel_id,
+        "type": "web_hook",
+        "address": address,
+        "token": token,
+        "params": {"ttl": str(ttl_sec)},
+    }
+    r = await client.post(f"{calendar_events_url(calendar_id)}/watch", json=payload, headers=headers)
+    r.raise_for_status()
+    return r.json()
+
+
+async def stop_channel(client: httpx.AsyncClient, access_token: str, *, channel_id: str, resource_id: str) -> None:
+    headers = {"Authorization": f"Bearer {access_token}"}
+    r = await client.post(
+        GOOGLE_CHANNELS_STOP_URL,
+        json={"id": channel_id, "resourceId": resource_id},
+        headers=headers,
+        extensions={"idempotent": True},
+    )
+    # 404 — канал уже истёк/удалён на стороне Google
+    if r.status_code != 404:
         r.raise_for_status()
-        return r.json()
@@ -1,3 +1,5 @@
+import base64
+import json
 from datetime import datetime, timedelta
 from urllib.parse import urlencode
 import httpx
@@ -8,13 +10,17 @@ GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 
 CALENDAR_SCOPE = "https://www.googleapis.com/auth/calendar.events"
+# openid email — чтобы в ответе был id_token с email аккаунта (ключ токена в БД)
+IDENTITY_SCOPES = "openid email"
+
+DEFAULT_ACCOUNT = "default"
 
 def build_google_auth_url(state: str) -> str:
     params = {
         "client_id": settings.google_client_id,
         "redirect_uri": settings.google_redirect_uri,
         "response_type": "code",
-        "scope": CALENDAR_SCOPE,
+        "scope": f"{IDENTITY_SCOPES} {CALENDAR_SCOPE}",
         "access_type": "offline",      # нужен refresh_token
         "prompt": "consent",           # чтобы refresh_token точно пришёл
         "include_granted_scopes": "true",
@@ -22,7 +28,7 @@ def build_google_auth_url(state: str) -> str:
     }
     return f"{GOOGLE_AUTH_URL}?{urlencode(params)}"
 
-async def exchange_code_for_tokens(code: str) -> dict:
+async def exchange_code_for_tokens(client: httpx.AsyncClient, code: str) -> dict:
     data = {
         "client_id": settings.google_client_id,
         "client_secret": settings.google_client_secret,
@@ -30,24 +36,38 @@ async def exchange_code_for_tokens(code: str) -> dict:
         "grant_type": "authorization_code",
         "code": code,
     }
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.post(GOOGLE_TOKEN_URL, data=data)
-        r.raise_for_status()
-        return r.json()
+    r = await client.post(GOOGLE_TOKEN_URL, data=data)
+    r.raise_for_status()
+    return r.json()
 
-async def refresh_access_token(refresh_token: str) -> dict:
+async def refresh_access_token(client: httpx.AsyncClient, refresh_token: str) -> dict:
     data = {
         "client_id": settings.google_client_id,
         "client_secret": settings.google_client_secret,
         "grant_type": "refresh_token",
         "refresh_token": refresh_token,
     }
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.post(GOOGLE_TOKEN_URL, data=data)
-        r.raise_for_status()
-        return r.json()
+    # refresh можно безопасно повторить (в отличие от обмена одноразового code)
+    r = await client.post(GOOGLE_TOKEN_URL, data=data, extensions={"idempotent": True})
+    r.raise_for_status()
+    return r.json()
 
 def compute_expiry_utc(expires_in: int | None) -> datetime | None:
     if not expires_in:
         return None
     return datetime.utcnow() + timedelta(seconds=int(expires_in))
+
+def account_from_id_token(id_token: str | None) -> str:
+    """
+    Email (или sub) из id_token ответа token endpoint.
+
+    Подпись не проверяем: токен получен напрямую от Google по TLS, а не от клиента.
+    """
+    if not id_token:
+        return DEFAULT_ACCOUNT
+    try:
+        payload = id_token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (IndexError, ValueError):
+        return DEFAULT_ACCOUNT
+    return (claims.get("email") or claims.get("sub") or DEFAULT_ACCOUNT).lower()
@@ -0,0 +1,264 @@
+"""
+Google access tokens в памяти процесса, по аккаунтам.
+
+- токен аккаунта читается из google_oauth_tokens (по индексу account_id) один раз
+  и дальше живёт в LRU (settings.google_token_cache_size аккаунтов);
+- параллельные refresh одного аккаунта схлопываются в один запрос к Google (single-flight);
+- фоновая задача заранее, до expiry_utc, обновляет все закэшированные аккаунты,
+  которым пора, — параллельно, не больше settings.google_refresh_concurrency за раз;
+- в БД пишем только когда токен реально поменялся.
+
+Запрос без аккаунта идёт в settings.google_default_account, а если он не задан —
+в первый подключённый аккаунт (его календарь зеркалится как "primary").
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable
+
+import httpx
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.services.google_oauth import compute_expiry_utc, refresh_access_token
+from app.infra.db.session import SessionLocal
+from app.infra.repos.google_tokens_repo import GoogleTokensRepo
+from app.settings import settings
+
+logger = logging.getLogger("helix.google_tokens")
+
+
+class GoogleNotConnected(Exception):
+    def __init__(self, reason: str, detail: str):
+        super().__init__(detail)
+        self.reason = reason
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    access_token: str
+    refresh_token: str | None
+    expiry_utc: datetime | None  # naive UTC, как в google_oauth_tokens
+
+
+class GoogleTokenManager:
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        leeway_sec: int = 30,
+        renew_ahead_sec: int = 300,
+        retry_after_error_sec: int = 30,
+        max_cached: int | None = None,
+        refresh_concurrency: int | None = None,
+    ):
+        self._http = http
+        self._session_factory = session_factory
+        self._leeway = timedelta(seconds=leeway_sec)
+        self._renew_ahead = timedelta(seconds=renew_ahead_sec)
+        self._retry_after_error_sec = retry_after_error_sec
+        self._max_cached = max_cached or settings.google_token_cache_size
+        self._refresh_concurrency = refresh_concurrency or settings.google_refresh_concurrency
+
+        self._tokens: OrderedDict[str, CachedToken] = OrderedDict()
+        self._default_account: str | None = settings.google_default_account or None
+        self._load_lock = asyncio.Lock()
+        self._refresh_tasks: dict[str, asyncio.Task[CachedToken]] = {}
+        self._renewer: asyncio.Task[None] | None = None
+        self._wake = asyncio.Event()
+
+    def current(self, account_id: str | None = None) -> CachedToken | None:
+        account_id = account_id or self._default_account
+        return self._tokens.get(account_id) if account_id else None
+
+    async def start(self) -> None:
+        self._renewer = asyncio.create_task(self._renew_loop(), name="google-token-renewer")
+
+    async def stop(self) -> None:
+        if self._renewer:
+            self._renewer.cancel()
+            try:
+                await self._renewer
+            except asyncio.CancelledError:
+                pass
+            self._renewer = None
+
+    def set_token(
+        self,
+        *,
+        account_id: str,
+        access_token: str,
+        refresh_token: str | None,
+        expiry_utc: datetime | None,
+    ) -> None:
+        """Новый токен из OAuth callback (он уже записан в БД)."""
+        prev = self._tokens.get(account_id)
+        self._remember(account_id, CachedToken(
+            access_token=access_token,
+            # повторный consent может прийти без refresh_token — в БД остался старый
+            refresh_token=refresh_token or (prev.refresh_token if prev else None),
+            expiry_utc=expiry_utc,
+        ))
+        if self._default_account is None:
+            self._default_account = account_id
+        self._wake.set()
+
+    async def resolve_account(self, account_id: str | None = None) -> str:
+        if account_id:
+            return account_id.lower()
+        if self._default_account is None:
+            async with self._session_factory() as db:
+                row = await GoogleTokensRepo().get_first(db)
+            if row is None:
+                raise GoogleNotConnected("no_token", "Google Calendar not connected. Visit /oauth/google/start")
+            self._default_account = row.account_id
+        return self._default_account
+
+    async def get_access_token(self, account_id: str | None = None) -> str:
+        account_id = await self.resolve_account(account_id)
+        tok = await self._load(account_id)
+        if tok.expiry_utc and datetime.utcnow() > tok.expiry_utc - self._leeway:
+            tok = await self.refresh(account_id)
+        return tok.access_token
+
+    async def refresh(self, account_id: str) -> CachedToken:
+        # single-flight: все конкурентные вызовы по аккаунту ждут один и тот же запрос к Google
+        task = self._refresh_tasks.get(account_id)
+        if task is None or task.done():
+            task = asyncio.create_task(self._do_refresh(account_id))
+            self._refresh_tasks[account_id] = task
+            task.add_done_callback(lambda t: self._forget_task(account_id, t))
+        return await asyncio.shield(task)
+
+    async def refresh_many(self, account_ids: Iterable[str]) -> dict[str, Exception | None]:
+        """Refresh нескольких аккаунтов параллельно (не больше refresh_concurrency одновременно)."""
+        sem = asyncio.Semaphore(self._refresh_concurrency)
+
+        async def one(account_id: str) -> Exception | None:
+            async with sem:
+                try:
+                    await self.refresh(account_id)
+                except Exception as e:
+                    return e
+            return None
+
+        ids = list(dict.fromkeys(account_ids))
+        results = await asyncio.gather(*(one(a) for a in ids))
+        return dict(zip(ids, results))
+
+    def _forget_task(self, account_id: str, task: asyncio.Task) -> None:
+        if self._refresh_tasks.get(account_id) is task:
+            del self._refresh_tasks[account_id]
+
+    def _remember(self, account_id: str, tok: CachedToken) -> None:
+        self._tokens[account_id] = tok
+        self._tokens.move_to_end(account_id)
+        while len(self._tokens) > self._max_cached:
+            # вытесненный аккаунт просто перечитается из БД при следующем запросе
+            self._tokens.popitem(last=False)
+
+    async def _load(self, account_id: str) -> CachedToken:
+        tok = self._tokens.get(account_id)
+        if tok is not None:
+            self._tokens.move_to_end(account_id)
+            return tok
+
+        async with self._load_lock:
+            if account_id not in self._tokens:
+                async with self._session_factory() as db:
+                    row = await GoogleTokensRepo().get_by_account(db, account_id)
+                if row is not None:
+                    self._remember(account_id, CachedToken(
+                        access_token=row.access_token,
+                        refresh_token=row.refresh_token,
+                        expiry_utc=row.expiry_utc,
+                    ))
+                    self._wake.set()
+
+        tok = self._tokens.get(account_id)
+        if tok is None:
+            raise GoogleNotConnected(
+                "no_token", f"Google account {account_id} not connected. Visit /oauth/google/start"
+            )
+        return tok
+
+    async def _do_refresh(self, account_id: str) -> CachedToken:
+        tok = await self._load(account_id)
+        if not tok.refresh_token:
+            raise GoogleNotConnected("refresh_token_missing", "No refresh token. Reconnect via /oauth/google/start")
+
+        refreshed = await refresh_access_token(self._http, tok.refresh_token)
+        new_tok = CachedToken(
+            access_token=refreshed["access_token"],
+            # Google обычно не присылает refresh_token повторно
+            refresh_token=refreshed.get("refresh_token") or tok.refresh_token,
+            expiry_utc=compute_expiry_utc(refreshed.get("expires_in")),
+        )
+
+        if new_tok != tok:
+            async with self._session_factory() as db:
+                repo = GoogleTokensRepo()
+                row = await repo.get_by_account(db, account_id)
+                if row is not None:
+                    if new_tok.refresh_token != row.refresh_token:
+                        row.refresh_token = new_tok.refresh_token
+                    await repo.update_access(
+                        db, row, access_token=new_tok.access_token, expiry_utc=new_tok.expiry_utc
+                    )
+
+        self._remember(account_id, new_tok)
+        self._wake.set()
+        return new_tok
+
+    async def _renew_loop(self) -> None:
+        while True:
+            self._wake.clear()
+            renewable = {
+                account_id: tok.expiry_utc - self._renew_ahead
+                for account_id, tok in self._tokens.items()
+                if tok.expiry_utc is not None and tok.refresh_token
+            }
+            if not renewable:
+                # нечего обновлять — ждём, пока токен появится
+                await self._wake.wait()
+                continue
+
+            now = datetime.utcnow()
+            delay = (min(renewable.values()) - now).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                    continue  # токены сменились — пересчитываем
+                except asyncio.TimeoutError:
+                    pass
+
+            due = [a for a, renew_at in renewable.items() if renew_at <= datetime.utcnow()]
+            failed = {a: e for a, e in (await self.refresh_many(due)).items() if e is not None}
+            for account_id, e in failed.items():
+                logger.error("background Google token renewal failed for %s: %r", account_id, e)
+                if _is_permanent(e):
+                    # отозванный/битый refresh_token — не долбим Google в фоне,
+                    # аккаунт перечитается из БД при следующем запросе
+                    self._tokens.pop(account_id, None)
+            if any(not _is_permanent(e) for e in failed.values()):
+                await asyncio.sleep(self._retry_after_error_sec)
+
+
+def _is_permanent(e: Exception) -> bool:
+    if isinstance(e, GoogleNotConnected):
+        return True
+    if isinstance(e, httpx.HTTPStatusError):
+        status = e.response.status_code
+        return status < 500 and status != 429
+    return False
+
+
+def get_token_manager(request: Request) -> GoogleTokenManager:
+    return request.app.state.google_tokens
@@ -0,0 +1,171 @@
+"""
+Общие свободные слоты по многим календарям (sweep-line).
+
+Busy-интервалы всех календарей и рабочие окна превращаются в точки
+(+1 на начале, -1 на конце), сортируются один раз и проходятся одним проходом:
+на каждом отрезке между соседними точками известно, кто занят и рабочее ли это время.
+Никаких попарных пересечений календарей: O(E log E) на сортировку + линейный проход.
+
+quorum — сколько календарей из busy_by_calendar должно быть свободно (None — все).
+Календарь считается свободным, только если свободен на всём слоте. Нечитаемые
+календари сюда не передаются и свободными не считаются: quorum по всем запрошенным
+— тот же quorum по читаемым, и он не может их превышать.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.domain.services.availability_grid import work_windows
+from app.domain.services.free_slots import DEFAULT_WORK_HOURS
+
+
+@dataclass(frozen=True)
+class Segment:
+    start: datetime
+    end: datetime
+    busy: frozenset[str]
+
+
+@dataclass(frozen=True)
+class GroupSlot:
+    start: str
+    end: str
+    # занятые в этот слот календари (непусто только при quorum)
+    busy_calendars: tuple[str, ...] = ()
+
+
+def sweep(
+    busy_by_calendar: dict[str, list[tuple[datetime, datetime]]],
+    windows: list[tuple[datetime, datetime]],
+    *,
+    buffer: timedelta = timedelta(0),
+) -> list[Segment]:
+    """Рабочие отрезки с набором занятых календарей (соседние — с разным составом)."""
+    points: list[tuple[datetime, int, str | None]] = []
+    for cid, intervals in busy_by_calendar.items():
+        for a, b in intervals:
+            if b > a:
+                points.append((a - buffer, 1, cid))
+                points.append((b + buffer, -1, cid))
+    for a, b in windows:
+        if b > a:
+            points.append((a, 1, None))
+            points.append((b, -1, None))
+    points.sort(key=lambda p: p[0])
+
+    active: dict[str, int] = {}
+    in_window = 0
+    out: list[Segment] = []
+    i = 0
+    while i < len(points):
+        moment = points[i][0]
+        # все изменения в одной точке применяем разом
+        while i < len(points) and points[i][0] == moment:
+            _, delta, cid = points[i]
+            if cid is None:
+                in_window += delta
+            else:
+                n = active.get(cid, 0) + delta
+                if n:
+                    active[cid] = n
+                else:
+                    active.pop(cid, None)
+            i += 1
+        if in_window <= 0 or i == len(points):
+            continue
+        nxt = points[i][0]
+        busy = frozenset(active)
+        if out and out[-1].end == moment and out[-1].busy == busy:
+            out[-1] = Segment(out[-1].start, nxt, busy)
+        else:
+            out.append(Segment(moment, nxt, busy))
+    return out
+
+
+def common_slots(
+    segments: list[Segment],
+    *,
+    duration: timedelta,
+    max_busy: int = 0,
+) -> list[tuple[datetime, datetime, frozenset[str]]]:
+    """
+    Слоты длиной duration: один на каждое начало доступного отрезка (как find_free_slots —
+    начало окна), не пересекаясь с предыдущим выданным слотом.
+    """
+    out: list[tuple[datetime, datetime, frozenset[str]]] = []
+    last_end: datetime | None = None
+    for i, seg in enumerate(segments):
+        if len(seg.busy) > max_busy:
+            continue
+        # соседние отрезки sweep() уже слиты по составу, так что каждый — отдельное начало
+        start = seg.start if last_end is None else max(seg.start, last_end)
+        if start >= seg.end:
+            continue
+
+        end = start + duration
+        union = set(seg.busy)
+        j, ok = i, True
+        while segments[j].end < end:
+            nxt = segments[j + 1] if j + 1 < len(segments) else None
+            if nxt is None or nxt.start != segments[j].end:
+                ok = False  # окно кончилось раньше слота
+                break
+            union |= nxt.busy
+            if len(union) > max_busy:
+                ok = False
+                break
+            j += 1
+        if ok:
+            out.append((start, end, frozenset(union)))
+            last_end = end
+    return out
+
+
+def group_free_slots(
+    *,
+    busy_by_calendar: dict[str, list[tuple[datetime, datetime]]],
+    tz_name: str,
+    start_date_iso: str,
+    end_date_iso: str,
+    duration_min: int,
+    work_hours: dict[str, tuple[str, str] | None] | None = None,
+    buffer_min: int = 10,
+    quorum: int | None = None,
+    max_slots_per_day: int = 3,
+    max_total: int | None = None,
+) -> dict[str, list[GroupSlot]]:
+    tz = ZoneInfo(tz_name)
+    hours = DEFAULT_WORK_HOURS if work_hours is None else work_hours
+    first = datetime.fromisoformat(start_date_iso).date()
+    last = datetime.fromisoformat(end_date_iso).date()
+    n = len(busy_by_calendar)
+    if quorum is not None and not 1 <= quorum <= n:
+        raise ValueError(f"quorum must be between 1 and {n} calendars")
+    max_busy = 0 if quorum is None else n - quorum
+
+    windows = work_windows(tz, first, last, hours)
+    segments = sweep(
+        busy_by_calendar,
+        [(a, b) for _, a, b in windows],
+        buffer=timedelta(minutes=buffer_min),
+    )
+    slots = common_slots(segments, duration=timedelta(minutes=duration_min), max_busy=max_busy)
+
+    out: dict[str, list[GroupSlot]] = {day.isoformat(): [] for day, _, _ in windows}
+    total = 0
+    for start, end, busy in slots:
+        if max_total is not None and total >= max_total:
+            break
+        day = start.astimezone(tz).date().isoformat()
+        if len(out.setdefault(day, [])) >= max_slots_per_day:
+            continue
+        out[day].append(GroupSlot(
+            start=start.astimezone(tz).isoformat(),
+            end=end.astimezone(tz).isoformat(),
+            busy_calendars=tuple(sorted(busy)),
+        ))
+        total += 1
+    return out
@@ -0,0 +1,190 @@
+"""
+Планировщик: активные напряжения -> свободные слоты на горизонте в несколько недель.
+
+Жадное earliest-fit размещение без перебора комбинаций:
+- напряжения идут по убыванию charge (при равенстве — по id, старые раньше);
+- свободное время — отсортированный список интервалов в минутах от начала горизонта,
+  поиск через bisect, при размещении интервал режется на месте;
+- поле с preferred_windows ставится только внутрь своих окон;
+- max_quota_min_per_week поля — жёсткий потолок минут на неделю (неделя с понедельника
+  в таймзоне пользователя), min_quota — только в отчёте (under_min).
+
+Сложность — O(n * k * log m): n напряжений, k окон-кандидатов, m свободных интервалов.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from app.domain.services.availability_grid import AvailabilityGrid, work_windows
+from app.domain.services.field_windows import CompiledWindows
+from app.domain.services.free_slots import DEFAULT_WORK_HOURS, busy_intervals
+
+# вектор -> длительность блока в минутах; остальные векторы в календарь не ставим
+DEFAULT_DURATIONS: dict[str, int] = {
+    "focus_block": 90,
+    "research": 60,
+    "meeting": 30,
+    "decision": 30,
+}
+SCHEDULABLE_VECTORS = tuple(DEFAULT_DURATIONS)
+
+
+@dataclass(frozen=True)
+class PlanTension:
+    id: int
+    title: str
+    charge: int
+    vector: str
+    field_id: int | None = None
+
+
+@dataclass(frozen=True)
+class PlanField:
+    id: int
+    name: str
+    min_quota_min_per_week: int = 0
+    max_quota_min_per_week: int = 0  # 0 = без потолка
+    windows: CompiledWindows | None = None  # None — без ограничений по окнам
+
+
+@dataclass(frozen=True)
+class PlannedBlock:
+    tension_id: int
+    start: datetime
+    end: datetime
+
+
+@dataclass
+class Plan:
+    blocks: list[PlannedBlock] = field(default_factory=list)
+    # tension_id -> no_slot | quota
+    unplaced: dict[int, str] = field(default_factory=dict)
+    # field_id -> week start (YYYY-MM-DD) -> запланировано минут
+    field_minutes: dict[int, dict[str, int]] = field(default_factory=dict)
+
+
+class FreeTimeline:
+    """Непересекающиеся свободные интервалы [start, end) в минутах, отсортированные по start."""
+
+    def __init__(self, runs: list[tuple[int, int]]):
+        self.starts = [a for a, _ in runs]
+        self.ends = [b for _, b in runs]
+
+    def first_fit(self, duration: int, lo: int, hi: int) -> int | None:
+        """Самое раннее начало s: [s, s + duration) свободно и лежит внутри [lo, hi)."""
+        i = bisect_right(self.ends, lo)
+        while i < len(self.starts) and self.starts[i] < hi:
+            s = max(self.starts[i], lo)
+            if min(self.ends[i], hi) - s >= duration:
+                return s
+            i += 1
+        return None
+
+    def take(self, start: int, end: int, buffer_min: int = 0) -> None:
+        """Вырезать [start - buffer, end + buffer) из интервала, содержащего start."""
+        i = bisect_right(self.starts, start) - 1
+        a, b = self.starts[i], self.ends[i]
+        del self.starts[i], self.ends[i]
+        for ra, rb in ((a, start - buffer_min), (end + buffer_min, b)):
+            if rb > ra:
+                j = bisect_left(self.starts, ra)
+                self.starts.insert(j, ra)
+                self.ends.insert(j, rb)
+
+
+def plan_tensions(
+    *,
+    tensions: list[PlanTension],
+    fields: list[PlanField],
+    events: list[dict],
+    tz_name: str,
+    start_date_iso: str,
+    end_date_iso: str,
+    work_hours: dict[str, tuple[str, str] | None] | None = None,
+    buffer_min: int = 10,
+    durations: dict[str, int] | None = None,
+    extra_busy: list[list[tuple[datetime, datetime]]] | None = None,
+) -> Plan:
+    tz = ZoneInfo(tz_name)
+    hours = DEFAULT_WORK_HOURS if work_hours is None else work_hours
+    dur_by_vector = {**DEFAULT_DURATIONS, **(durations or {})}
+    first = datetime.fromisoformat(start_date_iso).date()
+    last = datetime.fromisoformat(end_date_iso).date()
+
+    grid = AvailabilityGrid(
+        datetime.combine(first, time(0, 0), tzinfo=tz),
+        datetime.combine(last + timedelta(days=1), time(0, 0), tzinfo=tz),
+    )
+    grid.add_busy(busy_intervals(events, tz))
+    for intervals in extra_busy or []:
+        grid.add_busy(intervals)
+    grid.allow([(a, b) for _, a, b in work_windows(tz, first, last, hours)])
+    timeline = FreeTimeline(grid.free_runs(buffer_min))
+
+    def offset(moment: datetime) -> int:
+        return min(grid.size, max(0, int((moment - grid.origin).total_seconds() // 60)))
+
+    # недели горизонта: смещения понедельников (первая может начинаться не с понедельника)
+    week_days = [first] + [
+        first + timedelta(days=i) for i in range(1, (last - first).days + 1)
+        if (first + timedelta(days=i)).weekday() == 0
+    ]
+    week_starts = [offset(datetime.combine(d, time(0, 0), tzinfo=tz)) for d in week_days]
+    week_labels = [(d - timedelta(days=d.weekday())).isoformat() for d in week_days]
+    week_ranges = [
+        (a, week_starts[i + 1] if i + 1 < len(week_starts) else grid.size)
+        for i, a in enumerate(week_starts)
+    ]
+
+    def week_of(minute: int) -> int:
+        return bisect_right(week_starts, minute) - 1
+
+    fields_by_id = {f.id: f for f in fields}
+    ranges_by_field: dict[int, list[tuple[int, int]]] = {}
+    for f in fields:
+        if f.windows is not None:
+            ranges_by_field[f.id] = [(offset(a), offset(b)) for a, b in f.windows.intervals(first, last)]
+
+    plan = Plan()
+    used: dict[tuple[int, int], int] = {}  # (field_id, week idx) -> минуты
+
+    ordered = sorted(
+        (t for t in tensions if t.vector in dur_by_vector),
+        key=lambda t: (-t.charge, t.id),
+    )
+    for t in ordered:
+        duration = dur_by_vector[t.vector]
+        f = fields_by_id.get(t.field_id) if t.field_id is not None else None
+        ranges = ranges_by_field.get(f.id, week_ranges) if f else week_ranges
+        cap = f.max_quota_min_per_week if f else 0
+
+        placed: int | None = None
+        capped = False
+        for lo, hi in ranges:
+            if cap:
+                week = week_of(lo)
+                if used.get((f.id, week), 0) + duration > cap:
+                    capped = True
+                    continue
+            placed = timeline.first_fit(duration, lo, hi)
+            if placed is not None:
+                break
+
+        if placed is None:
+            plan.unplaced[t.id] = "quota" if capped else "no_slot"
+            continue
+
+        timeline.take(placed, placed + duration, buffer_min)
+        plan.blocks.append(PlannedBlock(t.id, grid.at(placed, tz), grid.at(placed + duration, tz)))
+        if f:
+            key = (f.id, week_of(placed))
+            used[key] = used.get(key, 0) + duration
+
+    for (field_id, week), minutes in used.items():
+        plan.field_minutes.setdefault(field_id, {})[week_labels[week]] = minutes
+    plan.blocks.sort(key=lambda b: b.start)
+    return plan
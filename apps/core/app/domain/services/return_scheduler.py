@@ -0,0 +1,213 @@
+"""
+Планировщик возвратов: сам присылает напряжения, когда подошёл return_at или новый период cadence.
+
+- в памяти — min-heap (когда, id) только на горизонт settings.return_scheduler_horizon_sec;
+  грузится одним индексным запросом (TensionsRepo.list_scheduled) и догружается
+  каждые полгоризонта — таблицу каждую секунду не опрашиваем;
+- изменения напряжений приходят через LISTEN helix_tension_schedule (триггер из
+  alembic 0004): пачка id схлопывается и перечитывается одним запросом;
+- устаревшие записи кучи не удаляем, а пропускаем (сверка с _due);
+- срок подошёл -> TensionsRepo.fire_scheduled_return (return_fired_at + событие
+  'returned' одним statement) -> on_fire (бот шлёт сообщение);
+- cadence: на старте и в каждую локальную полночь (settings.user_timezone)
+  TensionsRepo.arm_cadence одним запросом взводит return_at всем периодическим,
+  у которых начался новый период, — на settings.cadence_return_hour его первого
+  дня, после чего горизонт перечитывается.
+
+Отработанный return_at копируется в return_fired_at; новый return_at
+(например, "postpone") снова взводит возврат.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+from datetime import datetime, time, timedelta, timezone
+from typing import Awaitable, Callable
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infra.db.models.tensions import Tension
+from app.infra.db.notify import PgListener
+from app.infra.db.session import SessionLocal
+from app.infra.repos.tensions_repo import TensionsRepo
+from app.settings import settings
+
+logger = logging.getLogger("helix.return_scheduler")
+
+TENSION_SCHEDULE_CHANNEL = "helix_tension_schedule"
+LISTEN_READY_TIMEOUT_SEC = 10.0
+
+OnFire = Callable[[Tension, str], Awaitable[None]]
+
+
+def next_local_midnight(now: datetime, tz: ZoneInfo) -> datetime:
+    """Ближайшая полночь после now в tz (UTC); границы дня/недели/месяца cadence — полночи."""
+    day = now.astimezone(tz).date() + timedelta(days=1)
+    return datetime.combine(day, time(0), tzinfo=tz).astimezone(timezone.utc)
+
+
+class ReturnScheduler:
+    def __init__(
+        self,
+        on_fire: OnFire,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        horizon_sec: int | None = None,
+        debounce_sec: float | None = None,
+    ):
+        self._on_fire = on_fire
+        self._session_factory = session_factory
+        self._horizon = timedelta(seconds=horizon_sec or settings.return_scheduler_horizon_sec)
+        self._debounce_sec = settings.return_scheduler_debounce_sec if debounce_sec is None else debounce_sec
+        self._tz_name = settings.user_timezone
+        self._tz = ZoneInfo(self._tz_name)
+
+        self._heap: list[tuple[datetime, int]] = []
+        self._due: dict[int, datetime] = {}
+        self._loaded_until: datetime | None = None
+        self._cadence_at: datetime | None = None
+        self._pending: set[int] = set()
+        self._refill_needed = False
+        self._wake = asyncio.Event()
+
+        self._listener = PgListener(
+            TENSION_SCHEDULE_CHANNEL, self._on_notify, on_reconnect=self._on_reconnect
+        )
+        self._runner: asyncio.Task[None] | None = None
+        self._reloader: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        # сначала LISTEN, потом загрузка — изменения между ними не потеряются
+        await self._listener.start()
+        if not await self._listener.wait_ready(LISTEN_READY_TIMEOUT_SEC):
+            # грузим без LISTEN; при подключении on_reconnect перечитает горизонт
+            logger.warning("LISTEN %s is not ready yet, loading without it", TENSION_SCHEDULE_CHANNEL)
+        await self._arm_cadence()
+        await self._refill()
+        self._runner = asyncio.create_task(self._run(), name="return-scheduler")
+
+    async def stop(self) -> None:
+        await self._listener.stop()
+        for task in (self._runner, self._reloader):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._runner = None
+        self._reloader = None
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            self._pending.add(int(payload))
+        except ValueError:
+            return
+        if self._reloader is None or self._reloader.done():
+            self._reloader = asyncio.create_task(self._reload_pending())
+
+    def _on_reconnect(self) -> None:
+        # уведомления за время обрыва потеряны — перечитываем горизонт целиком
+        self._refill_needed = True
+        self._wake.set()
+
+    def _arm(self, tension_id: int, due_at: datetime) -> None:
+        self._due[tension_id] = due_at
+        heapq.heappush(self._heap, (due_at, tension_id))
+        if self._heap[0] == (due_at, tension_id):
+            self._wake.set()
+
+    async def _reload_pending(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self._debounce_sec)
+            if self._loaded_until is None:
+                return  # ещё не было первой загрузки — она и подхватит изменения
+            ids, self._pending = self._pending, set()
+            try:
+                async with self._session_factory() as db:
+                    rows = await TensionsRepo(db).list_scheduled(until=self._loaded_until, ids=ids)
+            except Exception:
+                logger.exception("reloading %d changed tensions failed, will refill", len(ids))
+                self._on_reconnect()
+                return
+            for tension_id in ids:
+                self._due.pop(tension_id, None)
+            for tension_id, due_at in rows:
+                self._arm(tension_id, due_at)
+
+    async def _refill(self) -> None:
+        until = datetime.now(timezone.utc) + self._horizon
+        async with self._session_factory() as db:
+            rows = await TensionsRepo(db).list_scheduled(until=until)
+        self._due = dict(rows)
+        self._heap = [(due_at, tension_id) for tension_id, due_at in rows]
+        heapq.heapify(self._heap)
+        self._loaded_until = until
+        self._refill_needed = False
+        logger.info("return scheduler armed %d returns until %s", len(rows), until.isoformat())
+
+    async def _arm_cadence(self) -> None:
+        now = datetime.now(timezone.utc)
+        async with self._session_factory() as db:
+            armed = await TensionsRepo(db).arm_cadence(
+                now=now, tz_name=self._tz_name, return_hour=settings.cadence_return_hour
+            )
+        self._cadence_at = next_local_midnight(now, self._tz)
+        if armed:
+            # NOTIFY на массовый проход выключен — подхватываем всё перечитыванием
+            self._refill_needed = True
+        logger.info("cadence engine armed %d returns, next run at %s", armed, self._cadence_at.isoformat())
+
+    async def _fire_due(self) -> None:
+        while self._heap:
+            due_at, tension_id = self._heap[0]
+            now = datetime.now(timezone.utc)
+            if due_at > now:
+                return
+            heapq.heappop(self._heap)
+            if self._due.get(tension_id) != due_at:
+                continue  # перевзведено или снято после постановки в кучу
+            del self._due[tension_id]
+
+            try:
+                async with self._session_factory() as db:
+                    fired = await TensionsRepo(db).fire_scheduled_return(tension_id, now=now)
+            except Exception:
+                self._arm(tension_id, due_at)  # повторим на следующем тике
+                raise
+            if fired is None:
+                continue
+            try:
+                await self._on_fire(*fired)
+            except Exception:
+                logger.exception("delivering scheduled return #%s failed", tension_id)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                now = datetime.now(timezone.utc)
+                if now >= self._cadence_at:
+                    await self._arm_cadence()
+                if self._refill_needed or now >= self._loaded_until - self._horizon / 2:
+                    await self._refill()
+                await self._fire_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("return scheduler tick failed")
+                await asyncio.sleep(5)
+
+            self._wake.clear()
+            now = datetime.now(timezone.utc)
+            wake_at = min(self._loaded_until - self._horizon / 2, self._cadence_at)
+            if self._heap:
+                wake_at = min(wake_at, self._heap[0][0])
+            delay = (wake_at - now).total_seconds()
+            if delay > 0 and not self._refill_needed:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
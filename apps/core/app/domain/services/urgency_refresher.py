@@ -0,0 +1,69 @@
+"""
+Периодический пересчёт срочности (tensions.urgency) ради затухания по времени.
+
+На записи (create/update, возвраты, cadence) срочность пересчитывается сразу,
+но возраст, просрочка return_at и кулдаун после возврата меняются сами собой —
+раз в settings.urgency_refresh_interval_sec один UPDATE по активным
+(TensionsRepo.refresh_urgency) переписывает только строки, где счёт сдвинулся.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infra.db.session import SessionLocal
+from app.infra.repos.tensions_repo import TensionsRepo
+from app.settings import settings
+
+logger = logging.getLogger("helix.urgency")
+
+RETRY_SEC = 60
+
+
+class UrgencyRefresher:
+    def __init__(
+        self,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+        interval_sec: int | None = None,
+    ):
+        self._session_factory = session_factory
+        self._interval_sec = interval_sec or settings.urgency_refresh_interval_sec
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="urgency-refresh")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self) -> int | None:
+        async with self._session_factory() as db:
+            refreshed = await TensionsRepo(db).refresh_urgency(now=datetime.now(timezone.utc))
+        if refreshed is None:
+            logger.info("urgency refresh skipped: running in another process")
+        else:
+            logger.info("urgency refreshed for %d tensions", refreshed)
+        return refreshed
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+                delay = self._interval_sec
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("urgency refresh failed, retrying in %ss", RETRY_SEC)
+                delay = RETRY_SEC
+            await asyncio.sleep(delay)
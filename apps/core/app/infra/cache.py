@@ -0,0 +1,324 @@
+"""
+Read-through кэш горячих чтений, общий для API и бота (Redis; в тестах — память процесса).
+
+- значение — JSON под ключом <prefix>:<namespace>:<поколение>:<key>, TTL с разбросом
+  до +10%, чтобы ключи одной волны не истекали одновременно;
+- инвалидация — INCR поколения namespace (<prefix>:<namespace>:gen) после commit
+  в репозиториях (TensionsRepo, BaselineFieldsRepo, CalendarEventsRepo): старые ключи
+  больше никто не читает, они доживают до TTL. Загрузка, начатая до записи, кладёт
+  результат под старое поколение — свежее значение им не перетирается;
+- stampede: в процессе — одна загрузка на ключ, остальные ждут её результат;
+  между процессами — SET NX lock-ключа, проигравший до lock_wait_sec ждёт значение
+  от победителя и только потом грузит сам;
+- backend недоступен — чтения идут в БД напрямую (кэш не роняет запросы),
+  следующая попытка через retry_sec; несработавшая инвалидация повторяется первой.
+
+Загрузчики должны возвращать JSON-совместимые значения (tuple из кэша придёт списком).
+Backend подключается при старте процесса (lifespan API, post_init бота: read_cache.start),
+не при импорте; до start и после close кэш выключен — чтения идут в БД.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from app.settings import settings
+
+logger = logging.getLogger("helix.cache")
+
+# namespaces: запись в таблицу сбрасывает всё закэшированное из неё
+TENSIONS = "tensions"
+BASELINE_FIELDS = "baseline_fields"
+CALENDAR = "calendar"
+
+_RETRY = object()
+
+
+class CacheBackend(ABC):
+    """Минимум операций, который нужен ReadCache; значения — строки."""
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_sec: float) -> None: ...
+
+    @abstractmethod
+    async def add(self, key: str, value: str, ttl_sec: float) -> bool:
+        """SET NX: True, если ключа не было."""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    async def close(self) -> None:
+        """Освободить соединения; у backend-ов без них — ничего."""
+
+
+class MemoryBackend(CacheBackend):
+    """В памяти процесса (LRU + TTL): тесты и запуск без Redis. Между процессами не делится."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, float | None]] = OrderedDict()
+
+    def _live(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value: str, ttl_sec: float | None) -> None:
+        expires_at = time.monotonic() + ttl_sec if ttl_sec is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> str | None:
+        return self._live(key)
+
+    async def set(self, key: str, value: str, ttl_sec: float) -> None:
+        self._store(key, value, ttl_sec)
+
+    async def add(self, key: str, value: str, ttl_sec: float) -> bool:
+        if self._live(key) is not None:
+            return False
+        self._store(key, value, ttl_sec)
+        return True
+
+    async def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        self._store(key, str(value), None)
+        return value
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class RedisBackend(CacheBackend):
+    def __init__(self, url: str, *, timeout_sec: float):
+        # redis нужен только этому backend-у — memory работает и без пакета
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(
+            url,
+            decode_responses=True,
+            socket_timeout=timeout_sec,
+            socket_connect_timeout=timeout_sec,
+        )
+
+    async def get(self, key: str) -> str | None:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: str, ttl_sec: float) -> None:
+        await self._redis.set(key, value, px=max(1, int(ttl_sec * 1000)))
+
+    async def add(self, key: str, value: str, ttl_sec: float) -> bool:
+        return bool(await self._redis.set(key, value, px=max(1, int(ttl_sec * 1000)), nx=True))
+
+    async def incr(self, key: str) -> int:
+        return await self._redis.incr(key)
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(key)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def backend_from_settings() -> CacheBackend | None:
+    kind = settings.cache_backend
+    if kind == "redis":
+        return RedisBackend(settings.redis_url, timeout_sec=settings.cache_redis_timeout_sec)
+    if kind == "memory":
+        return MemoryBackend(settings.cache_memory_max_entries)
+    if kind == "off":
+        return None
+    raise ValueError(f"Unknown CACHE_BACKEND {kind!r}, expected redis | memory | off")
+
+
+class ReadCache:
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        *,
+        prefix: str = "helix:cache",
+        lock_ttl_sec: float = 10.0,
+        lock_wait_sec: float = 2.0,
+        poll_sec: float = 0.05,
+        retry_sec: float = 5.0,
+    ):
+        # backend=None — кэш выключен, get_or_load просто зовёт загрузчик
+        self._backend = backend
+        self._prefix = prefix
+        self._lock_ttl_sec = lock_ttl_sec
+        self._lock_wait_sec = lock_wait_sec
+        self._poll_sec = poll_sec
+        self._retry_sec = retry_sec
+
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._pending_invalidations: set[str] = set()
+        self._down_until = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.errors = 0
+
+    def start(self, backend: CacheBackend | None) -> None:
+        """Подключить backend (старт процесса); None — кэш выключен."""
+        self._backend = backend
+        self._inflight.clear()
+        self._pending_invalidations.clear()
+        self._down_until = 0.0
+
+    def _available(self) -> bool:
+        return self._backend is not None and time.monotonic() >= self._down_until
+
+    def _failed(self, op: str) -> None:
+        self.errors += 1
+        self._down_until = time.monotonic() + self._retry_sec
+        logger.warning("cache %s failed, bypassing cache for %.0fs", op, self._retry_sec, exc_info=True)
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        *,
+        ttl_sec: float,
+    ) -> Any:
+        if not self._available():
+            return await loader()
+        try:
+            if self._pending_invalidations:
+                await self._flush_invalidations()
+            gen = await self._backend.get(self._gen_key(namespace)) or "0"
+            full_key = f"{self._prefix}:{namespace}:{gen}:{key}"
+            cached = await self._backend.get(full_key)
+        except Exception:
+            self._failed("read")
+            return await loader()
+        if cached is not None:
+            self.hits += 1
+            return json.loads(cached)
+
+        inflight = self._inflight.get(full_key)
+        if inflight is not None:
+            value = await asyncio.shield(inflight)
+            # загрузка-лидер упала или отменена — пробуем сами, со своей ошибкой
+            return await loader() if value is _RETRY else value
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = fut
+        try:
+            value = await self._load(full_key, loader, ttl_sec)
+        except BaseException:
+            fut.set_result(_RETRY)
+            raise
+        else:
+            fut.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(full_key, None)
+
+    async def _load(self, full_key: str, loader: Callable[[], Awaitable[Any]], ttl_sec: float) -> Any:
+        lock_key = f"{full_key}:lock"
+        try:
+            locked = await self._backend.add(lock_key, "1", self._lock_ttl_sec)
+        except Exception:
+            self._failed("lock")
+            return await loader()
+
+        if not locked:
+            # ключ уже грузит другой процесс — ждём его значение, а не идём в БД следом
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self._lock_wait_sec
+            while loop.time() < deadline:
+                await asyncio.sleep(self._poll_sec)
+                try:
+                    cached = await self._backend.get(full_key)
+                except Exception:
+                    self._failed("read")
+                    break
+                if cached is not None:
+                    self.waits += 1
+                    return json.loads(cached)
+
+        self.misses += 1
+        try:
+            value = await loader()
+        except BaseException:
+            if locked:
+                await self._release(lock_key)
+            raise
+
+        try:
+            payload = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+            await self._backend.set(full_key, payload, ttl_sec * random.uniform(1.0, 1.1))
+            if locked:
+                await self._backend.delete(lock_key)
+        except Exception:
+            self._failed("write")
+        return value
+
+    async def _release(self, lock_key: str) -> None:
+        try:
+            await self._backend.delete(lock_key)
+        except Exception:
+            self._failed("unlock")
+
+    async def invalidate(self, *namespaces: str) -> None:
+        """Сбросить namespaces — вызывается после commit записи."""
+        if self._backend is None:
+            return
+        self._pending_invalidations.update(namespaces)
+        if not self._available():
+            return  # повторим при следующем обращении; до тех пор старые ключи держит TTL
+        try:
+            await self._flush_invalidations()
+        except Exception:
+            self._failed("invalidate")
+
+    async def _flush_invalidations(self) -> None:
+        for namespace in sorted(self._pending_invalidations):
+            await self._backend.incr(self._gen_key(namespace))
+            self._pending_invalidations.discard(namespace)
+
+    def _gen_key(self, namespace: str) -> str:
+        return f"{self._prefix}:{namespace}:gen"
+
+    async def close(self) -> None:
+        backend, self._backend = self._backend, None
+        if backend is not None:
+            await backend.close()
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self._backend).__name__ if self._backend else None,
+            "available": self._available(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "waits": self.waits,
+            "errors": self.errors,
+            "pending_invalidations": sorted(self._pending_invalidations),
+        }
+
+
+# один на процесс; backend — read_cache.start(backend_from_settings()) при старте
+read_cache = ReadCache()
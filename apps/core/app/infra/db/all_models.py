@@ -8,3 +8,7 @@ from app.infra.db.models.google_oauth_token import GoogleOAuthToken  # noqa: F40
 from app.infra.db.models.baseline_fields import BaselineField  # noqa: F401
 from app.infra.db.models.tensions import Tension  # noqa: F401
 from app.infra.db.models.tension_events import TensionEvent  # noqa: F401
+from app.infra.db.models.calendar_events import CalendarEvent  # noqa: F401
+from app.infra.db.models.calendar_sync_state import CalendarSyncState  # noqa: F401
+from app.infra.db.models.calendar_watch_channels import CalendarWatchChannel  # noqa: F401
+from app.infra.db.models.field_week_minutes import FieldWeekMinutes  # noqa: F401
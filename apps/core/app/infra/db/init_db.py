@@ -1,6 +1,34 @@
+"""
+Схема БД — только через Alembic (alembic/versions).
+
+На старте приложение само делает `upgrade head` (то же, что `alembic upgrade head`
+из menu.sh). Базы, созданные раньше через create_all, миграции 0001/0002 узнают
+и доводят до текущей схемы, не пересоздавая таблицы.
+"""
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncEngine
-from app.infra.db.schema import Base
+
+# apps/core/alembic.ini
+ALEMBIC_INI = Path(__file__).resolve().parents[3] / "alembic.ini"
+
+
+def alembic_config(connection: Connection | None = None) -> Config:
+    cfg = Config(str(ALEMBIC_INI))
+    cfg.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    if connection is not None:
+        cfg.attributes["connection"] = connection
+    return cfg
+
+
+def _upgrade(connection: Connection) -> None:
+    command.upgrade(alembic_config(connection), "head")
+
 
 async def init_db(engine: AsyncEngine) -> None:
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade)
@@ -2,10 +2,18 @@ from app.infra.db.models.google_oauth_token import GoogleOAuthToken
 from app.infra.db.models.baseline_fields import BaselineField
 from app.infra.db.models.tensions import Tension
 from app.infra.db.models.tension_events import TensionEvent
+from app.infra.db.models.calendar_events import CalendarEvent
+from app.infra.db.models.calendar_sync_state import CalendarSyncState
+from app.infra.db.models.calendar_watch_channels import CalendarWatchChannel
+from app.infra.db.models.field_week_minutes import FieldWeekMinutes
 
 __all__ = [
     "GoogleOAuthToken",
     "BaselineField",
     "Tension",
     "TensionEvent",
+    "CalendarEvent",
+    "CalendarSyncState",
+    "CalendarWatchChannel",
+    "FieldWeekMinutes",
 ]
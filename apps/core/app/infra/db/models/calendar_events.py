@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import Text, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infra.db.schema import Base
+
+
+class CalendarEvent(Base):
+    """
+    Локальное зеркало событий Google Calendar.
+
+    Поддерживается инкрементальной синхронизацией (syncToken) — см.
+    app/domain/services/calendar_sync.py. Чтения /calendar/* идут отсюда.
+    """
+
+    __tablename__ = "calendar_events"
+
+    calendar_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    event_id: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # как пришло от Google: dateTime (RFC3339) или date ("YYYY-MM-DD" для all-day)
+    start_raw: Mapped[str] = mapped_column(Text, nullable=False)
+    end_raw: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # нормализованные границы для range-запросов
+    start_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_utc: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    is_all_day: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    # к какому baseline-полю отнесено время события (см. app/domain/services/field_quota.py)
+    field_id: Mapped[int | None] = mapped_column(
+        ForeignKey("baseline_fields.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+
+    synced_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # overlap-запрос "end > tmin AND start < tmax": скан по end_utc отсекает историю
+        Index("ix_calendar_events_calendar_end", "calendar_id", "end_utc", "start_utc"),
+    )
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infra.db.schema import Base
+
+
+class CalendarSyncState(Base):
+    __tablename__ = "calendar_sync_state"
+
+    calendar_id: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    # nextSyncToken последней успешной синхронизации (None -> нужен full sync)
+    sync_token: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_full_sync_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
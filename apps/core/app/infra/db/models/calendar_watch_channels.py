@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infra.db.schema import Base
+
+
+class CalendarWatchChannel(Base):
+    """Канал push-уведомлений Google Calendar (events.watch)."""
+
+    __tablename__ = "calendar_watch_channels"
+
+    # наш id канала (uuid) — приходит в X-Goog-Channel-ID
+    channel_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    calendar_id: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # id ресурса от Google — нужен для channels.stop
+    resource_id: Mapped[str] = mapped_column(Text, nullable=False)
+    # секрет канала — приходит в X-Goog-Channel-Token
+    token: Mapped[str] = mapped_column(Text, nullable=False)
+
+    expiration: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infra.db.schema import Base
+
+
+class FieldWeekMinutes(Base):
+    """
+    Минуты календаря, отнесённые к полю, по неделям (понедельник в TZ пользователя).
+
+    Поддерживается дельтами при каждом изменении зеркала calendar_events
+    (CalendarEventsRepo.apply_changes) — историю заново не пересчитываем.
+    """
+
+    __tablename__ = "field_week_minutes"
+
+    field_id: Mapped[int] = mapped_column(
+        ForeignKey("baseline_fields.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
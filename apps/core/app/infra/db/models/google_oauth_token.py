@@ -7,9 +7,11 @@ from app.infra.db.schema import Base
 class GoogleOAuthToken(Base):
     __tablename__ = "google_oauth_tokens"
 
-    # v0.1: один пользователь/один аккаунт. Позже добавим user_id/tenant.
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
+    # Google-аккаунт (email из id_token); "default" — запись времён одного аккаунта
+    account_id: Mapped[str] = mapped_column(Text, nullable=False, unique=True, index=True, default="default")
+
     access_token: Mapped[str] = mapped_column(Text, nullable=False)
     refresh_token: Mapped[str | None] = mapped_column(Text, nullable=True)
     token_type: Mapped[str] = mapped_column(String(32), nullable=False, default="Bearer")
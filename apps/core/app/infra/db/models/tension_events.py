@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Text, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Text, DateTime, ForeignKey, CheckConstraint, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -45,4 +45,8 @@ class TensionEvent(Base):
             name="ck_tension_events_type",
         ),
         CheckConstraint("actor IN ('user','helix','system')", name="ck_tension_events_actor"),
+        # история одного напряжения (и индекс под FK с ON DELETE CASCADE)
+        Index("ix_tension_events_tension_created", "tension_id", "created_at"),
+        # последнее событие типа/актора: ORDER BY created_at DESC, id DESC LIMIT 1
+        Index("ix_tension_events_type_actor_created", "type", "actor", text("created_at DESC"), text("id DESC")),
     )
@@ -2,11 +2,24 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Text, Integer, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Text, Integer, DateTime, ForeignKey, CheckConstraint, Computed, Index, bindparam, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.infra.db.schema import Base
 
+# активные напряжения (held/forming) — под них частичные индексы ниже
+ACTIVE_STATUSES = ("held", "forming")
+ACTIVE_SQL = "status IN ('held', 'forming')"
+
+# поиск: заголовок (вес A) + заметки из событий captured/released (вес B);
+# 'simple' — без стемминга, одинаково для русского и английского
+SEARCH_TEXT_SQL = "title || ' ' || search_notes"
+SEARCH_TSV_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, title), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, search_notes), 'B')"
+)
+
 
 class Tension(Base):
     __tablename__ = "tensions"
@@ -17,10 +30,17 @@ class Tension(Base):
     field_id: Mapped[int | None] = mapped_column(
         ForeignKey("baseline_fields.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
     )
 
     title: Mapped[str] = mapped_column(Text, nullable=False)
 
+    # заметки из событий (captured/released) — для поиска; ведёт TensionsRepo
+    search_notes: Mapped[str] = mapped_column(Text, nullable=False, default="", server_default="")
+    # генерируемые Postgres колонки под GIN-индексы поиска; в обычных выборках не грузим
+    search_text: Mapped[str] = mapped_column(Text, Computed(SEARCH_TEXT_SQL, persisted=True), deferred=True)
+    search_tsv: Mapped[str] = mapped_column(TSVECTOR, Computed(SEARCH_TSV_SQL, persisted=True), deferred=True)
+
     # стадия жизни напряжения (не task-status)
     status: Mapped[str] = mapped_column(Text, nullable=False, default="held")
 
@@ -32,11 +52,21 @@ class Tension(Base):
 
     # момент возврата
     return_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # какой return_at планировщик уже отработал (равен return_at — возврат отправлен)
+    return_fired_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # периодика (если это “полевое”/циклическое)
     cadence: Mapped[str | None] = mapped_column(Text, nullable=True)  # 'daily'|'weekly'|'monthly'
+    # начало последнего периода, на который cadence-движок взвёл возврат
     last_triggered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # история возвратов (события 'returned'), денормализована для срочности
+    return_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_returned_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # срочность в очках (charge, возраст, просрочка, история возвратов) — см. urgency_sql в TensionsRepo
+    urgency: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
 
@@ -58,4 +88,66 @@ class Tension(Base):
             "cadence IS NULL OR cadence IN ('daily','weekly','monthly')",
             name="ck_tensions_cadence",
         ),
+        # keyset-пагинация списков: ORDER BY created_at DESC, id DESC
+        Index("ix_tensions_created_at_id", "created_at", "id"),
+        # частичные индексы под активные (held/forming) — см. alembic 0003_hot_path_indexes
+        Index(
+            "ix_tensions_active_created",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text(ACTIVE_SQL),
+        ),
+        Index(
+            "ix_tensions_active_return_at",
+            "return_at",
+            "created_at",
+            postgresql_where=text(f"{ACTIVE_SQL} AND return_at IS NOT NULL"),
+        ),
+        Index(
+            "ix_tensions_active_charge",
+            text("charge DESC"),
+            "created_at",
+            postgresql_where=text(ACTIVE_SQL),
+        ),
+        # выбор top-N по срочности — Index Only Scan, строки — по id (alembic 0006_tension_urgency)
+        Index(
+            "ix_tensions_active_urgency",
+            text("urgency DESC"),
+            "created_at",
+            "id",
+            postgresql_where=text(ACTIVE_SQL),
+        ),
+        # поиск (alembic 0007_tension_search): полнотекстовый и триграммный (pg_trgm, опечатки)
+        Index("ix_tensions_search_tsv", "search_tsv", postgresql_using="gin"),
+        Index(
+            "ix_tensions_search_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        # похожие активные при захвате (alembic 0008_tension_duplicates)
+        Index(
+            "ix_tensions_active_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_where=text(ACTIVE_SQL),
+        ),
+        # периодические — для планировщика возвратов (alembic 0004_return_scheduler)
+        Index(
+            "ix_tensions_active_cadence",
+            "cadence",
+            "last_triggered_at",
+            postgresql_where=text(f"{ACTIVE_SQL} AND cadence IS NOT NULL"),
+        ),
     )
+
+
+def status_in(statuses: tuple[str, ...] = ACTIVE_STATUSES):
+    """
+    Tension.status IN (...) с литералами прямо в SQL.
+
+    С bind-параметрами Postgres на generic-плане (prepared statements asyncpg)
+    не может доказать предикат частичного индекса и уходит в seq scan.
+    """
+    return Tension.status.in_(bindparam("status_in", tuple(statuses), expanding=True, literal_execute=True, unique=True))
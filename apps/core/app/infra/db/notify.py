@@ -0,0 +1,105 @@
+"""
+LISTEN на канал Postgres через отдельное asyncpg-соединение.
+
+Соединение живёт вне пула SQLAlchemy (LISTEN привязан к сессии). При обрыве
+переподключаемся; уведомления за время обрыва потеряны — поэтому вызывается
+on_reconnect, чтобы подписчик перечитал состояние целиком.
+
+Подписчик грузит состояние после wait_ready(): так изменения между LISTEN и
+загрузкой не теряются. Не дождался — on_reconnect придёт при подключении.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable
+
+import asyncpg
+
+from app.settings import settings
+
+logger = logging.getLogger("helix.pg_listener")
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    # postgresql+asyncpg://... -> postgresql://... (asyncpg не знает про драйвер в схеме)
+    return database_url.replace("+asyncpg", "", 1)
+
+
+class PgListener:
+    def __init__(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        *,
+        on_reconnect: Callable[[], None] | None = None,
+        dsn: str | None = None,
+        retry_sec: float = 5.0,
+    ):
+        self._channel = channel
+        self._on_notify = on_notify
+        self._on_reconnect = on_reconnect
+        self._dsn = dsn or asyncpg_dsn(settings.database_url)
+        self._retry_sec = retry_sec
+        self._task: asyncio.Task[None] | None = None
+        self._ready = asyncio.Event()
+        # уведомления могли пропасть с момента, когда подписчик последний раз читал состояние
+        self._missed = False
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=f"pg-listen-{self._channel}")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """Ждёт активного LISTEN; False — не дождались, тогда при подключении вызовется on_reconnect."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            self._missed = True
+            return False
+
+    def _lost(self) -> None:
+        self._ready.clear()
+        self._missed = True
+
+    def _handle(self, conn, pid, channel, payload) -> None:
+        del conn, pid, channel
+        try:
+            self._on_notify(payload)
+        except Exception:
+            logger.exception("LISTEN %s handler failed", self._channel)
+
+    async def _run(self) -> None:
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self._dsn)
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _c: closed.set())
+                await conn.add_listener(self._channel, self._handle)
+                if self._missed and self._on_reconnect:
+                    self._on_reconnect()
+                self._missed = False
+                self._ready.set()
+                await closed.wait()
+                self._lost()
+                logger.warning("LISTEN %s connection lost, reconnecting", self._channel)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("LISTEN %s failed, retrying in %ss", self._channel, self._retry_sec)
+                self._lost()
+                await asyncio.sleep(self._retry_sec)
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
@@ -0,0 +1,88 @@
+"""
+LRU-кэш ответов Google по ETag (conditional GET).
+
+Ключ — (owner, url, params): owner — аккаунт Google, чьим токеном сделан запрос
+(url "calendars/primary/events" у всех аккаунтов один и тот же), календарь входит
+в url, timeMin/timeMax/fields — в params.
+На повторный запрос отправляем If-None-Match; на 304 отдаём уже распарсенный
+ответ из кэша. Размер считается по телу ответа и ограничен max_bytes.
+
+Закэшированные dict-ы общие для всех вызовов — не мутировать.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Request
+
+CacheKey = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str
+    data: dict
+    size: int
+
+
+class ETagCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[CacheKey, CachedResponse] = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(owner: str, url: str, params: dict) -> CacheKey:
+        return owner, url, tuple(sorted((k, str(v)) for k, v in params.items()))
+
+    def lookup(self, key: CacheKey) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def mark_not_modified(self) -> None:
+        self.not_modified += 1
+
+    def store(self, key: CacheKey, etag: str, data: dict, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = CachedResponse(etag=etag, data=data, size=size)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+        }
+
+
+def get_etag_cache(request: Request) -> ETagCache:
+    return request.app.state.etag_cache
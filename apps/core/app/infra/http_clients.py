@@ -0,0 +1,80 @@
+"""
+Пулы исходящих HTTP-соединений (по одному httpx.AsyncClient на upstream).
+
+Клиенты создаются и закрываются в lifespan FastAPI-приложения (app/main.py),
+а в роутеры попадают через Depends(get_google_client) / Depends(get_openai_client).
+Так keep-alive и HTTP/2 соединения к googleapis.com / api.openai.com
+переиспользуются между запросами, без нового TCP+TLS handshake на каждый вызов.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import httpx
+from fastapi import Request
+
+from app.infra.resilience import CircuitBreaker, ResilientTransport, RetryPolicy
+from app.settings import settings
+
+
+def build_breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        failure_threshold=settings.http_breaker_failure_threshold,
+        reset_timeout_sec=settings.http_breaker_reset_timeout_sec,
+    )
+
+
+def build_client(*, breaker: CircuitBreaker, timeout_sec: float) -> httpx.AsyncClient:
+    pool = httpx.AsyncHTTPTransport(
+        http2=settings.http2_enabled,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_sec,
+        ),
+    )
+    # retries + per-upstream circuit breaker on top of the pooled transport
+    transport = ResilientTransport(
+        pool,
+        breaker=breaker,
+        policy=RetryPolicy(
+            max_attempts=settings.http_retry_max_attempts,
+            base_delay_sec=settings.http_retry_base_delay_sec,
+            max_delay_sec=settings.http_retry_max_delay_sec,
+            max_elapsed_sec=settings.http_retry_max_elapsed_sec,
+        ),
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(timeout_sec, connect=settings.http_connect_timeout_sec),
+    )
+
+
+@dataclass
+class HttpClients:
+    google: httpx.AsyncClient
+    openai: httpx.AsyncClient
+    breakers: dict[str, CircuitBreaker]
+
+    @classmethod
+    def create(cls) -> "HttpClients":
+        breakers = {"google": build_breaker("google"), "openai": build_breaker("openai")}
+        return cls(
+            google=build_client(breaker=breakers["google"], timeout_sec=settings.google_http_timeout_sec),
+            openai=build_client(breaker=breakers["openai"], timeout_sec=settings.openai_http_timeout_sec),
+            breakers=breakers,
+        )
+
+    async def aclose(self) -> None:
+        await self.google.aclose()
+        await self.openai.aclose()
+
+
+def get_google_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http.google
+
+
+def get_openai_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http.openai
@@ -1,11 +1,27 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.services.field_windows import field_windows_cache
+from app.infra.cache import BASELINE_FIELDS, TENSIONS, read_cache
 from app.infra.db.models.baseline_fields import BaselineField
+from app.infra.db.models.field_week_minutes import FieldWeekMinutes
+
+# поля строк в кэшированном списке (BaselineFieldOut в GET /baseline-fields)
+CACHED_LIST_FIELDS = (
+    "id",
+    "user_id",
+    "name",
+    "description",
+    "mode",
+    "min_quota_min_per_week",
+    "max_quota_min_per_week",
+    "preferred_windows",
+    "is_active",
+)
 
 
 class BaselineFieldsRepo:
@@ -39,6 +55,7 @@ class BaselineFieldsRepo:
         )
         self.session.add(row)
         await self.session.commit()
+        await read_cache.invalidate(BASELINE_FIELDS)
         await self.session.refresh(row)
         return row
 
@@ -49,6 +66,22 @@ class BaselineFieldsRepo:
         res = await self.session.execute(q)
         return list(res.scalars().all())
 
+    async def list_fields_cached(
+        self,
+        *,
+        ttl_sec: float,
+        include_inactive: bool = False,
+        limit: int = 200,
+    ) -> list[dict]:
+        """list_fields через read_cache: строки — dict с CACHED_LIST_FIELDS; сбрасывается записями полей."""
+
+        async def load():
+            rows = await self.list_fields(include_inactive=include_inactive, limit=limit)
+            return [{f: getattr(row, f) for f in CACHED_LIST_FIELDS} for row in rows]
+
+        key = f"list:{include_inactive}:{limit}"
+        return await read_cache.get_or_load(BASELINE_FIELDS, key, load, ttl_sec=ttl_sec)
+
     async def get_by_id(self, field_id: int) -> BaselineField | None:
         q = select(BaselineField).where(BaselineField.id == field_id)
         res = await self.session.execute(q)
@@ -87,7 +120,10 @@ class BaselineFieldsRepo:
 
         row.updated_at = datetime.utcnow()
         await self.session.commit()
+        await read_cache.invalidate(BASELINE_FIELDS)
         await self.session.refresh(row)
+        if preferred_windows is not None:
+            field_windows_cache.invalidate(field_id)
         return row
 
     async def delete_field(self, field_id: int) -> bool:
@@ -96,4 +132,13 @@ class BaselineFieldsRepo:
             return False
         await self.session.delete(row)
         await self.session.commit()
+        field_windows_cache.invalidate(field_id)
+        # ON DELETE SET NULL меняет tensions.field_id — фильтр ?field_id= тоже устарел
+        await read_cache.invalidate(BASELINE_FIELDS, TENSIONS)
         return True
+
+    async def week_minutes(self, week_start: date) -> dict[int, int]:
+        # field_id -> минуты календаря за неделю (поддерживается дельтами при синке зеркала)
+        q = select(FieldWeekMinutes.field_id, FieldWeekMinutes.minutes).where(FieldWeekMinutes.week_start == week_start)
+        res = await self.session.execute(q)
+        return {row.field_id: row.minutes for row in res}
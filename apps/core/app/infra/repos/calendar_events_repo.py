@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_, delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.services.field_quota import FieldAttributor, WeekKey, add_contribution, new_deltas
+from app.infra.cache import CALENDAR, read_cache
+from app.infra.db.models.baseline_fields import BaselineField
+from app.infra.db.models.calendar_events import CalendarEvent
+from app.infra.db.models.calendar_sync_state import CalendarSyncState
+from app.infra.db.models.field_week_minutes import FieldWeekMinutes
+
+UPSERT_CHUNK = 500
+
+
+def _event_bounds(item: dict, tz: ZoneInfo) -> tuple[str, str, datetime, datetime, bool] | None:
+    start = item.get("start") or {}
+    end = item.get("end") or {}
+    start_raw = start.get("dateTime") or start.get("date")
+    end_raw = end.get("dateTime") or end.get("date")
+    if not start_raw or not end_raw:
+        return None
+
+    if "dateTime" in start:
+        start_utc = datetime.fromisoformat(start_raw).astimezone(timezone.utc)
+        end_utc = datetime.fromisoformat(end_raw).astimezone(timezone.utc)
+        return start_raw, end_raw, start_utc, end_utc, False
+
+    # all-day: границы суток в TZ пользователя
+    start_day = datetime.fromisoformat(start_raw).date()
+    end_day = datetime.fromisoformat(end_raw).date()
+    start_utc = datetime.combine(start_day, time(0, 0), tzinfo=tz).astimezone(timezone.utc)
+    end_utc = datetime.combine(end_day, time(0, 0), tzinfo=tz).astimezone(timezone.utc)
+    return start_raw, end_raw, start_utc, end_utc, True
+
+
+class CalendarEventsRepo:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_sync_state(self, calendar_id: str) -> CalendarSyncState | None:
+        q = select(CalendarSyncState).where(CalendarSyncState.calendar_id == calendar_id)
+        res = await self.session.execute(q)
+        return res.scalar_one_or_none()
+
+    async def apply_changes(
+        self,
+        calendar_id: str,
+        items: list[dict],
+        *,
+        tz_name: str,
+        sync_token: str | None = None,
+        full: bool = False,
+    ) -> int:
+        """
+        Применяет пачку событий Google к зеркалу одной транзакцией.
+
+        full=True — полный ресинк: зеркало календаря заменяется целиком.
+        sync_token записывается в состояние только если передан.
+        Заодно обновляет field_week_minutes дельтами (старый вклад событий -> новый).
+        """
+        tz = ZoneInfo(tz_name)
+        now = datetime.now(timezone.utc)
+
+        # sync и write-through из /calendar/create не должны считать дельты по одним и тем же строкам параллельно
+        await self.session.execute(select(func.pg_advisory_xact_lock(func.hashtext(calendar_id))))
+
+        # одно и то же событие дважды в пачке -> берём последнюю версию
+        items = list({it["id"]: it for it in items if it.get("id")}.values())
+
+        attributor = await self._field_attributor()
+        deltas = new_deltas()
+        changed_ids = None if full else [it["id"] for it in items]
+        for old in await self._attributed(calendar_id, changed_ids):
+            add_contribution(deltas, old.field_id, old.start_utc, old.end_utc, old.is_all_day, tz, -1)
+
+        if full:
+            await self.session.execute(delete(CalendarEvent).where(CalendarEvent.calendar_id == calendar_id))
+
+        rows: list[dict] = []
+        cancelled: list[str] = []
+        for it in items:
+            event_id = it.get("id")
+            if not event_id:
+                continue
+            if it.get("status") == "cancelled":
+                cancelled.append(event_id)
+                continue
+            bounds = _event_bounds(it, tz)
+            if bounds is None:
+                continue
+            start_raw, end_raw, start_utc, end_utc, is_all_day = bounds
+            field_id = attributor.field_for(it)
+            add_contribution(deltas, field_id, start_utc, end_utc, is_all_day, tz, +1)
+            rows.append({
+                "calendar_id": calendar_id,
+                "event_id": event_id,
+                "summary": it.get("summary"),
+                "status": it.get("status"),
+                "start_raw": start_raw,
+                "end_raw": end_raw,
+                "start_utc": start_utc,
+                "end_utc": end_utc,
+                "is_all_day": is_all_day,
+                "field_id": field_id,
+                "synced_at": now,
+            })
+
+        if cancelled and not full:
+            await self.session.execute(
+                delete(CalendarEvent).where(
+                    tuple_(CalendarEvent.calendar_id, CalendarEvent.event_id).in_(
+                        [(calendar_id, event_id) for event_id in cancelled]
+                    )
+                )
+            )
+
+        for i in range(0, len(rows), UPSERT_CHUNK):
+            stmt = insert(CalendarEvent).values(rows[i:i + UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CalendarEvent.calendar_id, CalendarEvent.event_id],
+                set_={
+                    "summary": stmt.excluded.summary,
+                    "status": stmt.excluded.status,
+                    "start_raw": stmt.excluded.start_raw,
+                    "end_raw": stmt.excluded.end_raw,
+                    "start_utc": stmt.excluded.start_utc,
+                    "end_utc": stmt.excluded.end_utc,
+                    "is_all_day": stmt.excluded.is_all_day,
+                    "field_id": stmt.excluded.field_id,
+                    "synced_at": stmt.excluded.synced_at,
+                },
+            )
+            await self.session.execute(stmt)
+
+        await self._apply_week_deltas(deltas)
+
+        if sync_token is not None:
+            state = await self.get_sync_state(calendar_id)
+            if state is None:
+                state = CalendarSyncState(calendar_id=calendar_id)
+                self.session.add(state)
+            state.sync_token = sync_token
+            state.last_synced_at = now
+            if full:
+                state.last_full_sync_at = now
+
+        await self.session.commit()
+        if full or rows or cancelled:
+            await read_cache.invalidate(CALENDAR)
+        return len(rows) + len(cancelled)
+
+    async def _field_attributor(self) -> FieldAttributor:
+        res = await self.session.execute(
+            select(BaselineField.id, BaselineField.name).where(BaselineField.is_active.is_(True))
+        )
+        return FieldAttributor((row.id, row.name) for row in res)
+
+    async def _attributed(self, calendar_id: str, event_ids: list[str] | None) -> list:
+        """Текущий вклад в квоты: строки зеркала с field_id (event_ids=None — весь календарь)."""
+        cols = (CalendarEvent.field_id, CalendarEvent.start_utc, CalendarEvent.end_utc, CalendarEvent.is_all_day)
+        base = select(*cols).where(CalendarEvent.calendar_id == calendar_id, CalendarEvent.field_id.is_not(None))
+        if event_ids is None:
+            return list((await self.session.execute(base)).all())
+
+        out: list = []
+        for i in range(0, len(event_ids), UPSERT_CHUNK):
+            q = base.where(CalendarEvent.event_id.in_(event_ids[i:i + UPSERT_CHUNK]))
+            out.extend((await self.session.execute(q)).all())
+        return out
+
+    async def _apply_week_deltas(self, deltas: dict[WeekKey, int]) -> None:
+        values = [
+            {"field_id": field_id, "week_start": week, "minutes": minutes}
+            for (field_id, week), minutes in deltas.items()
+            if minutes
+        ]
+        for i in range(0, len(values), UPSERT_CHUNK):
+            stmt = insert(FieldWeekMinutes).values(values[i:i + UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[FieldWeekMinutes.field_id, FieldWeekMinutes.week_start],
+                set_={"minutes": FieldWeekMinutes.minutes + stmt.excluded.minutes},
+            )
+            await self.session.execute(stmt)
+
+    async def list_range(self, calendar_id: str, time_min: datetime, time_max: datetime) -> list[CalendarEvent]:
+        # пересечение с [time_min, time_max), как timeMin/timeMax у Google
+        q = (
+            select(CalendarEvent)
+            .where(
+                and_(
+                    CalendarEvent.calendar_id == calendar_id,
+                    CalendarEvent.start_utc < time_max,
+                    CalendarEvent.end_utc > time_min,
+                )
+            )
+            .order_by(CalendarEvent.start_utc.asc(), CalendarEvent.event_id.asc())
+        )
+        res = await self.session.execute(q)
+        return list(res.scalars().all())
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infra.db.models.calendar_watch_channels import CalendarWatchChannel
+
+
+class CalendarWatchRepo:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_channel(
+        self,
+        *,
+        channel_id: str,
+        calendar_id: str,
+        resource_id: str,
+        token: str,
+        expiration: datetime,
+        created_at: datetime,
+    ) -> CalendarWatchChannel:
+        row = CalendarWatchChannel(
+            channel_id=channel_id,
+            calendar_id=calendar_id,
+            resource_id=resource_id,
+            token=token,
+            expiration=expiration,
+            created_at=created_at,
+        )
+        self.session.add(row)
+        await self.session.commit()
+        return row
+
+    async def get_channel(self, channel_id: str) -> CalendarWatchChannel | None:
+        return await self.session.get(CalendarWatchChannel, channel_id)
+
+    async def list_channels(self, calendar_id: str) -> list[CalendarWatchChannel]:
+        q = (
+            select(CalendarWatchChannel)
+            .where(CalendarWatchChannel.calendar_id == calendar_id)
+            .order_by(CalendarWatchChannel.expiration.asc())
+        )
+        res = await self.session.execute(q)
+        return list(res.scalars().all())
+
+    async def delete_channel(self, channel_id: str) -> None:
+        await self.session.execute(
+            delete(CalendarWatchChannel).where(CalendarWatchChannel.channel_id == channel_id)
+        )
+        await self.session.commit()
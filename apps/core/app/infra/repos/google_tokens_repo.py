@@ -1,21 +1,32 @@
 from datetime import datetime
-from sqlalchemy import select, delete
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.infra.db.models.google_oauth_token import GoogleOAuthToken
 
 class GoogleTokensRepo:
-    async def get_latest(self, db: AsyncSession) -> GoogleOAuthToken | None:
-        q = select(GoogleOAuthToken).order_by(GoogleOAuthToken.id.desc()).limit(1)
+    async def get_first(self, db: AsyncSession) -> GoogleOAuthToken | None:
+        # первый подключённый аккаунт (по PK, без скана) — аккаунт по умолчанию
+        q = select(GoogleOAuthToken).order_by(GoogleOAuthToken.id).limit(1)
         r = await db.execute(q)
         return r.scalar_one_or_none()
 
-    async def upsert_single(self, db: AsyncSession, *, access_token: str, refresh_token: str | None,
-                            token_type: str, scope: str | None, expiry_utc):
-        # v0.1: держим ровно одну запись — проще и безопаснее
-        await db.execute(delete(GoogleOAuthToken))
+    async def get_by_account(self, db: AsyncSession, account_id: str) -> GoogleOAuthToken | None:
+        q = select(GoogleOAuthToken).where(GoogleOAuthToken.account_id == account_id)
+        r = await db.execute(q)
+        return r.scalar_one_or_none()
 
+    async def list_accounts(self, db: AsyncSession) -> list[GoogleOAuthToken]:
+        q = select(GoogleOAuthToken).order_by(GoogleOAuthToken.id.asc())
+        r = await db.execute(q)
+        return list(r.scalars().all())
+
+    async def upsert_account(self, db: AsyncSession, *, account_id: str, access_token: str,
+                             refresh_token: str | None, token_type: str, scope: str | None, expiry_utc):
+        # одна запись на аккаунт; повторный connect обновляет её
         now = datetime.utcnow()
-        tok = GoogleOAuthToken(
+        stmt = insert(GoogleOAuthToken).values(
+            account_id=account_id,
             access_token=access_token,
             refresh_token=refresh_token,
             token_type=token_type or "Bearer",
@@ -24,9 +35,20 @@ class GoogleTokensRepo:
             created_utc=now,
             updated_utc=now,
         )
-        db.add(tok)
+        set_ = {
+            "access_token": stmt.excluded.access_token,
+            "token_type": stmt.excluded.token_type,
+            "scope": stmt.excluded.scope,
+            "expiry_utc": stmt.excluded.expiry_utc,
+            "updated_utc": stmt.excluded.updated_utc,
+        }
+        if refresh_token:
+            # Google присылает refresh_token не на каждый consent — старый не затираем
+            set_["refresh_token"] = stmt.excluded.refresh_token
+        stmt = stmt.on_conflict_do_update(index_elements=[GoogleOAuthToken.account_id], set_=set_)
+        await db.execute(stmt)
         await db.commit()
-        return tok
+        return await self.get_by_account(db, account_id)
 
     async def update_access(self, db: AsyncSession, tok: GoogleOAuthToken, *, access_token: str, expiry_utc):
         tok.access_token = access_token
@@ -0,0 +1,65 @@
+"""
+Непрозрачные курсоры для keyset-пагинации по (created_at, id).
+
+Курсор — base64url от JSON [created_at ISO, id] последней строки страницы.
+Следующая страница — WHERE (created_at, id) < (:c, :i) ORDER BY created_at DESC, id DESC,
+то есть любая глубокая страница стоит столько же, сколько первая (без OFFSET).
+
+Поиск пагинируется так же, но по (rank, id): rank — numeric, округлённый в SQL,
+и в курсоре хранится строкой, чтобы сравнение было точным.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode(key: str, row_id: int) -> str:
+    raw = json.dumps([key, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode(cursor: str) -> tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor("malformed cursor")
+    if not isinstance(key, str) or not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise InvalidCursor("malformed cursor")
+    return key, row_id
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return _encode(created_at.isoformat(), row_id)
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    created_at_iso, row_id = _decode(cursor)
+    try:
+        return datetime.fromisoformat(created_at_iso), row_id
+    except ValueError:
+        raise InvalidCursor("malformed cursor")
+
+
+def encode_rank_cursor(rank: Decimal, row_id: int) -> str:
+    return _encode(str(rank), row_id)
+
+
+def decode_rank_cursor(cursor: str) -> tuple[Decimal, int]:
+    rank, row_id = _decode(cursor)
+    try:
+        value = Decimal(rank)
+    except InvalidOperation:
+        raise InvalidCursor("malformed cursor")
+    if not value.is_finite():
+        raise InvalidCursor("malformed cursor")
+    return value, row_id
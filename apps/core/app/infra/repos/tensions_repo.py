@@ -1,13 +1,240 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+import re
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Numeric, String, and_, bindparam, cast, column, func, literal, select, text, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infra.db.models.tensions import Tension
+from app.infra.cache import TENSIONS, read_cache
+from app.infra.db.models.tensions import ACTIVE_SQL, ACTIVE_STATUSES, Tension, status_in
 from app.infra.db.models.tension_events import TensionEvent
+from app.infra.repos.keyset import decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+
+# слова запроса -> префиксный tsquery ("напряж:* & спин:*"); в запросе — не больше 8 слов
+_SEARCH_WORD_RE = re.compile(r"\w+")
+SEARCH_MAX_WORDS = 8
+# полнотекстовые совпадения ранжируются выше любых нечётких (word_similarity <= 1)
+SEARCH_FTS_RANK_BASE = 2
+# поля строк в кэшированных страницах (TensionOut в /tensions/active, /list в боте)
+CACHED_PAGE_FIELDS = ("id", "title", "status", "charge", "vector", "urgency")
+
+
+def search_tsquery(query: str, *, prefix: bool = True) -> str | None:
+    words = _SEARCH_WORD_RE.findall(query.lower())[:SEARCH_MAX_WORDS]
+    if not words:
+        return None
+    return " & ".join(f"{w}:*" if prefix else w for w in words)
+
+# return_at ещё не отработан планировщиком (отработанный копируется в return_fired_at)
+RETURN_AT_PENDING_SQL = "(return_at IS NOT NULL AND return_fired_at IS DISTINCT FROM return_at)"
+
+
+
+def urgency_sql(
+    *,
+    charge: str = "charge",
+    created_at: str = "created_at",
+    return_at: str = "return_at",
+    return_count: str = "return_count",
+    last_returned_at: str = "last_returned_at",
+    now: str = ":now",
+) -> str:
+    """
+    SQL-выражение срочности (целые очки) из колонок строки tensions.
+
+    Аргументы — подставляемые SQL-выражения: в UPDATE, который сам меняет вход
+    (например, return_count), передаётся уже новое значение.
+    Очки целые — периодический пересчёт пишет только строки, где счёт сдвинулся.
+    """
+    return f"""(
+        {charge} * 100
+        -- возраст: +2 за сутки, до +60
+        + LEAST(floor(EXTRACT(EPOCH FROM ({now} - {created_at})) / 86400), 30)::int * 2
+        -- просроченный return_at: +50 и +2 за час, до +194
+        + CASE WHEN {return_at} <= {now}
+               THEN 50 + LEAST(floor(EXTRACT(EPOCH FROM ({now} - {return_at})) / 3600), 72)::int * 2
+               ELSE 0 END
+        -- возвращается снова и снова: +5 за возврат, до +50
+        + LEAST({return_count}, 10) * 5
+        -- только что возвращали: до -96, сходит на нет за сутки
+        - CASE WHEN {last_returned_at} > {now} - interval '24 hours'
+               THEN (24 - floor(EXTRACT(EPOCH FROM ({now} - {last_returned_at})) / 3600))::int * 4
+               ELSE 0 END
+    )"""
+
+
+URGENCY_SQL = urgency_sql()
+
+# пересчёт одного напряжения после изменения входов (charge, статус, ...)
+RECOMPUTE_URGENCY_SQL = text(f"UPDATE tensions SET urgency = {URGENCY_SQL} WHERE id = :id")
+
+# Периодический пересчёт активных ради затухания по времени (возраст, просрочка, кулдаун).
+# Пишутся только строки, у которых счёт изменился. Advisory lock — один пересчёт
+# на базу, даже если API поднят в нескольких воркерах.
+REFRESH_URGENCY_SQL = text(f"""
+WITH lock AS (
+    SELECT pg_try_advisory_xact_lock(hashtext('helix_urgency_refresh')) AS taken
+),
+refreshed AS (
+    UPDATE tensions
+    SET urgency = {URGENCY_SQL}
+    WHERE {ACTIVE_SQL}
+      AND urgency IS DISTINCT FROM {URGENCY_SQL}
+      AND (SELECT taken FROM lock)
+    RETURNING 1
+)
+SELECT CASE WHEN (SELECT taken FROM lock) THEN count(*) END FROM refreshed
+""")
+
+# частичный индекс ix_tensions_active_return_at
+_SCHEDULED_SQL = f"""
+SELECT id, return_at AS due_at
+FROM tensions
+WHERE {ACTIVE_SQL}
+  AND return_at IS NOT NULL AND return_at <= :until
+  AND return_fired_at IS DISTINCT FROM return_at
+  {{extra}}
+"""
+
+# Плановый возврат одного напряжения: пометить return_fired_at и записать 'returned'
+# одним statement. FOR UPDATE + повторная проверка срока — второй процесс тот же возврат не отправит.
+# Возврат, взведённый cadence-движком, узнаём по return_at = last_triggered_at (слот периода).
+FIRE_RETURN_SQL = text(f"""
+WITH target AS (
+    SELECT id
+    FROM tensions
+    WHERE id = :id AND {ACTIVE_SQL} AND {RETURN_AT_PENDING_SQL} AND return_at <= :now
+    FOR UPDATE
+),
+fired AS (
+    UPDATE tensions t
+    SET return_fired_at = t.return_at,
+        return_count = t.return_count + 1,
+        last_returned_at = :now,
+        urgency = {urgency_sql(return_count="t.return_count + 1", last_returned_at=":now")}
+    FROM target
+    WHERE t.id = target.id
+    RETURNING t.*,
+              CASE WHEN t.cadence IS NOT NULL AND t.return_at = t.last_triggered_at
+                   THEN 'cadence' ELSE 'return_at' END AS fire_trigger
+),
+logged AS (
+    INSERT INTO tension_events (tension_id, type, actor, payload, created_at)
+    SELECT id, 'returned', 'helix',
+           jsonb_build_object(
+               'reason', 'scheduled',
+               'trigger', fire_trigger,
+               'due_at', return_at,
+               'vector', vector,
+               'charge', charge,
+               'status', status
+           ),
+           :now
+    FROM fired
+    RETURNING tension_id
+)
+SELECT * FROM fired
+""")
+
+# Границы периодов cadence — в TZ пользователя: date_trunc по локальному времени и обратно
+# в timestamptz, поэтому "полночь"/"понедельник"/"1-е число" верны и при переходе на DST.
+# Возврат взводится не на саму границу, а на слот периода: граница + :return_hour местного
+# времени (settings.cadence_return_hour). Слот пишется и в last_triggered_at — date_trunc
+# слота даёт ту же границу, так что проверка "период уже взведён" от часа не зависит.
+_CADENCE_UNIT_SQL = "CASE cadence WHEN 'daily' THEN 'day' WHEN 'weekly' THEN 'week' WHEN 'monthly' THEN 'month' END"
+_CADENCE_STEP_SQL = (
+    "CASE cadence WHEN 'daily' THEN interval '1 day' "
+    "WHEN 'weekly' THEN interval '7 days' WHEN 'monthly' THEN interval '1 month' END"
+)
+
+# Cadence-движок: все периодические напряжения, у которых прошла граница следующего периода,
+# взводятся разом — UPDATE ... RETURNING + INSERT событий 'return_scheduled' одним statement.
+# После простоя взводится только текущий период (без очереди пропущенных).
+# Не отработанный return_at, выставленный вручную, не трогаем; взведённый движком
+# на прошлый период (return_at = last_triggered_at) переносится на слот текущего.
+# helix.tension_notify=off — без NOTIFY на каждую строку (планировщик перечитает всё сам).
+ARM_CADENCE_SQL = text(f"""
+WITH due AS (
+    SELECT id,
+           period_local AT TIME ZONE :tz AS period_start,
+           slot,
+           CASE WHEN return_at IS NOT NULL AND return_fired_at IS DISTINCT FROM return_at
+                     AND return_at IS DISTINCT FROM last_triggered_at
+                THEN return_at ELSE slot END AS new_return_at
+    FROM (
+        SELECT *, (period_local + make_interval(hours => CAST(:return_hour AS int))) AT TIME ZONE :tz AS slot
+        FROM (
+            SELECT id, return_at, return_fired_at, last_triggered_at,
+                   date_trunc({_CADENCE_UNIT_SQL}, CAST(:now AS timestamptz) AT TIME ZONE :tz) AS period_local
+            FROM tensions
+            WHERE {ACTIVE_SQL}
+              AND cadence IS NOT NULL
+              AND (date_trunc({_CADENCE_UNIT_SQL}, COALESCE(last_triggered_at, created_at) AT TIME ZONE :tz)
+                   + {_CADENCE_STEP_SQL}) AT TIME ZONE :tz <= :now
+            FOR UPDATE SKIP LOCKED
+        ) locked
+    ) d
+),
+armed AS (
+    UPDATE tensions t
+    SET last_triggered_at = due.slot,
+        return_at = due.new_return_at,
+        urgency = {urgency_sql(return_at="due.new_return_at")}
+    FROM due
+    WHERE t.id = due.id
+    RETURNING t.id, t.cadence, t.return_at, due.period_start
+),
+logged AS (
+    INSERT INTO tension_events (tension_id, type, actor, payload, created_at)
+    SELECT id, 'return_scheduled', 'system',
+           jsonb_build_object('cadence', cadence, 'period_start', period_start, 'return_at', return_at),
+           :now
+    FROM armed
+    RETURNING tension_id
+)
+SELECT count(*) FROM logged
+""")
+
+
+def _page_query(
+    *,
+    statuses: tuple[str, ...],
+    vector: str | None,
+    field_id: int | None,
+    limit: int,
+    cursor: str | None,
+):
+    q = select(Tension).where(status_in(statuses))
+    if vector is not None:
+        q = q.where(Tension.vector == vector)
+    if field_id is not None:
+        q = q.where(Tension.field_id == field_id)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        q = q.where(tuple_(Tension.created_at, Tension.id) < tuple_(created_at, last_id))
+    # +1 строка — чтобы понять, есть ли следующая страница, без COUNT
+    return q.order_by(Tension.created_at.desc(), Tension.id.desc()).limit(limit + 1)
+
+
+def _top_query(limit: int):
+    # top-N берётся только из колонок ix_tensions_active_urgency (Index Only Scan),
+    # полные строки — по id для уже отобранных N
+    top = (
+        select(Tension.id, Tension.urgency, Tension.created_at)
+        .where(status_in())
+        .order_by(Tension.urgency.desc(), Tension.created_at, Tension.id)
+        .limit(limit)
+        .subquery("top")
+    )
+    return (
+        select(Tension)
+        .join(top, Tension.id == top.c.id)
+        .order_by(top.c.urgency.desc(), top.c.created_at, top.c.id)
+    )
 
 
 class TensionsRepo:
@@ -28,6 +255,7 @@ class TensionsRepo:
 
         t = Tension(
             title=title,
+            search_notes=note or "",
             charge=charge,
             vector=vector,
             status=status,
@@ -51,22 +279,281 @@ class TensionsRepo:
             created_at=now,
         )
         self.session.add(ev)
+        await self._recompute_urgency(t.id, now)
 
         await self.session.commit()
+        await read_cache.invalidate(TENSIONS)
         await self.session.refresh(t)
         return t
 
+    async def find_similar(
+        self,
+        title: str,
+        *,
+        threshold: float = 0.5,
+        limit: int = 3,
+    ) -> list[tuple[Tension, float]]:
+        """
+        Похожие активные напряжения по заголовку: [(напряжение, similarity)], самые похожие сверху.
+
+        pg_trgm: title % :title по частичному GIN ix_tensions_active_title_trgm —
+        кандидаты берутся из индекса, а не перебором всех активных.
+        """
+        title = title.strip()
+        if not title:
+            return []
+        # порог оператора % — только на эту транзакцию
+        await self.session.execute(
+            text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+            {"threshold": str(threshold)},
+        )
+        similarity = func.similarity(Tension.title, title)
+        q = (
+            select(Tension, similarity.label("similarity"))
+            .where(status_in())
+            .where(Tension.title.op("%", is_comparison=True)(title))
+            .order_by(similarity.desc(), Tension.id.desc())
+            .limit(limit)
+        )
+        res = await self.session.execute(q)
+        rows = [(t, float(sim)) for t, sim in res.all()]
+        await self.session.commit()
+        return rows
+
+    async def merge_capture(
+        self,
+        tension_id: int,
+        *,
+        title: str,
+        note: Optional[str] = None,
+        charge: int | None = None,
+        actor: str = "user",
+    ) -> Tension | None:
+        """
+        Повторный захват уже удерживаемого напряжения: вместо нового — дополняем существующее.
+
+        Формулировка и заметка идут в search_notes (находятся поиском), charge — максимум
+        из двух, событие 'edited' с payload {"merged_capture": ...}. None — нет такого активного.
+        """
+        t = await self.get_by_id(tension_id)
+        if not t or t.status not in ACTIVE_STATUSES:
+            return None
+
+        now = datetime.utcnow()
+        extra = "\n".join(part for part in (title, note) if part)
+        t.search_notes = f"{t.search_notes}\n{extra}" if t.search_notes else extra
+        if charge is not None and charge > t.charge:
+            t.charge = charge
+        t.updated_at = now
+        self.session.add(
+            TensionEvent(
+                tension_id=t.id,
+                type="edited",
+                actor=actor,
+                payload={"merged_capture": {"title": title, "note": note, "charge": charge}},
+                created_at=now,
+            )
+        )
+        await self._recompute_urgency(t.id, now)
+
+        await self.session.commit()
+        await read_cache.invalidate(TENSIONS)
+        await self.session.refresh(t)
+        return t
+
+    async def _recompute_urgency(self, tension_id: int, now: datetime) -> None:
+        # text() не вызывает autoflush — сбрасываем ORM-изменения, чтобы UPDATE видел новый charge
+        await self.session.flush()
+        await self.session.execute(RECOMPUTE_URGENCY_SQL, {"id": tension_id, "now": now})
+
     async def list_active(self, limit: int = 50) -> list[Tension]:
         # active = не завершено и не dropped
+        items, _ = await self.list_page(limit=limit)
+        return items
+
+    async def list_page(
+        self,
+        *,
+        statuses: tuple[str, ...] = ACTIVE_STATUSES,
+        vector: str | None = None,
+        field_id: int | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[Tension], str | None]:
+        """
+        Страница напряжений, новые сверху; возвращает (строки, курсор следующей страницы или None).
+
+        Keyset по (created_at, id) без OFFSET: активные — частичный ix_tensions_active_created,
+        прочие статусы — ix_tensions_created_at_id. Кривой курсор -> InvalidCursor.
+        """
+        q = _page_query(statuses=statuses, vector=vector, field_id=field_id, limit=limit, cursor=cursor)
+        res = await self.session.execute(q)
+        rows = list(res.scalars().all())
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    async def list_page_cached(
+        self,
+        *,
+        ttl_sec: float,
+        statuses: tuple[str, ...] = ACTIVE_STATUSES,
+        vector: str | None = None,
+        field_id: int | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        list_page через read_cache (общий для API и бота): строки — dict с CACHED_PAGE_FIELDS.
+
+        Сбрасывается любой записью в tensions через этот репозиторий; ttl_sec — страховка.
+        """
+
+        async def load():
+            rows, next_cursor = await self.list_page(
+                statuses=statuses, vector=vector, field_id=field_id, limit=limit, cursor=cursor
+            )
+            return [{f: getattr(t, f) for f in CACHED_PAGE_FIELDS} for t in rows], next_cursor
+
+        key = f"page:{','.join(statuses)}:{vector}:{field_id}:{limit}:{cursor}"
+        items, next_cursor = await read_cache.get_or_load(TENSIONS, key, load, ttl_sec=ttl_sec)
+        return items, next_cursor
+
+    async def list_schedulable(self, vectors: tuple[str, ...], limit: int = 1000) -> list[Tension]:
+        # активные напряжения, которые можно поставить в календарь (для планировщика)
         q = (
             select(Tension)
-            .where(Tension.status.in_(("held", "forming")))
-            .order_by(Tension.created_at.desc())
+            .where(status_in(), Tension.vector.in_(vectors))
+            .order_by(Tension.charge.desc(), Tension.id)
             .limit(limit)
         )
         res = await self.session.execute(q)
         return list(res.scalars().all())
 
+    async def search_page(
+        self,
+        query: str,
+        *,
+        statuses: tuple[str, ...] = ACTIVE_STATUSES,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> tuple[list[tuple[Tension, Decimal]], str | None]:
+        """
+        Поиск по заголовку и заметкам: ([(напряжение, rank)], курсор следующей страницы или None).
+
+        Два яруса подряд, keyset по (rank, id):
+        - полнотекстовые (префиксный tsquery, ix_tensions_search_tsv): rank = 2 + ts_rank_cd
+          по префиксам + ts_rank_cd по целым словам (точное слово выше "начинается с");
+        - за ними — нечёткие (опечатки) по pg_trgm word_similarity (ix_tensions_search_trgm),
+          кроме уже найденных полнотекстом: rank = word_similarity <= 1.
+        Ранги ярусов не пересекаются, поэтому один курсор ведёт через оба; страница может
+        начинаться в одном ярусе и заканчиваться в другом. Дорогой word_similarity считается,
+        только когда полнотекстовые кончились — не для тысяч точных совпадений широкого запроса.
+        Кривой курсор -> InvalidCursor.
+        """
+        tsquery = search_tsquery(query)
+        if tsquery is None:
+            return [], None
+        after = decode_rank_cursor(cursor) if cursor else None
+        tsq = func.to_tsquery(cast("simple", REGCONFIG), tsquery)
+        tsq_exact = func.to_tsquery(cast("simple", REGCONFIG), search_tsquery(query, prefix=False))
+        q_text = literal(query.strip(), String)
+        fts_match = Tension.search_tsv.op("@@")(tsq)
+
+        rows = []
+        if after is None or after[0] >= SEARCH_FTS_RANK_BASE:
+            rank = func.round(
+                cast(
+                    SEARCH_FTS_RANK_BASE
+                    + func.ts_rank_cd(Tension.search_tsv, tsq)
+                    + func.ts_rank_cd(Tension.search_tsv, tsq_exact),
+                    Numeric,
+                ),
+                6,
+            )
+            rows = await self._search_tier(rank, fts_match, statuses, limit + 1, after)
+        if len(rows) <= limit:
+            # полнотекстовый ярус кончился на этой странице — добираем нечёткими
+            rank = func.round(cast(func.word_similarity(q_text, Tension.search_text), Numeric), 6)
+            fuzzy_match = and_(q_text.op("<%", is_comparison=True)(Tension.search_text), ~fts_match)
+            fuzzy_after = after if after is not None and after[0] < SEARCH_FTS_RANK_BASE else None
+            rows += await self._search_tier(rank, fuzzy_match, statuses, limit + 1 - len(rows), fuzzy_after)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last, last_rank = rows[-1]
+            next_cursor = encode_rank_cursor(last_rank, last.id)
+        return rows, next_cursor
+
+    async def _search_tier(self, rank, match, statuses, limit: int, after: tuple[Decimal, int] | None):
+        q = select(Tension, rank.label("rank")).where(status_in(statuses)).where(match)
+        if after is not None:
+            q = q.where(tuple_(rank, Tension.id) < tuple_(*after))
+        q = q.order_by(rank.desc(), Tension.id.desc()).limit(limit)
+        res = await self.session.execute(q)
+        return [(t, r) for t, r in res.all()]
+
+    async def list_top(self, limit: int = 10) -> list[Tension]:
+        """Самые срочные активные (index-only по ix_tensions_active_urgency + N чтений по id)."""
+        res = await self.session.execute(_top_query(limit))
+        return list(res.scalars().all())
+
+    async def refresh_urgency(self, *, now: datetime) -> int | None:
+        """Пересчёт срочности активных; None — пересчёт уже идёт в другом процессе."""
+        refreshed = await self.session.scalar(REFRESH_URGENCY_SQL, {"now": now})
+        await self.session.commit()
+        if refreshed:
+            await read_cache.invalidate(TENSIONS)
+        return refreshed
+
+    async def list_scheduled(
+        self,
+        *,
+        until: datetime,
+        ids: Iterable[int] | None = None,
+    ) -> list[tuple[int, datetime]]:
+        """(id, когда вернуть) для активных напряжений с плановым возвратом не позже until."""
+        if ids is None:
+            q = text(_SCHEDULED_SQL.format(extra=""))
+            params = {"until": until}
+        else:
+            q = text(_SCHEDULED_SQL.format(extra="AND id IN :ids")).bindparams(bindparam("ids", expanding=True))
+            params = {"until": until, "ids": list(ids)}
+        res = await self.session.execute(q, params)
+        return [(row.id, row.due_at) for row in res]
+
+    async def fire_scheduled_return(self, tension_id: int, *, now: datetime) -> tuple[Tension, str] | None:
+        """
+        Отмечает плановый возврат (return_fired_at) и пишет событие 'returned'.
+
+        (напряжение, "return_at" | "cadence"); None — уже не активно, отработано или срок не пришёл.
+        """
+        stmt = (
+            select(Tension, column("fire_trigger"))
+            .from_statement(FIRE_RETURN_SQL)
+            .execution_options(populate_existing=True)
+        )
+        res = await self.session.execute(stmt, {"id": tension_id, "now": now})
+        row = res.one_or_none()
+        await self.session.commit()
+        if row is None:
+            return None
+        await read_cache.invalidate(TENSIONS)
+        return row[0], row[1]
+
+    async def arm_cadence(self, *, now: datetime, tz_name: str, return_hour: int = 0) -> int:
+        """Взводит return_at (начало периода + return_hour местного времени) всем периодическим с новым периодом."""
+        await self.session.execute(text("SET LOCAL helix.tension_notify = 'off'"))
+        armed = await self.session.scalar(
+            ARM_CADENCE_SQL, {"now": now, "tz": tz_name, "return_hour": return_hour}
+        )
+        await self.session.commit()
+        if armed:
+            await read_cache.invalidate(TENSIONS)
+        return armed or 0
+
     async def get_by_id(self, tension_id: int) -> Tension | None:
         q = select(Tension).where(Tension.id == tension_id)
         res = await self.session.execute(q)
@@ -132,11 +619,50 @@ class TensionsRepo:
 
         if changed:
             t.updated_at = now
+            await self._recompute_urgency(t.id, now)
             await self.session.commit()
+            await read_cache.invalidate(TENSIONS)
             await self.session.refresh(t)
 
         return t
 
+    async def postpone_tension(
+        self,
+        tension_id: int,
+        *,
+        delay: timedelta,
+        actor: str = "user",
+    ) -> Tension | None:
+        """
+        Отложить активное напряжение: return_at = сейчас + delay, событие 'postponed'.
+
+        Просрочка из срочности уходит сразу, а не на следующем UrgencyRefresher;
+        новый return_at планировщик получает через NOTIFY-триггер. None — нет такого активного.
+        """
+        t = await self.get_by_id(tension_id)
+        if not t or t.status not in ACTIVE_STATUSES:
+            return None
+
+        now = datetime.utcnow()
+        prev = t.return_at
+        t.return_at = (now + delay).replace(tzinfo=timezone.utc)
+        t.updated_at = now
+        self.session.add(
+            TensionEvent(
+                tension_id=t.id,
+                type="postponed",
+                actor=actor,
+                payload={"from": prev.isoformat() if prev else None, "to": t.return_at.isoformat()},
+                created_at=now,
+            )
+        )
+        await self._recompute_urgency(t.id, now)
+
+        await self.session.commit()
+        await read_cache.invalidate(TENSIONS)
+        await self.session.refresh(t)
+        return t
+
     async def release_tension(
         self,
         tension_id: int,
@@ -155,6 +681,8 @@ class TensionsRepo:
         prev_status = t.status
         t.status = "released"
         t.updated_at = now
+        if note:
+            t.search_notes = f"{t.search_notes}\n{note}" if t.search_notes else note
 
         self.session.add(
             TensionEvent(
@@ -176,5 +704,6 @@ class TensionsRepo:
         )
 
         await self.session.commit()
+        await read_cache.invalidate(TENSIONS)
         await self.session.refresh(t)
         return t
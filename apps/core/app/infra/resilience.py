@@ -0,0 +1,175 @@
+"""
+Устойчивость исходящих вызовов: ретраи с jitter, Retry-After, circuit breaker.
+
+Всё живёт на уровне httpx-транспорта (ResilientTransport), так что любой вызов
+через общий клиент (app/infra/http_clients.py) получает это без изменений в сервисах:
+
+- 429 / 5xx / сетевые ошибки -> ограниченные ретраи с экспоненциальным full-jitter
+  backoff, Retry-After от upstream уважается;
+- POST повторяем только если запрос заведомо не выполнен (429, ошибка соединения)
+  или вызов явно помечен extensions={"idempotent": True};
+- по подряд идущим отказам breaker открывается и дальше запросы падают сразу
+  (CircuitOpenError) — медленный upstream не держит корутины остальных запросов.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from dataclasses import dataclass
+
+import httpx
+
+logger = logging.getLogger("helix.resilience")
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Upstream помечен как деградировавший — запрос не отправлялся."""
+
+    def __init__(self, upstream: str, retry_after_sec: float, request: httpx.Request | None = None):
+        super().__init__(f"circuit for {upstream} is open", request=request)
+        self.upstream = upstream
+        self.retry_after_sec = retry_after_sec
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, *, failure_threshold: int, reset_timeout_sec: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_sec = reset_timeout_sec
+
+        self.state = "closed"  # closed | open | half_open
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def before_request(self, request: httpx.Request) -> None:
+        if self.state == "closed":
+            return
+        elapsed = time.monotonic() - self._opened_at
+        if self.state == "open" and elapsed >= self.reset_timeout_sec:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            # пропускаем один пробный запрос
+            self._probe_in_flight = True
+            return
+        raise CircuitOpenError(self.name, max(0.0, self.reset_timeout_sec - elapsed), request=request)
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info("circuit %s closed", self.name)
+        self.state = "closed"
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning("circuit %s opened after %s failures", self.name, self._failures)
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        # пробный запрос отменён, не дойдя до результата — дадим шанс следующему
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        return {"state": self.state, "failures": self._failures}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay_sec: float = 0.2
+    max_delay_sec: float = 5.0
+    max_elapsed_sec: float = 10.0
+
+    def backoff(self, attempt: int) -> float:
+        # full jitter: U(0, min(cap, base * 2^attempt))
+        return random.uniform(0, min(self.max_delay_sec, self.base_delay_sec * (2 ** attempt)))
+
+
+def _retry_after_sec(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, *, breaker: CircuitBreaker, policy: RetryPolicy):
+        self._inner = inner
+        self.breaker = breaker
+        self.policy = policy
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in IDEMPOTENT_METHODS or bool(request.extensions.get("idempotent"))
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            self.breaker.before_request(request)
+            attempt += 1
+            can_retry = attempt < self.policy.max_attempts
+
+            try:
+                response = await self._inner.handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # запрос не ушёл — повторять безопасно для любого метода
+                self.breaker.record_failure()
+                delay = self.policy.backoff(attempt)
+                if not can_retry or self._over_budget(started, delay):
+                    raise
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                delay = self.policy.backoff(attempt)
+                if not (can_retry and idempotent) or self._over_budget(started, delay):
+                    raise
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    self.breaker.record_success()
+                    return response
+
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    # 429 — нас притормаживают, upstream при этом жив
+                    self.breaker.record_success()
+
+                retry_after = _retry_after_sec(response)
+                delay = retry_after if retry_after is not None else self.policy.backoff(attempt)
+                retry_safe = idempotent or response.status_code == 429
+                if not (can_retry and retry_safe) or self._over_budget(started, delay):
+                    return response
+                await response.aclose()
+
+            logger.info("retrying %s %s in %.2fs (attempt %s)", request.method, request.url.host, delay, attempt + 1)
+            await asyncio.sleep(delay)
+
+    def _over_budget(self, started: float, delay: float) -> bool:
+        # breaker opened by this very failure — no point retrying into it
+        if self.breaker.state == "open":
+            return True
+        return time.monotonic() - started + delay > self.policy.max_elapsed_sec
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
@@ -1,4 +1,6 @@
-from fastapi import FastAPI, Response
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import httpx
@@ -6,13 +8,50 @@ from app.api.routers.tensions import router as tensions_router
 from app.settings import settings
 from app.infra.db.session import engine
 from app.infra.db.init_db import init_db
+from app.infra.http_clients import HttpClients, get_openai_client
+from app.infra.etag_cache import ETagCache
+from app.infra.cache import backend_from_settings, read_cache
+from app.infra.resilience import CircuitOpenError
+from app.domain.services.google_token_manager import GoogleTokenManager
+from app.domain.services.calendar_watch import CalendarWatcher
+from app.domain.services.urgency_refresher import UrgencyRefresher
 
 from app.api.routers.oauth_google import router as oauth_google_router
 from app.api.routers.calendar import router as calendar_router
 from app.api.routers.baseline_fields import router as baseline_fields_router
+from app.api.routers.planner import router as planner_router
 from app.realtime import create_client_secret
 
-app = FastAPI(title="HELIX Core")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # schema: alembic upgrade head (under an advisory lock, shared with the bot and menu.sh)
+    await init_db(engine)
+    # read cache (Redis) connects here, not at import time
+    read_cache.start(backend_from_settings())
+    # one pooled client per upstream, shared by all requests
+    app.state.http = HttpClients.create()
+    app.state.etag_cache = ETagCache(settings.google_etag_cache_max_bytes)
+    # access token lives in memory and is renewed ahead of expiry in background
+    app.state.google_tokens = GoogleTokenManager(app.state.http.google)
+    await app.state.google_tokens.start()
+    # push channel keeps the calendar mirror fresh without polling Google
+    app.state.calendar_watcher = CalendarWatcher(app.state.http.google, app.state.google_tokens, app.state.etag_cache)
+    await app.state.calendar_watcher.start()
+    # срочность напряжений затухает по времени — пересчёт в фоне
+    app.state.urgency_refresher = UrgencyRefresher()
+    await app.state.urgency_refresher.start()
+    try:
+        yield
+    finally:
+        await app.state.urgency_refresher.stop()
+        await app.state.calendar_watcher.stop()
+        await app.state.google_tokens.stop()
+        await app.state.http.aclose()
+        await read_cache.close()
+
+
+app = FastAPI(title="HELIX Core", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,27 +59,58 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-@app.on_event("startup")
-async def on_startup():
-    # creates tables if missing (v0.1). Later we add Alembic migrations.
-    await init_db(engine)
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    # upstream degraded: fail fast instead of a 500
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"{exc.upstream} is temporarily unavailable"},
+        headers={"Retry-After": str(int(exc.retry_after_sec) + 1)},
+    )
+
+@app.exception_handler(httpx.HTTPStatusError)
+async def upstream_status_handler(request: Request, exc: httpx.HTTPStatusError):
+    upstream_status = exc.response.status_code
+    if upstream_status == 429 or upstream_status >= 500:
+        headers = {}
+        if exc.response.headers.get("Retry-After"):
+            headers["Retry-After"] = exc.response.headers["Retry-After"]
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Upstream temporarily unavailable", "upstream_status": upstream_status},
+            headers=headers,
+        )
+    return JSONResponse(
+        status_code=502,
+        content={"detail": "Upstream request failed", "upstream_status": upstream_status},
+    )
+
+@app.exception_handler(httpx.TransportError)
+async def upstream_transport_handler(request: Request, exc: httpx.TransportError):
+    return JSONResponse(status_code=504, content={"detail": "Upstream did not respond"})
 
 @app.get("/health")
-async def health():
-    return {"ok": True, "service": "helix-core"}
+async def health(request: Request):
+    return {
+        "ok": True,
+        "service": "helix-core",
+        "upstreams": {name: b.snapshot() for name, b in request.app.state.http.breakers.items()},
+    }
 
 app.include_router(oauth_google_router)
 app.include_router(calendar_router)
 app.include_router(tensions_router)
 app.include_router(baseline_fields_router)
+app.include_router(planner_router)
 
 
 @app.post("/realtime/client_secret")
-async def realtime_client_secret():
+async def realtime_client_secret(http: httpx.AsyncClient = Depends(get_openai_client)):
     try:
-        data = await create_client_secret()
+        data = await create_client_secret(http)
         return JSONResponse(content=data)
     except httpx.HTTPStatusError as e:
         return Response(
@@ -7,7 +7,7 @@ OPENAI_REALTIME_URL = "https://api.openai.com/v1/realtime/calls"
 OPENAI_REALTIME_CLIENT_SECRETS_URL = "https://api.openai.com/v1/realtime/client_secrets"
 logger = logging.getLogger("helix.realtime")
 
-async def exchange_sdp(offer_sdp: str) -> str:
+async def exchange_sdp(client: httpx.AsyncClient, offer_sdp: str) -> str:
     session = {
         "type": "realtime",
         "model": "gpt-realtime",
@@ -19,29 +19,28 @@ async def exchange_sdp(offer_sdp: str) -> str:
         logger.error("Invalid SDP offer (len=%s)", 0 if offer_sdp is None else len(offer_sdp))
         raise httpx.HTTPError("Invalid SDP offer")
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        files = {
-            "sdp": ("offer.sdp", offer_sdp, "application/sdp"),
-        }
-        data = {
-            "session": json.dumps(session),
-        }
+    files = {
+        "sdp": ("offer.sdp", offer_sdp, "application/sdp"),
+    }
+    data = {
+        "session": json.dumps(session),
+    }
 
-        r = await client.post(
-            OPENAI_REALTIME_URL,
-            headers={
-                "Authorization": f"Bearer {settings.openai_api_key}"
-            },
-            files=files,
-            data=data,
-        )
-        if r.status_code >= 400:
-            logger.error("OpenAI realtime error %s: %s", r.status_code, r.text)
-        r.raise_for_status()
-        return r.text
+    r = await client.post(
+        OPENAI_REALTIME_URL,
+        headers={
+            "Authorization": f"Bearer {settings.openai_api_key}"
+        },
+        files=files,
+        data=data,
+    )
+    if r.status_code >= 400:
+        logger.error("OpenAI realtime error %s: %s", r.status_code, r.text)
+    r.raise_for_status()
+    return r.text
 
 
-async def create_client_secret() -> dict:
+async def create_client_secret(client: httpx.AsyncClient) -> dict:
     payload = {
         "session": {
             "type": "realtime",
@@ -49,16 +48,15 @@ async def create_client_secret() -> dict:
         }
     }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.post(
-            OPENAI_REALTIME_CLIENT_SECRETS_URL,
-            headers={
-                "Authorization": f"Bearer {settings.openai_api_key}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-        )
-        if r.status_code >= 400:
-            logger.error("OpenAI client_secret error %s: %s", r.status_code, r.text)
-        r.raise_for_status()
-        return r.json()
+    r = await client.post(
+        OPENAI_REALTIME_CLIENT_SECRETS_URL,
+        headers={
+            "Authorization": f"Bearer {settings.openai_api_key}",
+            "Content-Type": "application/json",
+        },
+        json=payload,
+    )
+    if r.status_code >= 400:
+        logger.error("OpenAI client_secret error %s: %s", r.status_code, r.text)
+    r.raise_for_status()
+    return r.json()
@@ -15,7 +15,74 @@ class Settings(BaseSettings):
     # user context
     user_timezone: str = "Europe/Bucharest"
 
+    # Calendar mirror: как часто (макс.) тянуть дельты из Google на чтении
+    calendar_sync_max_age_sec: int = 60
+    # events.list maxResults (Google допускает до 2500)
+    google_events_page_size: int = 250
+    # ETag-кэш live-чтений events.list (по размеру тел ответов)
+    google_etag_cache_max_bytes: int = 8 * 1024 * 1024
+
+    # Push-уведомления Calendar (events.watch). Пустой URL — каналы не регистрируем.
+    # Публичный https-адрес роута POST /calendar/webhook.
+    google_webhook_url: str = ""
+    calendar_watch_ttl_sec: int = 7 * 24 * 3600
+    calendar_watch_renew_ahead_sec: int = 3600
+    # при живом канале зеркало синкается по push; это — страховочный период
+    calendar_watch_fallback_sync_sec: int = 6 * 3600
+    # Google accounts: default for requests without X-Helix-Account ("" -> first connected),
+    # in-memory LRU of access tokens and parallel background refreshes
+    google_default_account: str = ""
+    google_token_cache_size: int = 256
+    google_refresh_concurrency: int = 8
+    # POST /calendar/create/bulk: одновременных events.insert
+    google_bulk_create_concurrency: int = 8
+
+    # Tensions lists: keyset pages (GET /tensions, /tensions/active, bot /list)
+    tensions_page_size: int = 50
+    tensions_max_page_size: int = 200
+    # пересчёт срочности (затухание по времени); top-N: GET /tensions/top
+    urgency_refresh_interval_sec: int = 15 * 60
+    tensions_top_max: int = 100
+    # захват: похожее активное напряжение — pg_trgm similarity заголовков не ниже порога
+    tension_duplicate_threshold: float = 0.5
+
+    # read-through кэш горячих чтений, общий для API и бота: redis | memory (один процесс, тесты) | off
+    cache_backend: str = "redis"
+    redis_url: str = "redis://redis:6379/0"
+    cache_redis_timeout_sec: float = 0.5
+    cache_memory_max_entries: int = 10_000
+    # TTL — верхняя граница устаревания, если инвалидация после записи не дошла
+    cache_tensions_ttl_sec: int = 60
+    cache_baseline_fields_ttl_sec: int = 300
+    # дни календаря из зеркала; синк с изменениями (в т.ч. по push) сбрасывает их сразу
+    cache_calendar_ttl_sec: int = 60
+
     # Telegram bot
     telegram_bot_token: str = ""
+    # планировщик возвратов: куда слать due-напряжения (chat id через запятую; пусто — выключен)
+    telegram_return_chat_ids: str = ""
+    # сколько вперёд держать возвраты в памяти (догружаются каждые полгоризонта)
+    return_scheduler_horizon_sec: int = 6 * 3600
+    # пачка NOTIFY об изменениях напряжений -> один запрос
+    return_scheduler_debounce_sec: float = 0.5
+    # cadence: новый период начинается в полночь (user_timezone), а возврат приходит в этот час —
+    # не будим пользователя в 00:00
+    cadence_return_hour: int = 9
+
+    # Outbound HTTP pools (Google / OpenAI)
+    http2_enabled: bool = True
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_sec: float = 60.0
+    http_connect_timeout_sec: float = 5.0
+    google_http_timeout_sec: float = 15.0
+    openai_http_timeout_sec: float = 30.0
+    # retries (jittered exponential backoff, Retry-After) and circuit breaker
+    http_retry_max_attempts: int = 3
+    http_retry_base_delay_sec: float = 0.2
+    http_retry_max_delay_sec: float = 5.0
+    http_retry_max_elapsed_sec: float = 10.0
+    http_breaker_failure_threshold: int = 5
+    http_breaker_reset_timeout_sec: float = 30.0
 
 settings = Settings()
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from telegram import Update
+from telegram import Bot, Update
+from telegram.error import RetryAfter
 from telegram.ext import ContextTypes
-from sqlalchemy import and_, select
+from sqlalchemy import column, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infra.db.models.tension_events import TensionEvent
-from app.infra.db.models.tensions import Tension
+from app.infra.cache import TENSIONS, read_cache
+from app.infra.db.models.tensions import ACTIVE_SQL, Tension
 from app.infra.db.session import SessionLocal
+from app.infra.repos.tensions_repo import urgency_sql
 
 
 @dataclass
@@ -34,94 +37,110 @@ def _suggest_form(vector: str) -> str:
     return "15 минут фокуса сегодня?"
 
 
-async def pick_tension_for_return(session: AsyncSession) -> ReturnResult:
+# Выбор + запись события одним запросом (один round trip):
+# last    — последнее напряжение, которое возвращал helix (его не повторяем, если есть выбор);
+# due     — просроченные return_at, раньше всех — первые;
+# top     — если due пуст: самая высокая срочность (urgency), затем самые старые (index-only);
+# picked  — первый кандидат, не совпадающий с last (или сам last, если других нет);
+# затем INSERT события 'returned' и UPDATE updated_at / истории возвратов / urgency — в том же statement.
+RETURN_PICK_SQL = text(f"""
+WITH last AS (
+    SELECT tension_id
+    FROM tension_events
+    WHERE type = 'returned' AND actor = 'helix'
+    ORDER BY created_at DESC, id DESC
+    LIMIT 1
+),
+due AS (
+    SELECT id, row_number() OVER (ORDER BY return_at, created_at) AS pos
+    FROM (
+        SELECT id, return_at, created_at
+        FROM tensions
+        WHERE {ACTIVE_SQL} AND return_at IS NOT NULL AND return_at <= :now
+        ORDER BY return_at, created_at
+        LIMIT 2
+    ) d
+),
+top AS (
+    SELECT id, row_number() OVER (ORDER BY urgency DESC, created_at, id) AS pos
+    FROM (
+        SELECT id, urgency, created_at
+        FROM tensions
+        WHERE {ACTIVE_SQL}
+        ORDER BY urgency DESC, created_at, id
+        LIMIT 2
+    ) t
+),
+candidates AS (
+    SELECT id, 'due' AS tier, pos FROM due
+    UNION ALL
+    SELECT id, 'top_score' AS tier, pos FROM top WHERE NOT EXISTS (SELECT 1 FROM due)
+),
+picked AS (
+    SELECT c.id,
+           c.tier,
+           c.id IS DISTINCT FROM (SELECT tension_id FROM last) AS no_repeat
+    FROM candidates c
+    ORDER BY c.tier = 'top_score', c.id IS NOT DISTINCT FROM (SELECT tension_id FROM last), c.pos
+    LIMIT 1
+),
+logged AS (
+    INSERT INTO tension_events (tension_id, type, actor, payload, created_at)
+    SELECT t.id, 'returned', 'helix',
+           jsonb_build_object(
+               'reason', 'telegram_return',
+               'vector', t.vector,
+               'charge', t.charge,
+               'status', t.status
+           ),
+           :now
+    FROM picked p
+    JOIN tensions t ON t.id = p.id
+    RETURNING tension_id
+)
+UPDATE tensions t
+SET updated_at = :now,
+    return_count = t.return_count + 1,
+    last_returned_at = :now,
+    urgency = {urgency_sql(return_count="t.return_count + 1", last_returned_at=":now")}
+FROM picked p
+WHERE t.id = p.id
+RETURNING t.*, p.tier AS pick_tier, p.no_repeat AS pick_no_repeat
+""")
+
+# Параллельные /return сериализуем: без этого оба видят один и тот же last и выбирают
+# одно напряжение (UPDATE второго просто перепроверит строку после commit первого).
+# Лок — отдельным statement'ом: снапшот выбора берётся уже после commit соседа,
+# и правило no-repeat само уводит второй /return на другое напряжение.
+RETURN_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('helix_return_pick'))")
+
+
+async def return_next_tension(session: AsyncSession) -> ReturnResult:
     """
+    Выбирает напряжение для /return и логирует событие 'returned' (лок + один запрос + commit).
+
     V1:
     1) due (return_at <= now) -> earliest due
-    2) else highest charge, then oldest
+    2) else highest urgency, then oldest
+    Только что возвращённое повторяем, лишь если других кандидатов нет.
     """
-    now = _now_utc()
-    active_filter = Tension.status.in_(("held", "forming"))
-
-    q_last_returned = (
-        select(TensionEvent.tension_id)
-        .where(
-            and_(
-                TensionEvent.type == "returned",
-                TensionEvent.actor == "helix",
-            )
-        )
-        .order_by(TensionEvent.created_at.desc(), TensionEvent.id.desc())
-        .limit(1)
-    )
-    last_returned_result = await session.execute(q_last_returned)
-    last_returned_id = last_returned_result.scalar_one_or_none()
-
-    q_due = (
-        select(Tension)
-        .where(
-            and_(
-                active_filter,
-                Tension.return_at.is_not(None),
-                Tension.return_at <= now,
-            )
-        )
-        .order_by(Tension.return_at.asc(), Tension.created_at.asc())
-        .limit(2 if last_returned_id is not None else 1)
-    )
-    due_result = await session.execute(q_due)
-    due_items = list(due_result.scalars().all())
-    t_due = next((item for item in due_items if item.id != last_returned_id), None)
-    if t_due is None and due_items:
-        t_due = due_items[0]
-    if t_due:
-        reason = "due_no_repeat" if t_due.id != last_returned_id else "due"
-        return ReturnResult(tension=t_due, reason=reason)
-
-    q_top = (
-        select(Tension)
-        .where(active_filter)
-        .order_by(Tension.charge.desc(), Tension.created_at.asc())
-        .limit(2 if last_returned_id is not None else 1)
+    stmt = (
+        select(Tension, column("pick_tier"), column("pick_no_repeat"))
+        .from_statement(RETURN_PICK_SQL)
+        .execution_options(populate_existing=True)
     )
-    top_result = await session.execute(q_top)
-    top_items = list(top_result.scalars().all())
-    t_top = next((item for item in top_items if item.id != last_returned_id), None)
-    if t_top is None and top_items:
-        t_top = top_items[0]
-    if t_top:
-        reason = "top_score_no_repeat" if t_top.id != last_returned_id else "top_score"
-        return ReturnResult(tension=t_top, reason=reason)
-
-    return ReturnResult(tension=None, reason="empty")
-
-
-async def log_return_event(session: AsyncSession, tension: Tension) -> None:
-    now = _now_utc()
-    event = TensionEvent(
-        tension_id=tension.id,
-        type="returned",
-        actor="helix",
-        payload={
-            "reason": "telegram_return",
-            "vector": tension.vector,
-            "charge": tension.charge,
-            "status": tension.status,
-        },
-        created_at=now,
-    )
-    session.add(event)
-
-    if hasattr(tension, "last_returned_at"):
-        setattr(tension, "last_returned_at", now)
-    if hasattr(tension, "return_count"):
-        current_count = getattr(tension, "return_count") or 0
-        setattr(tension, "return_count", current_count + 1)
-    if hasattr(tension, "updated_at"):
-        setattr(tension, "updated_at", now)
-
+    await session.execute(RETURN_LOCK_SQL)
+    res = await session.execute(stmt, {"now": _now_utc()})
+    row = res.one_or_none()
     await session.commit()
 
+    if row is None:
+        return ReturnResult(tension=None, reason="empty")
+    # urgency выбранного изменилась — кэшированные списки устарели
+    await read_cache.invalidate(TENSIONS)
+    tension, tier, no_repeat = row
+    return ReturnResult(tension=tension, reason=f"{tier}_no_repeat" if no_repeat else tier)
+
 
 def format_return_message(tension: Tension, reason: str) -> str:
     suggestion = _suggest_form(tension.vector)
@@ -138,16 +157,35 @@ def format_return_message(tension: Tension, reason: str) -> str:
     )
 
 
+async def push_scheduled_return(bot: Bot, chat_ids: list[int | str], tension: Tension, trigger: str) -> None:
+    """Планировщик возвратов: сообщение о напряжении, у которого подошёл return_at / cadence."""
+    message = format_return_message(tension, f"scheduled_{trigger}")
+    for chat_id in chat_ids:
+        for _ in range(3):
+            try:
+                await bot.send_message(chat_id=chat_id, text=message)
+                break
+            except RetryAfter as e:
+                # пачка просроченных возвратов после простоя упирается в лимиты Telegram
+                await asyncio.sleep(_retry_after_sec(e))
+
+
+def _retry_after_sec(e: RetryAfter) -> float:
+    retry_after = e.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
 async def cmd_return(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     del context
     if update.message is None:
         return
 
     async with SessionLocal() as session:
-        picked = await pick_tension_for_return(session)
-        if not picked.tension:
-            await update.message.reply_text("Пока нет активных напряжений. /add чтобы добавить.")
-            return
+        picked = await return_next_tension(session)
 
-        await log_return_event(session, picked.tension)
-        await update.message.reply_text(format_return_message(picked.tension, picked.reason))
+    if not picked.tension:
+        await update.message.reply_text("Пока нет активных напряжений. /add чтобы добавить.")
+        return
+    await update.message.reply_text(format_return_message(picked.tension, picked.reason))
@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 
 from telegram import Update
 from telegram.ext import (
@@ -10,10 +11,13 @@ from telegram.ext import (
     filters,
 )
 
+from app.domain.services.return_scheduler import ReturnScheduler
+from app.infra.cache import backend_from_settings, read_cache
 from app.infra.db.session import SessionLocal
+from app.infra.repos.keyset import InvalidCursor
 from app.infra.repos.tensions_repo import TensionsRepo
 from app.settings import settings
-from app.telegram.commands.return_cmd import cmd_return
+from app.telegram.commands.return_cmd import cmd_return, push_scheduled_return
 
 
 logging.basicConfig(
@@ -27,13 +31,14 @@ START_MESSAGE = (
     "Helix - бот для сохранения и возврата напряжений\n\n"
     "Команды:\n"
     "/add - добавить напряжение\n"
-    "/list - показать активные напряжения\n"
+    "/list - показать активные напряжения (/list next - следующая страница)\n"
+    "/find <текст> - найти напряжение по словам из заголовка или заметок (/find next - дальше)\n"
     "/return - вернуть одно напряжение в фокус\n"
     "/release - отметить, что с напряжением уже справился\n"
     "/cancel - отменить текущий диалог"
 )
 
-TITLE, CHARGE, VECTOR, RELEASE_ID, RELEASE_NOTE = range(5)
+TITLE, CHARGE, VECTOR, RELEASE_ID, RELEASE_NOTE, DUPLICATE = range(6)
 
 ALLOWED_VECTORS = {
     "unknown",
@@ -47,6 +52,7 @@ ALLOWED_VECTORS = {
     "drop",
 }
 MAX_MESSAGE_LEN = 3800
+NEXT_PAGE_WORDS = {"next", "дальше", "ещё", "еще"}
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -58,6 +64,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     context.user_data.pop("new_tension", None)
     context.user_data.pop("release_tension", None)
+    context.user_data.pop("duplicate_ids", None)
     if update.message is not None:
         await update.message.reply_text("Ок, отменено.")
     return ConversationHandler.END
@@ -80,12 +87,67 @@ async def add_title(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         return TITLE
 
     context.user_data["new_tension"] = {"title": title}
+
+    async with SessionLocal() as session:
+        similar = await TensionsRepo(session).find_similar(
+            title, threshold=settings.tension_duplicate_threshold
+        )
+    if similar:
+        context.user_data["duplicate_ids"] = [t.id for t, _ in similar]
+        lines = ["Похожие активные напряжения уже есть:"]
+        lines.extend(f"#{t.id} [{t.status}] c={t.charge} {t.title}" for t, _ in similar)
+        lines.append("")
+        lines.append("Отправьте id, чтобы дописать к нему, или 'new', чтобы создать новое.")
+        await update.message.reply_text("\n".join(lines))
+        return DUPLICATE
+
+    return await _ask_charge(update)
+
+
+async def _ask_charge(update: Update) -> int:
     await update.message.reply_text(
         "Укажите charge (0..5) или отправьте 'skip' для значения по умолчанию (3)."
     )
     return CHARGE
 
 
+async def add_duplicate(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    if update.message is None or update.message.text is None:
+        return DUPLICATE
+
+    raw = update.message.text.strip().lower().lstrip("#")
+    if raw in {"new", "нов", "новое", "нет", "no"}:
+        context.user_data.pop("duplicate_ids", None)
+        return await _ask_charge(update)
+
+    candidates = context.user_data.get("duplicate_ids") or []
+    try:
+        tension_id = int(raw)
+    except ValueError:
+        tension_id = None
+    if tension_id not in candidates:
+        await update.message.reply_text("Отправьте id из списка выше или 'new'.")
+        return DUPLICATE
+
+    title = (context.user_data.get("new_tension") or {}).get("title")
+    if not title:
+        await update.message.reply_text("Не удалось прочитать заголовок. Начните заново через /add.")
+        return ConversationHandler.END
+
+    async with SessionLocal() as session:
+        t = await TensionsRepo(session).merge_capture(tension_id, title=title, actor="user")
+
+    context.user_data.pop("new_tension", None)
+    context.user_data.pop("duplicate_ids", None)
+    if t is None:
+        await update.message.reply_text(
+            f"Напряжение #{tension_id} уже не активно. Начните заново через /add."
+        )
+        return ConversationHandler.END
+    await update.message.reply_text(f"Дописано к #{t.id}: {t.title} (charge={t.charge})")
+    return ConversationHandler.END
+
+
 async def add_charge(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     if update.message is None or update.message.text is None:
         return CHARGE
@@ -163,14 +225,32 @@ def _format_tensions_chunks(lines: list[str]) -> list[str]:
     return chunks
 
 
+async def _active_page(cursor: str | None):
+    async with SessionLocal() as session:
+        repo = TensionsRepo(session)
+        # тот же кэш, что у GET /tensions/active; строки — dict
+        return await repo.list_page_cached(
+            ttl_sec=settings.cache_tensions_ttl_sec, limit=settings.tensions_page_size, cursor=cursor
+        )
+
+
 async def list_tensions(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    del context
     if update.message is None:
         return
 
-    async with SessionLocal() as session:
-        repo = TensionsRepo(session)
-        tensions = await repo.list_active(limit=50)
+    # /list — первая страница, /list next — следующая за последней показанной
+    cursor = None
+    if context.args and context.args[0].lower() in NEXT_PAGE_WORDS:
+        cursor = context.user_data.get("list_cursor")
+        if not cursor:
+            await update.message.reply_text("Дальше ничего нет. Начни сначала: /list")
+            return
+
+    try:
+        tensions, next_cursor = await _active_page(cursor)
+    except InvalidCursor:
+        tensions, next_cursor = await _active_page(None)
+    context.user_data["list_cursor"] = next_cursor
 
     if not tensions:
         await update.message.reply_text("Активных напряжений нет.")
@@ -178,32 +258,92 @@ async def list_tensions(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
     lines = ["Активные напряжения:"]
     for t in tensions:
-        lines.append(f"#{t.id} | {t.title} | status={t.status} | charge={t.charge} | vector={t.vector}")
+        lines.append(
+            f"#{t['id']} | {t['title']} | status={t['status']} | charge={t['charge']} | vector={t['vector']}"
+        )
+    if next_cursor:
+        lines.append("Дальше: /list next")
 
     for chunk in _format_tensions_chunks(lines):
         await update.message.reply_text(chunk)
 
 
-async def release_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    if update.message is None:
-        return ConversationHandler.END
-
+async def _search_page(query: str, cursor: str | None):
     async with SessionLocal() as session:
         repo = TensionsRepo(session)
-        tensions = await repo.list_active(limit=50)
+        return await repo.search_page(query, limit=settings.tensions_page_size, cursor=cursor)
+
 
+async def find_tensions(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if update.message is None:
+        return
+
+    # /find <текст> — первая страница, /find next — следующая по тому же запросу
+    query = " ".join(context.args or []).strip()
+    cursor = None
+    if query.lower() in NEXT_PAGE_WORDS:
+        query = context.user_data.get("find_query") or ""
+        cursor = context.user_data.get("find_cursor")
+        if not query or not cursor:
+            await update.message.reply_text("Дальше ничего нет. Новый поиск: /find <текст>")
+            return
+    if not query:
+        await update.message.reply_text("Что искать? Например: /find отчёт")
+        return
+
+    try:
+        hits, next_cursor = await _search_page(query, cursor)
+    except InvalidCursor:
+        hits, next_cursor = await _search_page(query, None)
+    context.user_data["find_query"] = query
+    context.user_data["find_cursor"] = next_cursor
+
+    if not hits:
+        await update.message.reply_text("Ничего не нашлось среди активных напряжений.")
+        return
+
+    lines = [f"Найдено по «{query}»:"]
+    for t, _ in hits:
+        lines.append(f"#{t.id} | {t.title} | status={t.status} | charge={t.charge} | vector={t.vector}")
+    if next_cursor:
+        lines.append("Дальше: /find next")
+
+    for chunk in _format_tensions_chunks(lines):
+        await update.message.reply_text(chunk)
+
+
+async def _release_show_page(update: Update, context: ContextTypes.DEFAULT_TYPE, cursor: str | None) -> bool:
+    """Показывает страницу активных для /release; False — показывать нечего."""
+    tensions, next_cursor = await _active_page(cursor)
     if not tensions:
-        await update.message.reply_text("Активных напряжений нет.")
-        return ConversationHandler.END
+        return False
+
+    state = context.user_data.setdefault("release_tension", {"active_ids": set()})
+    state["active_ids"] = state.get("active_ids", set()) | {t["id"] for t in tensions}
+    state["next_cursor"] = next_cursor
 
     lines = ["Выбери напряжение для релиза (введи номер):"]
     for t in tensions:
-        lines.append(f"#{t.id} | {t.title} | charge={t.charge} | vector={t.vector}")
-
-    context.user_data["release_tension"] = {"active_ids": {t.id for t in tensions}}
+        lines.append(f"#{t['id']} | {t['title']} | charge={t['charge']} | vector={t['vector']}")
     for chunk in _format_tensions_chunks(lines):
         await update.message.reply_text(chunk)
-    await update.message.reply_text("Напиши номер, например: 12 или #12")
+
+    hint = "Напиши номер, например: 12 или #12, или слова из заголовка — найду"
+    if next_cursor:
+        hint += "\nИли 'next' — следующая страница."
+    await update.message.reply_text(hint)
+    return True
+
+
+async def release_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    if update.message is None:
+        return ConversationHandler.END
+
+    context.user_data["release_tension"] = {"active_ids": set()}
+    if not await _release_show_page(update, context, None):
+        context.user_data.pop("release_tension", None)
+        await update.message.reply_text("Активных напряжений нет.")
+        return ConversationHandler.END
     return RELEASE_ID
 
 
@@ -212,13 +352,30 @@ async def release_pick_id(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return RELEASE_ID
 
     raw = update.message.text.strip()
+    if raw.lower() in NEXT_PAGE_WORDS:
+        next_cursor = (context.user_data.get("release_tension") or {}).get("next_cursor")
+        if not next_cursor or not await _release_show_page(update, context, next_cursor):
+            await update.message.reply_text("Это была последняя страница. Введи номер из списка.")
+        return RELEASE_ID
+
     if raw.startswith("#"):
         raw = raw[1:]
 
     try:
         tension_id = int(raw)
     except ValueError:
-        await update.message.reply_text("Нужно указать числовой номер напряжения, например 12.")
+        # не номер — ищем по тексту среди активных
+        hits, _ = await _search_page(raw, None)
+        if not hits:
+            await update.message.reply_text("Нужно указать номер напряжения, например 12, или слова из заголовка.")
+            return RELEASE_ID
+        state = context.user_data.setdefault("release_tension", {"active_ids": set()})
+        state["active_ids"] = state.get("active_ids", set()) | {t.id for t, _ in hits}
+        lines = ["Нашлось (введи номер):"]
+        for t, _ in hits:
+            lines.append(f"#{t.id} | {t.title} | charge={t.charge} | vector={t.vector}")
+        for chunk in _format_tensions_chunks(lines):
+            await update.message.reply_text(chunk)
         return RELEASE_ID
 
     active_ids = (context.user_data.get("release_tension") or {}).get("active_ids") or set()
@@ -273,15 +430,57 @@ async def release_note(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     return ConversationHandler.END
 
 
+def _return_chat_ids() -> list[int | str]:
+    out: list[int | str] = []
+    for raw in settings.telegram_return_chat_ids.split(","):
+        raw = raw.strip()
+        if raw:
+            out.append(int(raw) if raw.lstrip("-").isdigit() else raw)
+    return out
+
+
+async def on_startup(application: Application) -> None:
+    read_cache.start(backend_from_settings())
+    await start_return_scheduler(application)
+
+
+async def on_shutdown(application: Application) -> None:
+    await stop_return_scheduler(application)
+    await read_cache.close()
+
+
+async def start_return_scheduler(application: Application) -> None:
+    chat_ids = _return_chat_ids()
+    if not chat_ids:
+        logger.info("TELEGRAM_RETURN_CHAT_IDS is empty, return scheduler disabled")
+        return
+    scheduler = ReturnScheduler(partial(push_scheduled_return, application.bot, chat_ids))
+    await scheduler.start()
+    application.bot_data["return_scheduler"] = scheduler
+
+
+async def stop_return_scheduler(application: Application) -> None:
+    scheduler = application.bot_data.pop("return_scheduler", None)
+    if scheduler is not None:
+        await scheduler.stop()
+
+
 def run() -> None:
     if not settings.telegram_bot_token:
         raise RuntimeError(
             "TELEGRAM_BOT_TOKEN is not set. Please add it to the environment."
         )
 
-    application = Application.builder().token(settings.telegram_bot_token).build()
+    application = (
+        Application.builder()
+        .token(settings.telegram_bot_token)
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("list", list_tensions))
+    application.add_handler(CommandHandler("find", find_tensions))
     application.add_handler(CommandHandler("return", cmd_return))
     application.add_handler(CommandHandler("cancel", cancel))
     application.add_handler(
@@ -289,6 +488,7 @@ def run() -> None:
             entry_points=[CommandHandler("add", add_start)],
             states={
                 TITLE: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_title)],
+                DUPLICATE: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_duplicate)],
                 CHARGE: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_charge)],
                 VECTOR: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_vector)],
             },
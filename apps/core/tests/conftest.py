@@ -0,0 +1,40 @@
+"""
+Общие фикстуры тестов.
+
+Тесты с Postgres ходят в отдельную базу HELIX_TEST_DATABASE_URL
+(postgresql+asyncpg://...; нужен pg_trgm) и без неё пропускаются. База
+доводится до head миграциями — в ней не должно быть ничего ценного.
+"""
+
+import asyncio
+import os
+
+# кэш чтений в тестах — в памяти процесса, без Redis
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.infra.cache import backend_from_settings, read_cache
+from app.infra.db.init_db import init_db
+
+TEST_DATABASE_URL = os.environ.get("HELIX_TEST_DATABASE_URL", "")
+
+# lifespan в тестах не запускается — backend кэша подключаем сами
+read_cache.start(backend_from_settings())
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("HELIX_TEST_DATABASE_URL is not set")
+    # NullPool: каждый тест гоняет свой event loop, соединения между ними не переиспользуем
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    run(init_db(engine))
+    yield engine
+    run(engine.dispose())
@@ -0,0 +1,96 @@
+"""Минутная сетка против find_free_slots: на целых минутах — те же слоты, с секундами — не задевают встреч."""
+
+import random
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.domain.services.availability_grid import find_free_slots_grid, grid_free_slots
+from app.domain.services.free_slots import busy_intervals, find_free_slots, find_free_slots_range
+
+# 2026-03-08 и 2026-11-01 — переход на летнее/зимнее время в America/New_York
+DAYS = ("2026-10-19", "2026-03-08", "2026-11-01")
+ZONES = ("Europe/Moscow", "America/New_York", "UTC")
+
+
+def random_events(rng: random.Random, tz_name: str, day: str, n: int, *, seconds: bool = False) -> list[dict]:
+    base = datetime.fromisoformat(day).replace(tzinfo=ZoneInfo(tz_name))
+    events = []
+    for _ in range(n):
+        start = base + timedelta(minutes=rng.randrange(6 * 60, 20 * 60), seconds=rng.randrange(60) if seconds else 0)
+        end = start + timedelta(minutes=rng.randrange(0, 150))
+        events.append({"start": start.isoformat(), "end": end.isoformat()})
+    return events
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_day_matches_find_free_slots_on_whole_minutes(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        tz_name, day = rng.choice(ZONES), rng.choice(DAYS)
+        kw = dict(
+            events=random_events(rng, tz_name, day, rng.randrange(0, 14)),
+            tz_name=tz_name,
+            date_iso=day,
+            duration_min=rng.choice([15, 30, 45, 60]),
+            buffer_min=rng.choice([0, 5, 10]),
+            max_slots=rng.choice([1, 3, 10]),
+        )
+        assert find_free_slots_grid(**kw) == find_free_slots(**kw), kw
+
+
+def test_range_matches_find_free_slots_range_on_whole_minutes():
+    rng = random.Random(42)
+    work_hours = {
+        "mon": ("08:30", "17:00"),
+        "tue": None,
+        "wed": ("09:00", "18:00"),
+        "thu": ("10:00", "12:00"),
+        "fri": ("09:00", "18:00"),
+        "sat": ("11:00", "15:00"),
+        "sun": ("00:00", "23:59"),
+    }
+    for _ in range(200):
+        tz_name = rng.choice(ZONES)
+        events = [ev for day in ("2026-10-30", "2026-10-31", "2026-11-01", "2026-11-02")
+                  for ev in random_events(rng, tz_name, day, rng.randrange(0, 6))]
+        # событие через несколько дней
+        events.append({"start": "2026-10-31T16:00:00+00:00", "end": "2026-11-01T20:00:00+00:00"})
+        kw = dict(
+            events=events,
+            tz_name=tz_name,
+            start_date_iso="2026-10-30",
+            end_date_iso="2026-11-03",
+            duration_min=30,
+            buffer_min=10,
+            work_hours=work_hours,
+            max_slots_per_day=4,
+            max_total=rng.choice([None, 5]),
+        )
+        assert grid_free_slots(**kw) == find_free_slots_range(**kw), kw
+
+
+def test_sub_minute_busy_rounds_outward():
+    events = [{"start": "2026-10-19T09:00:00+03:00", "end": "2026-10-19T10:00:30+03:00"}]
+    kw = dict(events=events, tz_name="Europe/Moscow", date_iso="2026-10-19", duration_min=30, buffer_min=10)
+    assert find_free_slots(**kw)[0].start == "2026-10-19T10:10:30+03:00"
+    assert find_free_slots_grid(**kw)[0].start == "2026-10-19T10:11:00+03:00"
+
+
+def test_sub_minute_slots_never_touch_busy():
+    rng = random.Random(7)
+    tz = ZoneInfo("Europe/Moscow")
+    day_start = datetime(2026, 10, 19, 9, 0, tzinfo=tz)
+    day_end = datetime(2026, 10, 19, 18, 0, tzinfo=tz)
+    buffer = timedelta(minutes=10)
+    for _ in range(300):
+        events = random_events(rng, "Europe/Moscow", "2026-10-19", rng.randrange(1, 8), seconds=True)
+        # занятость так, как её видит find_free_slots: обрезана рабочим днём
+        busy = [(max(a, day_start), min(b, day_end)) for a, b in busy_intervals(events, tz)]
+        busy = [(a, b) for a, b in busy if b > a]
+        kw = dict(events=events, tz_name="Europe/Moscow", date_iso="2026-10-19", duration_min=30, max_slots=10)
+        for slot in find_free_slots_grid(**kw):
+            start, end = datetime.fromisoformat(slot.start), datetime.fromisoformat(slot.end)
+            assert start.second == 0
+            assert all(end <= a - buffer or start >= b + buffer for a, b in busy), (slot, events)
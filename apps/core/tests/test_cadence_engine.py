@@ -0,0 +1,137 @@
+"""Cadence-движок: границы периодов в TZ пользователя через DST, один взвод на период."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infra.repos.tensions_repo import TensionsRepo
+from conftest import run
+
+TZ = "America/New_York"  # 2026-03-08 — переход на EDT (UTC-4), 2026-11-01 — обратно на EST (UTC-5)
+RETURN_HOUR = 9
+
+
+def utc(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def sessions(pg_engine):
+    async def clean():
+        async with pg_engine.begin() as conn:
+            await conn.execute(text("DELETE FROM tensions WHERE cadence IS NOT NULL"))
+
+    run(clean())
+    return async_sessionmaker(pg_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+async def recurring(sessions, cadence: str, created_at: str) -> int:
+    async with sessions() as db:
+        t = await TensionsRepo(db).create_tension(title=f"{cadence} review", charge=2)
+        await db.execute(
+            text("UPDATE tensions SET cadence = :cadence, created_at = :created_at WHERE id = :id"),
+            {"cadence": cadence, "created_at": utc(created_at), "id": t.id},
+        )
+        await db.commit()
+        return t.id
+
+
+async def arm(sessions, now: str) -> int:
+    async with sessions() as db:
+        return await TensionsRepo(db).arm_cadence(now=utc(now), tz_name=TZ, return_hour=RETURN_HOUR)
+
+
+async def armed_state(sessions, tension_id: int) -> tuple[datetime, datetime, int]:
+    async with sessions() as db:
+        row = (
+            await db.execute(
+                text(
+                    """
+                    SELECT return_at, last_triggered_at,
+                           (SELECT count(*) FROM tension_events
+                            WHERE tension_id = t.id AND type = 'return_scheduled') AS events
+                    FROM tensions t WHERE id = :id
+                    """
+                ),
+                {"id": tension_id},
+            )
+        ).one()
+        return row.return_at, row.last_triggered_at, row.events
+
+
+# (now UTC, взведено, ожидаемый return_at UTC); return_at — 09:00 местного времени первого дня периода
+CASES = {
+    "daily_spring_forward": ("daily", "2026-03-07T15:00", [
+        ("2026-03-08T05:30", 1, "2026-03-08T13:00"),  # 00:30 EST; 09:00 уже EDT
+        ("2026-03-09T03:59", 0, None),  # 23:59 EDT 8-го — тот же день
+        ("2026-03-09T04:01", 1, "2026-03-09T13:00"),  # 00:01 EDT: сутки после DST — 23 часа
+    ]),
+    "daily_fall_back": ("daily", "2026-10-31T15:00", [
+        ("2026-11-01T04:30", 1, "2026-11-01T14:00"),  # 00:30 EDT; 09:00 уже EST
+        ("2026-11-02T04:30", 0, None),  # 23:30 EST 1-го: сутки после DST — 25 часов
+        ("2026-11-02T05:01", 1, "2026-11-02T14:00"),
+    ]),
+    "weekly_spring_forward": ("weekly", "2026-03-03T15:00", [
+        ("2026-03-04T12:00", 0, None),  # неделя создания
+        ("2026-03-09T03:30", 0, None),  # вс 23:30 EDT
+        ("2026-03-09T04:30", 1, "2026-03-09T13:00"),  # пн 00:30 EDT
+    ]),
+    "weekly_fall_back": ("weekly", "2026-10-27T15:00", [
+        ("2026-11-02T04:30", 0, None),  # вс 23:30 EST
+        ("2026-11-02T05:30", 1, "2026-11-02T14:00"),  # пн 00:30 EST
+        ("2026-11-08T12:00", 0, None),
+        ("2026-11-09T05:01", 1, "2026-11-09T14:00"),
+    ]),
+}
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_period_boundaries_across_dst(sessions, case):
+    cadence, created_at, steps = CASES[case]
+
+    async def go():
+        tension_id = await recurring(sessions, cadence, created_at)
+        expected_events = 0
+        for now, armed, return_at in steps:
+            assert await arm(sessions, now) == armed, now
+            expected_events += armed
+            got_return_at, last_triggered_at, events = await armed_state(sessions, tension_id)
+            assert events == expected_events, now
+            if armed:
+                assert got_return_at == utc(return_at), now
+                assert last_triggered_at == got_return_at
+
+    run(go())
+
+
+def test_arms_once_per_period(sessions):
+    async def go():
+        tension_id = await recurring(sessions, "daily", "2026-10-17T15:00")
+        assert await arm(sessions, "2026-10-19T04:30") == 1
+        # повторные проходы в том же периоде (рестарт бота, вторая полночь по часам сервера)
+        assert await arm(sessions, "2026-10-19T10:00") == 0
+        assert await arm(sessions, "2026-10-20T03:59") == 0
+        # два процесса разом в новом периоде — взводит один
+        assert sorted(await asyncio.gather(arm(sessions, "2026-10-20T04:30"), arm(sessions, "2026-10-20T04:31"))) == [0, 1]
+        _, _, events = await armed_state(sessions, tension_id)
+        assert events == 2
+
+    run(go())
+
+
+def test_manual_return_at_is_kept(sessions):
+    async def go():
+        tension_id = await recurring(sessions, "daily", "2026-10-17T15:00")
+        manual = utc("2026-10-19T20:00")
+        async with sessions() as db:
+            await db.execute(text("UPDATE tensions SET return_at = :at WHERE id = :id"), {"at": manual, "id": tension_id})
+            await db.commit()
+        assert await arm(sessions, "2026-10-19T04:30") == 1
+        return_at, last_triggered_at, _ = await armed_state(sessions, tension_id)
+        assert return_at == manual
+        assert last_triggered_at == utc("2026-10-19T13:00")
+
+    run(go())
@@ -0,0 +1,224 @@
+"""POST /calendar/webhook: какие уведомления Google запускают инкрементальный sync зеркала."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.routers import calendar
+from app.domain.services.calendar_sync import sync_calendar
+from app.domain.services.calendar_watch import CalendarWatcher
+from app.infra.etag_cache import ETagCache
+from app.infra.repos.calendar_watch_repo import CalendarWatchRepo
+from app.settings import settings
+from conftest import run
+
+CALENDAR_ID = "webhook-test@example.com"
+EVENT = {
+    "id": "ev1",
+    "status": "confirmed",
+    "summary": "standup",
+    "start": {"dateTime": "2026-10-19T10:00:00+03:00"},
+    "end": {"dateTime": "2026-10-19T10:15:00+03:00"},
+}
+
+
+class FakeGoogle:
+    """events.list (полная выгрузка без syncToken, дельты — с ним) и events.watch; запросы запоминаются."""
+
+    def __init__(self, *, list_delay_sec: float = 0.0):
+        self.requests: list[httpx.Request] = []
+        self.watches = 0
+        self.list_delay_sec = list_delay_sec
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/events/watch"):
+            self.watches += 1
+            expiration = datetime.now(timezone.utc) + timedelta(days=7)
+            return httpx.Response(
+                200, json={"resourceId": f"resource-{self.watches}", "expiration": str(int(expiration.timestamp() * 1000))}
+            )
+        self.requests.append(request)
+        await asyncio.sleep(self.list_delay_sec)
+        return httpx.Response(200, json={"items": [EVENT], "nextSyncToken": f"sync-{len(self.requests)}"})
+
+    def incremental_syncs(self) -> int:
+        return sum("syncToken" in r.url.params for r in self.requests)
+
+
+async def eventually(predicate, timeout: float = 2.0) -> bool:
+    """Фоновый sync идёт своей задачей — ждём его след (запрос в Google), а не саму задачу."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+class FakeTokens:
+    async def get_access_token(self) -> str:
+        return "token"
+
+
+class NotificationSender:
+    """Локальный «Google»: POST на /calendar/webhook с пустым телом и заголовками X-Goog-*."""
+
+    def __init__(self, client: httpx.AsyncClient, channel_id: str, token: str):
+        self._client = client
+        self.channel_id = channel_id
+        self.token = token
+
+    async def send(self, resource_state: str, *, channel_id: str | None = None, token: str | None = None) -> int:
+        headers = {
+            "X-Goog-Channel-ID": channel_id or self.channel_id,
+            "X-Goog-Channel-Token": token or self.token,
+            "X-Goog-Resource-ID": "resource-1",
+            "X-Goog-Resource-State": resource_state,
+            "X-Goog-Message-Number": "1",
+        }
+        res = await self._client.post("/calendar/webhook", headers=headers)
+        return res.status_code
+
+
+@pytest.fixture
+def sessions(pg_engine):
+    return async_sessionmaker(pg_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+def webhook_app(watcher: CalendarWatcher) -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(calendar.router)
+    app.state.calendar_watcher = watcher
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://helix")
+
+
+def deliver(
+    sessions, *notifications: dict, wait_syncs: int = 0, google: FakeGoogle | None = None
+) -> tuple[list[int], FakeGoogle, ETagCache]:
+    """
+    Регистрирует канал, засевает зеркало полным sync и шлёт уведомления; (статусы, google, etag-кэш).
+
+    wait_syncs — сколько инкрементальных sync дождаться; без них — короткая пауза,
+    за которую ошибочно запущенный sync успел бы дойти до Google.
+    """
+
+    async def go():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(google.handler))
+        etag_cache = ETagCache(1024 * 1024)
+        etag_cache.store(ETagCache.key("a@example.com", "url", {}), '"v1"', {"items": []}, 10)
+
+        channel_id, token = str(uuid.uuid4()), "secret-token"
+        async with sessions() as db:
+            await CalendarWatchRepo(db).add_channel(
+                channel_id=channel_id,
+                calendar_id=CALENDAR_ID,
+                resource_id="resource-1",
+                token=token,
+                expiration=datetime.now(timezone.utc) + timedelta(days=1),
+                created_at=datetime.now(timezone.utc),
+            )
+            await sync_calendar(http, "token", db, tz_name=settings.user_timezone, calendar_id=CALENDAR_ID)
+        google.requests.clear()
+
+        watcher = CalendarWatcher(http, FakeTokens(), etag_cache, calendar_id=CALENDAR_ID, session_factory=sessions)
+        await watcher.start()
+
+        statuses = []
+        async with webhook_app(watcher) as client:
+            sender = NotificationSender(client, channel_id, token)
+            for notification in notifications:
+                statuses.append(await sender.send(**notification))
+        if wait_syncs:
+            assert await eventually(lambda: google.incremental_syncs() >= wait_syncs)
+        await asyncio.sleep(0.2)
+        await watcher.stop()
+        async with sessions() as db:
+            await CalendarWatchRepo(db).delete_channel(channel_id)
+        return statuses, google, etag_cache
+
+    google = google or FakeGoogle()
+    return run(go())
+
+
+def test_exists_triggers_incremental_sync(sessions):
+    statuses, google, etag_cache = deliver(sessions, {"resource_state": "exists"}, wait_syncs=1)
+    assert statuses == [204]
+    assert google.incremental_syncs() == 1
+    assert len(google.requests) == 1
+    assert etag_cache.stats()["entries"] == 0
+
+
+def test_burst_of_exists_is_coalesced(sessions):
+    # sync идёт дольше, чем приходит пачка: уведомления 2..5 застают его в работе
+    slow = FakeGoogle(list_delay_sec=0.3)
+    statuses, google, _ = deliver(sessions, *[{"resource_state": "exists"}] * 5, wait_syncs=2, google=slow)
+    assert statuses == [204] * 5
+    # первый sync стартует сразу, остальные уведомления схлопываются в ещё один
+    assert google.incremental_syncs() == 2
+
+
+def test_sync_message_does_not_sync(sessions):
+    statuses, google, etag_cache = deliver(sessions, {"resource_state": "sync"})
+    assert statuses == [204]
+    assert google.requests == []
+    assert etag_cache.stats()["entries"] == 1
+
+
+@pytest.mark.parametrize(
+    "notification, status",
+    [
+        ({"resource_state": "exists", "channel_id": "unknown-channel"}, 404),
+        ({"resource_state": "exists", "token": "wrong-token"}, 403),
+    ],
+)
+def test_rejected_notification_does_not_sync(sessions, notification, status):
+    statuses, google, etag_cache = deliver(sessions, notification)
+    assert statuses == [status]
+    assert google.requests == []
+    assert etag_cache.stats()["entries"] == 1
+
+
+def test_two_workers_share_one_channel(sessions, monkeypatch):
+    """Два воркера: канал регистрирует один, уведомление принимает любой."""
+
+    async def go():
+        async with sessions() as db:
+            for ch in await CalendarWatchRepo(db).list_channels(CALENDAR_ID):
+                await CalendarWatchRepo(db).delete_channel(ch.channel_id)
+        google = FakeGoogle()
+        http = httpx.AsyncClient(transport=httpx.MockTransport(google.handler))
+        workers = [
+            CalendarWatcher(http, FakeTokens(), ETagCache(1024), calendar_id=CALENDAR_ID, session_factory=sessions)
+            for _ in range(2)
+        ]
+        for w in workers:
+            await w.start()
+        monkeypatch.setattr(settings, "google_webhook_url", "https://helix.example.com/calendar/webhook")
+
+        await asyncio.gather(*(w.renew() for w in workers))
+        await asyncio.gather(*(w.renew() for w in workers))
+        assert google.watches == 1
+
+        async with sessions() as db:
+            (channel,) = await CalendarWatchRepo(db).list_channels(CALENDAR_ID)
+        # оба воркера видят канал: длинный max age у обоих
+        assert all(w.mirror_max_age_sec(CALENDAR_ID) == settings.calendar_watch_fallback_sync_sec for w in workers)
+
+        # уведомление приходит во «второй» воркер, хотя канал мог зарегистрировать первый
+        async with webhook_app(workers[1]) as client:
+            status = await NotificationSender(client, channel.channel_id, channel.token).send("exists")
+        assert status == 204
+        assert await eventually(lambda: len(google.requests) >= 1)
+
+        for w in workers:
+            await w.stop()
+        async with sessions() as db:
+            await CalendarWatchRepo(db).delete_channel(channel.channel_id)
+
+    run(go())
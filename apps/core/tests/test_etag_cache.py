@@ -0,0 +1,74 @@
+"""ETag-кэш live-чтений events.list: страницы одного аккаунта не достаются другому."""
+
+import httpx
+import pytest
+
+from app.domain.services.google_calendar import list_events
+from app.infra.etag_cache import ETagCache
+from conftest import run
+
+DAY = ("2026-10-18T00:00:00+03:00", "2026-10-19T00:00:00+03:00")
+
+
+def google(pages_by_token: dict[str, dict], *, fail: set[str] = frozenset()):
+    """Фейковый events.list: тело и ETag зависят от токена; 304 на совпавший If-None-Match."""
+    seen: list[tuple[str, str | None]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        seen.append((token, request.headers.get("If-None-Match")))
+        if token in fail:
+            raise httpx.ConnectError("down", request=request)
+        etag = f'"{token}-v1"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json=pages_by_token[token], headers={"ETag": etag})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), seen
+
+
+PAGES = {
+    "tok-a": {"items": [{"id": "a1", "summary": "A private"}]},
+    "tok-b": {"items": [{"id": "b1", "summary": "B private"}]},
+}
+
+
+async def fetch(client, cache, token, owner):
+    data = await list_events(client, token, *DAY, cache=cache, cache_owner=owner)
+    return [it["id"] for it in data["items"]]
+
+
+def test_other_account_does_not_get_cached_page():
+    async def go():
+        client, seen = google(PAGES)
+        cache = ETagCache(1024 * 1024)
+        assert await fetch(client, cache, "tok-a", "a@example.com") == ["a1"]
+        # тот же url и params, другой аккаунт — без If-None-Match и со своими событиями
+        assert await fetch(client, cache, "tok-b", "b@example.com") == ["b1"]
+        assert seen[-1] == ("tok-b", None)
+        # повтор A — conditional GET, 304 отдаёт страницу A
+        assert await fetch(client, cache, "tok-a", "a@example.com") == ["a1"]
+        assert cache.not_modified == 1
+
+    run(go())
+
+
+def test_fallback_on_network_error_is_per_account():
+    async def go():
+        client, _ = google(PAGES, fail={"tok-b"})
+        cache = ETagCache(1024 * 1024)
+        await fetch(client, cache, "tok-a", "a@example.com")
+        # у B нет своей закэшированной страницы — ошибка, а не события A
+        with pytest.raises(httpx.TransportError):
+            await fetch(client, cache, "tok-b", "b@example.com")
+
+    run(go())
+
+
+def test_cache_requires_owner():
+    async def go():
+        client, _ = google(PAGES)
+        with pytest.raises(ValueError):
+            await list_events(client, "tok-a", *DAY, cache=ETagCache(1024))
+
+    run(go())
@@ -0,0 +1,134 @@
+"""field_week_minutes: дельты apply_changes после серии sync совпадают с полным пересчётом по зеркалу."""
+
+import uuid
+from collections import defaultdict
+from datetime import date
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.services.field_quota import FIELD_ID_PROPERTY, minutes_by_week
+from app.infra.db.models.calendar_events import CalendarEvent
+from app.infra.db.models.field_week_minutes import FieldWeekMinutes
+from app.infra.repos.baseline_fields_repo import BaselineFieldsRepo
+from app.infra.repos.calendar_events_repo import CalendarEventsRepo
+from conftest import run
+
+CALENDAR_ID = "quota-test@example.com"
+# в ночь на 25.10.2026 Бухарест переходит на зимнее время; неделя — с понедельника 26-го
+TZ = "Europe/Bucharest"
+
+
+@pytest.fixture
+def sessions(pg_engine):
+    return async_sessionmaker(pg_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+def event(event_id: str, summary: str, start: dict, end: dict, **extra) -> dict:
+    return {"id": event_id, "status": "confirmed", "summary": summary, "start": start, "end": end, **extra}
+
+
+def timed(event_id: str, summary: str, start: str, end: str, **extra) -> dict:
+    return event(event_id, summary, {"dateTime": start}, {"dateTime": end}, **extra)
+
+
+async def stored(session, field_ids) -> dict:
+    res = await session.execute(
+        select(FieldWeekMinutes).where(FieldWeekMinutes.field_id.in_(field_ids), FieldWeekMinutes.minutes != 0)
+    )
+    return {(row.field_id, row.week_start): row.minutes for row in res.scalars()}
+
+
+async def recomputed(session, field_ids) -> dict:
+    """Полный пересчёт: все строки зеркала с полем, минуты по неделям заново."""
+    tz = ZoneInfo(TZ)
+    out: dict = defaultdict(int)
+    res = await session.execute(select(CalendarEvent).where(CalendarEvent.field_id.in_(field_ids)))
+    for row in res.scalars():
+        if row.is_all_day:
+            continue
+        for monday, minutes in minutes_by_week(row.start_utc, row.end_utc, tz).items():
+            out[(row.field_id, monday)] += minutes
+    return {k: v for k, v in out.items() if v}
+
+
+def test_incremental_totals_match_full_recompute(sessions):
+    async def go():
+        tag = uuid.uuid4().hex[:8]
+        async with sessions() as session:
+            repo = BaselineFieldsRepo(session)
+            a = (await repo.create_field(name=f"writing-{tag}")).id
+            b = (await repo.create_field(name=f"reading-{tag}")).id
+            await session.execute(delete(CalendarEvent).where(CalendarEvent.calendar_id == CALENDAR_ID))
+            await session.commit()
+        A, B = f"[writing-{tag}]", f"[Reading-{tag}]"
+        ids = (a, b)
+        snapshots = []
+
+        async def sync(items, *, full=False):
+            async with sessions() as session:
+                await CalendarEventsRepo(session).apply_changes(CALENDAR_ID, items, tz_name=TZ, full=full)
+            async with sessions() as session:
+                now, expected = await stored(session, ids), await recomputed(session, ids)
+            assert now == expected
+            snapshots.append(now)
+
+        w1, w2 = date(2026, 10, 19), date(2026, 10, 26)
+
+        await sync(
+            [
+                timed("e1", f"{A} draft", "2026-10-20T10:00:00+03:00", "2026-10-20T12:00:00+03:00"),
+                timed("e2", f"{B} paper", "2026-10-21T14:00:00+03:00", "2026-10-21T15:00:00+03:00"),
+                # через полночь на понедельник: 60 минут в одну неделю, 60 — в другую
+                timed("e3", f"{A} night", "2026-10-25T23:00:00+02:00", "2026-10-26T01:00:00+02:00"),
+                timed(
+                    "e4", "created by helix", "2026-10-22T09:00:00+03:00", "2026-10-22T09:30:00+03:00",
+                    extendedProperties={"private": {FIELD_ID_PROPERTY: str(b)}},
+                ),
+                timed("e5", "no field", "2026-10-22T11:00:00+03:00", "2026-10-22T12:00:00+03:00"),
+                event("e6", f"{A} offsite", {"date": "2026-10-23"}, {"date": "2026-10-24"}),
+            ],
+            full=True,
+        )
+        assert snapshots[-1] == {(a, w1): 180, (a, w2): 60, (b, w1): 90}
+
+        # перенос через границу недели
+        await sync([timed("e1", f"{A} draft", "2026-10-27T10:00:00+02:00", "2026-10-27T11:30:00+02:00")])
+        assert snapshots[-1] == {(a, w1): 60, (a, w2): 150, (b, w1): 90}
+
+        # сменился тег поля в summary
+        await sync([timed("e2", f"{A} paper", "2026-10-21T14:00:00+03:00", "2026-10-21T15:00:00+03:00")])
+        assert snapshots[-1] == {(a, w1): 120, (a, w2): 150, (b, w1): 30}
+
+        # отмена (в т.ч. события, которого в зеркале нет) и тег, снятый с события
+        await sync(
+            [
+                {"id": "e3", "status": "cancelled"},
+                {"id": "ghost", "status": "cancelled"},
+                timed("e4", "created by helix", "2026-10-22T09:00:00+03:00", "2026-10-22T09:30:00+03:00"),
+            ]
+        )
+        assert snapshots[-1] == {(a, w1): 60, (a, w2): 90}
+
+        # две версии одного события в пачке — считается последняя
+        await sync(
+            [
+                timed("e1", f"{A} draft", "2026-10-28T10:00:00+02:00", "2026-10-28T13:00:00+02:00"),
+                timed("e1", f"{B} draft", "2026-10-20T10:00:00+03:00", "2026-10-20T10:45:00+03:00"),
+            ]
+        )
+        assert snapshots[-1] == {(a, w1): 60, (b, w1): 45}
+
+        # полный ресинк — зеркало заменяется, вклад исчезнувших событий снимается
+        await sync([timed("e2", f"{A} paper", "2026-10-21T14:00:00+03:00", "2026-10-21T14:20:00+03:00")], full=True)
+        assert snapshots[-1] == {(a, w1): 20}
+
+        async with sessions() as session:
+            await session.execute(delete(CalendarEvent).where(CalendarEvent.calendar_id == CALENDAR_ID))
+            await session.commit()
+            for field_id in ids:
+                await BaselineFieldsRepo(session).delete_field(field_id)
+
+    run(go())
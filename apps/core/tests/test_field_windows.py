@@ -0,0 +1,213 @@
+"""preferred_windows: валидация, bisect-поиск по скомпилированным окнам (сверка с перебором), DST, кэш."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domain.services.field_windows import (
+    WindowIndex,
+    compile_windows,
+    field_windows_cache,
+    validate_preferred_windows,
+)
+from app.infra.repos.baseline_fields_repo import BaselineFieldsRepo
+from conftest import run
+
+TZ = "Europe/Bucharest"
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def local(iso: str, tz: str = TZ) -> datetime:
+    return datetime.fromisoformat(iso).replace(tzinfo=ZoneInfo(tz))
+
+
+def utc(iso: str) -> datetime:
+    # арифметика aware datetime с одной tzinfo — по настенным часам; шагаем в UTC
+    return local(iso).astimezone(timezone.utc)
+
+
+def windows(*specs, tz: str | None = None) -> dict:
+    """specs: (days, start, end)."""
+    raw = {"windows": [{"days": list(days), "start": start, "end": end} for days, start, end in specs]}
+    if tz:
+        raw["timezone"] = tz
+    return raw
+
+
+# --- валидация
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        windows((["mon"], "25:00", "26:00")),
+        windows((["mon"], "10:60", "11:00")),
+        windows((["mon"], "24:30", "10:00")),
+        windows((["mon"], "1000", "1100")),
+        windows((["mon"], "ab:cd", "11:00")),
+        windows((["mon"], "10:0", "11:00")),
+        windows((["mon"], 10, "11:00")),
+        windows((["monday"], "10:00", "11:00")),
+        windows((["Mon"], "10:00", "11:00")),
+        {"windows": [{"days": "mon", "start": "10:00", "end": "11:00"}]},
+        {"windows": [{"days": ["mon"], "start": "10:00"}]},
+        windows((["mon"], "10:00", "10:00")),
+        windows((["mon"], "24:00", "10:00")),
+        {"windows": {"days": ["mon"]}},
+        {"timezone": "Mars/Olympus", "windows": []},
+        ["mon"],
+    ],
+)
+def test_validate_rejects_malformed(raw):
+    with pytest.raises(ValueError):
+        validate_preferred_windows(raw)
+
+
+def test_validate_normalizes():
+    assert validate_preferred_windows({}) == {}
+    out = validate_preferred_windows({"timezone": TZ, "windows": [{"start": "22:00", "end": "24:00"}], "x": 1})
+    assert out == {"timezone": TZ, "windows": [{"days": DAYS, "start": "22:00", "end": "24:00"}]}
+
+
+# --- contains / overlap
+
+
+def test_touching_windows_merge_and_ends_are_exclusive():
+    cw = compile_windows(windows((["mon"], "10:00", "12:00"), (["mon"], "12:00", "14:00")), TZ)
+    assert (cw.starts, cw.ends) == ((600,), (840,))
+    assert cw.contains(local("2026-10-19T12:00"))
+    assert cw.contains(local("2026-10-19T13:59"))
+    assert not cw.contains(local("2026-10-19T14:00"))
+    assert not cw.contains(local("2026-10-19T09:59"))
+    assert cw.overlap_minutes(local("2026-10-19T11:00"), local("2026-10-19T13:00")) == 120
+
+
+def test_overnight_and_sunday_wrap():
+    cw = compile_windows(windows((["sun"], "22:00", "02:00")), TZ)
+    # хвост воскресного окна — в понедельник
+    assert (cw.starts, cw.ends) == ((0, 6 * 1440 + 22 * 60), (120, 10080))
+    assert cw.contains(local("2026-10-18T23:00"))
+    assert cw.contains(local("2026-10-19T01:59"))
+    assert not cw.contains(local("2026-10-19T02:00"))
+    assert cw.overlap_minutes(local("2026-10-18T00:00"), local("2026-10-20T00:00")) == 240
+    assert cw.intervals(datetime(2026, 10, 18).date(), datetime(2026, 10, 19).date()) == [
+        (local("2026-10-18T22:00"), local("2026-10-19T02:00"))
+    ]
+
+
+def random_windows(rng: random.Random, n: int) -> dict:
+    specs = []
+    for _ in range(n):
+        start = rng.randrange(0, 24 * 4) * 15
+        length = rng.randrange(1, 12 * 4) * 15
+        end = (start + length) % 1440
+        if end == start:
+            continue
+        days = rng.sample(DAYS, rng.randint(1, 7))
+        specs.append((days, f"{start // 60:02d}:{start % 60:02d}", f"{end // 60:02d}:{end % 60:02d}"))
+    return windows(*specs)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lookups_match_brute_force(seed):
+    rng = random.Random(seed)
+    cw = compile_windows(random_windows(rng, 12), TZ)
+    # неделя с переходом на зимнее время (25.10) и обычная
+    origin = utc("2026-10-22T00:00") if seed % 2 else utc("2026-10-12T00:00")
+    for m in range(0, 7 * 1440, 7):
+        t = origin + timedelta(minutes=m)
+        wall = t.astimezone(ZoneInfo(TZ))
+        minute_of_week = wall.weekday() * 1440 + wall.hour * 60 + wall.minute
+        assert cw.contains(t) == any(a <= minute_of_week < b for a, b in zip(cw.starts, cw.ends))
+
+    for _ in range(30):
+        a = origin + timedelta(minutes=rng.randrange(0, 10 * 1440))
+        b = a + timedelta(minutes=rng.randrange(0, 3 * 1440))
+        brute = sum(cw.contains(a + timedelta(minutes=m)) for m in range(int((b - a).total_seconds() // 60)))
+        assert cw.overlap_minutes(a, b) == brute
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_active_at_matches_each_field(seed):
+    rng = random.Random(100 + seed)
+    compiled = {
+        field_id: compile_windows(random_windows(rng, 4), tz)
+        for field_id, tz in enumerate([TZ, TZ, "America/New_York", "UTC", TZ], start=1)
+    }
+    index = WindowIndex(compiled)
+    origin = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    for m in range(0, 14 * 1440, 11):
+        t = origin + timedelta(minutes=m)
+        assert index.active_at(t) == {fid for fid, cw in compiled.items() if cw.contains(t)}
+
+
+# --- DST
+
+
+@pytest.mark.parametrize("day", ["2026-03-29", "2026-10-25"])
+def test_windows_follow_wall_clock_on_dst_days(day):
+    cw = compile_windows(windows((["sun"], "10:00", "12:00")), TZ)
+    assert cw.contains(local(f"{day}T10:00"))
+    assert not cw.contains(local(f"{day}T12:00"))
+    assert cw.overlap_minutes(utc(f"{day}T00:00"), utc(f"{day}T23:59")) == 120
+
+
+@pytest.mark.parametrize(
+    "day, start, end, minutes",
+    [
+        # весна: 03:00 -> 04:00, часа 03:xx нет
+        ("2026-03-29", "00:00", "24:00", 23 * 60),
+        ("2026-03-29", "02:00", "05:00", 2 * 60),
+        # осень: 04:00 -> 03:00, час 03:xx проходит дважды
+        ("2026-10-25", "00:00", "24:00", 25 * 60),
+        ("2026-10-25", "03:00", "04:00", 2 * 60),
+    ],
+)
+def test_overlap_counts_real_minutes_on_dst_days(day, start, end, minutes):
+    cw = compile_windows(windows((["sun"], start, end)), TZ)
+    lo = utc(f"{day}T00:00") - timedelta(hours=6)
+    hi = utc(f"{day}T00:00") + timedelta(hours=30)
+    assert cw.overlap_minutes(lo, hi) == minutes
+    # конкретное окно на этот день — той же реальной длины
+    ((a, b),) = cw.intervals(datetime.fromisoformat(day).date(), datetime.fromisoformat(day).date())
+    assert b.astimezone(timezone.utc) - a.astimezone(timezone.utc) == timedelta(minutes=minutes)
+
+
+# --- кэш
+
+
+@pytest.fixture
+def sessions(pg_engine):
+    return async_sessionmaker(pg_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+def test_update_field_invalidates_cache(sessions):
+    async def go():
+        async with sessions() as session:
+            repo = BaselineFieldsRepo(session)
+            row = await repo.create_field(name="cache-test", preferred_windows=windows((["mon"], "10:00", "12:00")))
+            # тот же updated_at, что у закэшированной записи: пересчитать заставит только invalidate
+            stale = SimpleNamespace(id=row.id, updated_at=row.updated_at, preferred_windows=row.preferred_windows)
+            assert field_windows_cache.get(stale).starts == (600,)
+            assert field_windows_cache.index([stale]).active_at(local("2026-10-19T11:00")) == {row.id}
+
+            new = windows((["mon"], "14:00", "16:00"))
+            await repo.update_field(row.id, preferred_windows=new)
+            stale.preferred_windows = new
+            assert field_windows_cache.get(stale).starts == (840,)
+            assert field_windows_cache.index([stale]).active_at(local("2026-10-19T11:00")) == set()
+
+            # переименование окна не трогает — запись остаётся
+            cached = field_windows_cache.get(stale)
+            await repo.update_field(row.id, name="cache-test-2")
+            assert field_windows_cache.get(stale) is cached
+
+            await repo.delete_field(row.id)
+            stale.preferred_windows = {}
+            assert field_windows_cache.get(stale) is None
+
+    run(go())
@@ -0,0 +1,83 @@
+"""POST /calendar/free-slots/group: нечитаемые календари не считаются свободными."""
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.api.routers.calendar import free_slots_group
+from conftest import run
+
+DAY = "2030-01-07"  # понедельник, рабочие часы по умолчанию 09:00-18:00
+
+
+def freebusy(calendars: dict) -> httpx.AsyncClient:
+    """Фейковый freeBusy.query: calendars — готовый ответ {"id": {"busy": [...]}|{"errors": [...]}}."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"calendars": calendars})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+BUSY_MORNING = {"busy": [{"start": f"{DAY}T09:00:00+02:00", "end": f"{DAY}T13:00:00+02:00"}]}
+FREE = {"busy": []}
+NOT_FOUND = {"errors": [{"domain": "global", "reason": "notFound"}]}
+
+
+def group(calendars: dict, **payload):
+    body = {"calendar_ids": list(calendars), "start_date": DAY, "duration_min": 30, "buffer_min": 0, **payload}
+    return run(free_slots_group(body, http=freebusy(calendars), access_token="tok"))
+
+
+def test_all_calendars_unreadable_is_an_error():
+    with pytest.raises(HTTPException) as e:
+        group({"a": NOT_FOUND, "b": NOT_FOUND})
+    assert e.value.status_code == 502
+    assert set(e.value.detail["calendar_errors"]) == {"a", "b"}
+
+
+def test_default_quorum_needs_every_requested_calendar():
+    with pytest.raises(HTTPException) as e:
+        group({"a": FREE, "b": FREE, "c": NOT_FOUND})
+    assert e.value.status_code == 502
+
+
+def test_quorum_counts_unreadable_calendars_as_not_free():
+    with pytest.raises(HTTPException) as e:
+        group({"a": FREE, "b": FREE, "c": NOT_FOUND}, quorum=3)
+    assert e.value.status_code == 502
+
+    out = group({"a": BUSY_MORNING, "b": FREE, "c": NOT_FOUND}, quorum=2)
+    assert out["calendars"] == 3 and out["calendars_read"] == 2 and out["quorum"] == 2
+    assert out["dropped_calendars"] == ["c"]
+    assert out["calendar_errors"] == {"c": "notFound"}
+    # a и b свободны вместе только после 13:00
+    assert out["days"][0]["slots"][0]["start"] == f"{DAY}T13:00:00+02:00"
+
+
+def test_omitted_calendar_is_dropped():
+    out = group({"a": FREE, "b": FREE}, quorum=1, calendar_ids=["a", "b", "ghost"])
+    assert out["dropped_calendars"] == ["ghost"]
+    assert out["calendar_errors"] == {"ghost": "missing"}
+
+
+@pytest.mark.parametrize(
+    "work_hours, detail",
+    [
+        ({"monday": ["09:00", "18:00"]}, "keys"),
+        (["09:00", "18:00"], "keys"),
+        ({"mon": ["9am", "18:00"]}, "HH:MM"),
+        ({"mon": ["09:00"]}, "HH:MM"),
+        ({"mon": "09:00-18:00"}, "HH:MM"),
+        ({"mon": [9, 18]}, "HH:MM"),
+    ],
+)
+def test_malformed_work_hours_is_a_400(work_hours, detail):
+    with pytest.raises(HTTPException) as e:
+        group({"a": FREE}, work_hours=work_hours)
+    assert e.value.status_code == 400 and detail in e.value.detail
+
+
+def test_custom_work_hours():
+    out = group({"a": BUSY_MORNING}, work_hours={"mon": ["12:00", "14:00"], "tue": None})
+    assert [s["start"] for s in out["days"][0]["slots"]] == [f"{DAY}T13:00:00+02:00"]
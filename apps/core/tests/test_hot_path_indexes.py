@@ -0,0 +1,97 @@
+"""EXPLAIN: горячие запросы по напряжениям идут по частичным индексам активных (alembic 0003/0006)."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.infra.repos.keyset import encode_cursor
+from app.infra.repos.tensions_repo import _page_query, _top_query
+from app.telegram.commands.return_cmd import RETURN_PICK_SQL
+from conftest import run
+
+# 20k напряжений, активна каждая десятая (как в живой базе: завершённых больше);
+# у части активных есть return_at, у helix — история возвратов
+SEED_SQL = [
+    "TRUNCATE tensions, tension_events RESTART IDENTITY CASCADE",
+    """
+    INSERT INTO tensions (title, status, charge, vector, return_at, urgency, created_at, updated_at)
+    SELECT 'tension ' || g,
+           CASE WHEN g % 10 = 0 THEN 'held' ELSE 'released' END,
+           g % 6,
+           'unknown',
+           CASE WHEN g % 30 = 0 THEN now() - (g || ' minutes')::interval END,
+           (g % 6) * 100,
+           now() - (g || ' minutes')::interval,
+           now()
+    FROM generate_series(1, 20000) AS g
+    """,
+    """
+    INSERT INTO tension_events (tension_id, type, actor, payload, created_at)
+    SELECT (g % 20000) + 1,
+           CASE WHEN g % 4 = 0 THEN 'returned' ELSE 'captured' END,
+           CASE WHEN g % 8 = 0 THEN 'helix' ELSE 'user' END,
+           '{}'::jsonb,
+           now() - (g || ' minutes')::interval
+    FROM generate_series(1, 40000) AS g
+    """,
+    "ANALYZE tensions",
+    "ANALYZE tension_events",
+]
+
+
+@pytest.fixture(scope="module")
+def engine(pg_engine):
+    async def seed():
+        async with pg_engine.begin() as conn:
+            for stmt in SEED_SQL:
+                await conn.execute(text(stmt))
+
+    run(seed())
+    return pg_engine
+
+
+def explain(engine, sql: str, params: dict | None = None) -> str:
+    async def go():
+        async with engine.connect() as conn:
+            res = await conn.execute(text(f"EXPLAIN {sql}"), params or {})
+            return "\n".join(row[0] for row in res)
+
+    return run(go())
+
+
+def compiled(q) -> str:
+    return str(q.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def page_sql(**kw) -> str:
+    return compiled(_page_query(statuses=("held", "forming"), vector=None, field_id=None, limit=50, **kw))
+
+
+def test_active_page_uses_partial_index(engine):
+    plan = explain(engine, page_sql(cursor=None))
+    assert "ix_tensions_active_created" in plan
+    assert "Seq Scan" not in plan
+
+
+def test_active_page_after_cursor_uses_partial_index(engine):
+    cursor = encode_cursor(datetime.now(timezone.utc), 10_000)
+    plan = explain(engine, page_sql(cursor=cursor))
+    assert "ix_tensions_active_created" in plan
+    assert "Seq Scan" not in plan
+
+
+def test_return_pick_uses_partial_indexes(engine):
+    plan = explain(engine, RETURN_PICK_SQL.text, {"now": datetime.now(timezone.utc)})
+    # due: просроченные return_at; top: по срочности; last: последний возврат helix
+    assert "ix_tensions_active_return_at" in plan
+    assert "ix_tensions_active_urgency" in plan
+    assert "ix_tension_events_type_actor_created" in plan
+    assert "Seq Scan" not in plan
+
+
+def test_top_is_index_only(engine):
+    plan = explain(engine, compiled(_top_query(10)))
+    assert "Index Only Scan using ix_tensions_active_urgency" in plan
+    assert "Seq Scan" not in plan
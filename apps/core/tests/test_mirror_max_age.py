@@ -0,0 +1,74 @@
+"""Длинный max age зеркала (push-канал жив) — только у зеркала, за которым следит канал."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.routers.calendar import mirror_max_age
+from app.domain.services.calendar_watch import CalendarWatcher
+from app.infra.etag_cache import ETagCache
+from app.infra.repos.calendar_watch_repo import CalendarWatchRepo
+from app.settings import settings
+from conftest import run
+
+
+class FakeTokens:
+    async def resolve_account(self, account_id: str | None = None) -> str:
+        return account_id.lower() if account_id else "me@example.com"
+
+
+@pytest.fixture
+def sessions(pg_engine):
+    return async_sessionmaker(pg_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+def max_ages(sessions, *accounts: str | None, channel_live: bool = True) -> list[int]:
+    async def go():
+        channel_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc)
+        async with sessions() as db:
+            await CalendarWatchRepo(db).add_channel(
+                channel_id=channel_id,
+                calendar_id="primary",
+                resource_id="resource-1",
+                token="secret-token",
+                expiration=now + (timedelta(days=1) if channel_live else -timedelta(minutes=1)),
+                created_at=now,
+            )
+        watcher = CalendarWatcher(httpx.AsyncClient(), FakeTokens(), ETagCache(1024), session_factory=sessions)
+        await watcher.start()
+
+        app = FastAPI()
+        app.state.calendar_watcher = watcher
+        app.state.google_tokens = FakeTokens()
+
+        @app.get("/max-age")
+        def read(max_age: int = Depends(mirror_max_age)):
+            return max_age
+
+        out = []
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://helix") as client:
+            for account in accounts:
+                headers = {"X-Helix-Account": account} if account else {}
+                out.append((await client.get("/max-age", headers=headers)).json())
+        await watcher.stop()
+        async with sessions() as db:
+            await CalendarWatchRepo(db).delete_channel(channel_id)
+        return out
+
+    return run(go())
+
+
+def test_only_watched_mirror_gets_long_max_age(sessions):
+    default, explicit_default, other = max_ages(sessions, None, "Me@example.com", "other@example.com")
+    assert default == explicit_default == settings.calendar_watch_fallback_sync_sec
+    # <other>:primary push не освежает — обычный короткий max age
+    assert other == settings.calendar_sync_max_age_sec
+
+
+def test_expired_channel_gives_short_max_age(sessions):
+    assert max_ages(sessions, None, channel_live=False) == [settings.calendar_sync_max_age_sec]
@@ -0,0 +1,59 @@
+"""PgListener: после wait_ready() LISTEN уже активен; недождавшийся подписчик получает on_reconnect."""
+
+import asyncio
+
+import asyncpg
+
+from app.infra.db.notify import PgListener, asyncpg_dsn
+from conftest import TEST_DATABASE_URL, run
+
+CHANNEL = "helix_test_listener"
+
+
+async def notify(payload: str) -> None:
+    conn = await asyncpg.connect(asyncpg_dsn(TEST_DATABASE_URL))
+    try:
+        await conn.execute("SELECT pg_notify($1, $2)", CHANNEL, payload)
+    finally:
+        await conn.close()
+
+
+def test_notify_right_after_ready_is_delivered(pg_engine):
+    async def go():
+        got: list[str] = []
+        reconnects: list[bool] = []
+        listener = PgListener(
+            CHANNEL, got.append, on_reconnect=lambda: reconnects.append(True), dsn=asyncpg_dsn(TEST_DATABASE_URL)
+        )
+        await listener.start()
+        try:
+            assert await listener.wait_ready(10)
+            await notify("42")
+            for _ in range(50):
+                if got:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await listener.stop()
+        assert got == ["42"]
+        assert reconnects == []
+
+    run(go())
+
+
+def test_wait_timeout_triggers_reconnect_callback(pg_engine):
+    async def go():
+        reconnects: list[bool] = []
+        listener = PgListener(
+            CHANNEL, lambda _p: None, on_reconnect=lambda: reconnects.append(True), dsn=asyncpg_dsn(TEST_DATABASE_URL)
+        )
+        await listener.start()
+        try:
+            # подписчик не стал ждать и загрузился сам — то, что пришло до LISTEN, надо перечитать
+            assert not await listener.wait_ready(0)
+            assert await listener.wait_ready(10)
+        finally:
+            await listener.stop()
+        assert reconnects == [True]
+
+    run(go())
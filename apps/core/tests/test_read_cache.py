@@ -0,0 +1,257 @@
+"""ReadCache: поколения и инвалидация, single-flight, SET NX lock между процессами, обход упавшего backend-а."""
+
+import asyncio
+import contextlib
+
+import pytest
+
+from app.infra.cache import MemoryBackend, ReadCache
+from conftest import run
+
+NS = "tensions"
+
+
+class Loader:
+    """Загрузчик-счётчик: возвращает номер вызова, грузит delay_sec, при fail — падает."""
+
+    def __init__(self, *, delay_sec: float = 0.0, fail: bool = False):
+        self.calls = 0
+        self.delay_sec = delay_sec
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.delay_sec)
+        if self.fail:
+            raise RuntimeError("db is down")
+        return {"value": call}
+
+
+class FlakyBackend(MemoryBackend):
+    """Memory backend, который по флагу ведёт себя как недоступный Redis."""
+
+    def __init__(self):
+        super().__init__()
+        self.down = False
+        self.ops = 0
+
+    def _check(self):
+        self.ops += 1
+        if self.down:
+            raise ConnectionError("redis is down")
+
+    async def get(self, key):
+        self._check()
+        return await super().get(key)
+
+    async def set(self, key, value, ttl_sec):
+        self._check()
+        await super().set(key, value, ttl_sec)
+
+    async def add(self, key, value, ttl_sec):
+        self._check()
+        return await super().add(key, value, ttl_sec)
+
+    async def incr(self, key):
+        self._check()
+        return await super().incr(key)
+
+
+def cache(backend=None, **kw) -> ReadCache:
+    return ReadCache(backend if backend is not None else MemoryBackend(), poll_sec=0.01, **kw)
+
+
+# --- инвалидация
+
+
+def test_hit_after_load_and_reload_after_invalidate():
+    rc, load = cache(), Loader()
+
+    async def go():
+        first = await rc.get_or_load(NS, "page", load, ttl_sec=60)
+        second = await rc.get_or_load(NS, "page", load, ttl_sec=60)
+        await rc.invalidate(NS)
+        third = await rc.get_or_load(NS, "page", load, ttl_sec=60)
+        return first, second, third
+
+    assert run(go()) == ({"value": 1}, {"value": 1}, {"value": 2})
+    assert (rc.hits, rc.misses) == (1, 2)
+
+
+def test_invalidate_touches_only_its_namespace():
+    rc, tensions, fields = cache(), Loader(), Loader()
+
+    async def go():
+        await rc.get_or_load(NS, "k", tensions, ttl_sec=60)
+        await rc.get_or_load("baseline_fields", "k", fields, ttl_sec=60)
+        await rc.invalidate("baseline_fields")
+        await rc.get_or_load(NS, "k", tensions, ttl_sec=60)
+        await rc.get_or_load("baseline_fields", "k", fields, ttl_sec=60)
+
+    run(go())
+    assert (tensions.calls, fields.calls) == (1, 2)
+
+
+def test_load_started_before_invalidate_does_not_survive_it():
+    rc, load = cache(), Loader(delay_sec=0.05)
+
+    async def go():
+        stale = asyncio.create_task(rc.get_or_load(NS, "k", load, ttl_sec=60))
+        await asyncio.sleep(0.01)
+        # запись закоммитилась, пока шла загрузка: её результат лёг под старое поколение
+        await rc.invalidate(NS)
+        assert await stale == {"value": 1}
+        return await rc.get_or_load(NS, "k", load, ttl_sec=60)
+
+    assert run(go()) == {"value": 2}
+
+
+def test_expired_value_is_reloaded():
+    rc, load = cache(), Loader()
+
+    async def go():
+        await rc.get_or_load(NS, "k", load, ttl_sec=0.02)
+        await asyncio.sleep(0.05)
+        return await rc.get_or_load(NS, "k", load, ttl_sec=0.02)
+
+    assert run(go()) == {"value": 2}
+
+
+# --- single-flight
+
+
+def test_concurrent_misses_load_once():
+    rc, load = cache(), Loader(delay_sec=0.05)
+
+    async def go():
+        return await asyncio.gather(*(rc.get_or_load(NS, "k", load, ttl_sec=60) for _ in range(10)))
+
+    assert run(go()) == [{"value": 1}] * 10
+    assert load.calls == 1
+
+
+def test_failed_leader_lets_waiters_load_themselves():
+    rc, failing = cache(), Loader(delay_sec=0.05, fail=True)
+    healthy = Loader()
+
+    async def go():
+        leader = asyncio.create_task(rc.get_or_load(NS, "k", failing, ttl_sec=60))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(rc.get_or_load(NS, "k", healthy, ttl_sec=60))
+        with pytest.raises(RuntimeError):
+            await leader
+        return await waiter
+
+    assert run(go()) == {"value": 1}
+    assert failing.calls == 1 and healthy.calls == 1
+
+
+# --- SET NX lock: два «процесса» с общим backend-ом
+
+
+def test_second_process_waits_for_lock_holder():
+    shared = MemoryBackend()
+    a, b = cache(shared), cache(shared)
+    load_a, load_b = Loader(delay_sec=0.1), Loader()
+
+    async def go():
+        first = asyncio.create_task(a.get_or_load(NS, "k", load_a, ttl_sec=60))
+        await asyncio.sleep(0.01)
+        return await asyncio.gather(first, b.get_or_load(NS, "k", load_b, ttl_sec=60))
+
+    assert run(go()) == [{"value": 1}, {"value": 1}]
+    assert (load_a.calls, load_b.calls) == (1, 0)
+    assert b.waits == 1
+
+
+def test_lock_wait_is_bounded():
+    shared = MemoryBackend()
+    a, b = cache(shared), cache(shared, lock_wait_sec=0.05)
+    load_a, load_b = Loader(delay_sec=0.5), Loader()
+
+    async def go():
+        first = asyncio.create_task(a.get_or_load(NS, "k", load_a, ttl_sec=60))
+        await asyncio.sleep(0.01)
+        started = asyncio.get_running_loop().time()
+        value = await b.get_or_load(NS, "k", load_b, ttl_sec=60)
+        elapsed = asyncio.get_running_loop().time() - started
+        first.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await first
+        return value, elapsed
+
+    value, elapsed = run(go())
+    # держатель lock-а слишком долго — грузим сами, не дожидаясь его
+    assert value == {"value": 1} and load_b.calls == 1
+    assert elapsed < 0.3
+
+
+def test_failed_load_releases_lock():
+    shared = MemoryBackend()
+    a, b = cache(shared), cache(shared, lock_wait_sec=1.0)
+
+    async def go():
+        with pytest.raises(RuntimeError):
+            await a.get_or_load(NS, "k", Loader(fail=True), ttl_sec=60)
+        started = asyncio.get_running_loop().time()
+        await b.get_or_load(NS, "k", Loader(), ttl_sec=60)
+        return asyncio.get_running_loop().time() - started
+
+    # lock снят — второй процесс грузит сразу, а не ждёт lock_wait_sec
+    assert run(go()) < 0.5
+
+
+# --- backend недоступен
+
+
+def test_backend_down_bypasses_cache_then_recovers():
+    backend = FlakyBackend()
+    rc, load = cache(backend, retry_sec=0.05), Loader()
+
+    async def go():
+        await rc.get_or_load(NS, "k", load, ttl_sec=60)
+        backend.down = True
+        # чтения идут в БД напрямую, запрос не падает
+        assert await rc.get_or_load(NS, "k", load, ttl_sec=60) == {"value": 2}
+        ops = backend.ops
+        assert await rc.get_or_load(NS, "k", load, ttl_sec=60) == {"value": 3}
+        # в окне retry_sec backend не трогаем
+        assert backend.ops == ops
+        assert rc.stats()["available"] is False
+
+        # запись во время простоя: инвалидация откладывается и уходит первой после восстановления
+        await rc.invalidate(NS)
+        assert rc.stats()["pending_invalidations"] == [NS]
+        backend.down = False
+        await asyncio.sleep(0.06)
+        return await rc.get_or_load(NS, "k", load, ttl_sec=60)
+
+    # без отложенной инвалидации отдали бы закэшированный {"value": 1}
+    assert run(go()) == {"value": 4}
+    assert rc.errors == 1
+    assert rc.stats()["pending_invalidations"] == []
+
+
+# --- жизненный цикл
+
+
+def test_disabled_until_started_and_after_close():
+    rc, load = ReadCache(), Loader()
+    backend = MemoryBackend()
+
+    async def go():
+        await rc.get_or_load(NS, "k", load, ttl_sec=60)
+        await rc.get_or_load(NS, "k", load, ttl_sec=60)
+        assert load.calls == 2 and rc.stats()["backend"] is None
+
+        rc.start(backend)
+        await rc.get_or_load(NS, "k", load, ttl_sec=60)
+        await rc.get_or_load(NS, "k", load, ttl_sec=60)
+        assert load.calls == 3
+
+        await rc.close()
+        await rc.get_or_load(NS, "k", load, ttl_sec=60)
+        assert load.calls == 4 and rc.stats()["backend"] is None
+
+    run(go())
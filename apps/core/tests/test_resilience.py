@@ -0,0 +1,243 @@
+"""ResilientTransport / CircuitBreaker: когда повторяем, сколько ждём и когда breaker пускает запросы."""
+
+import asyncio
+import email.utils
+import time
+
+import httpx
+import pytest
+
+from app.infra.resilience import CircuitBreaker, CircuitOpenError, ResilientTransport, RetryPolicy, _retry_after_sec
+from conftest import run
+
+URL = "https://upstream.example.com/api"
+
+
+class Upstream:
+    """Фейковый upstream: отвечает по списку сценариев (Response или исключение), считает вызовы."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, type) and issubclass(outcome, Exception):
+            raise outcome("boom", request=request)
+        if callable(outcome):
+            return await outcome(request)
+        return outcome
+
+
+def client(
+    upstream: Upstream,
+    *,
+    breaker: CircuitBreaker | None = None,
+    max_attempts: int = 3,
+    max_elapsed_sec: float = 10.0,
+) -> httpx.AsyncClient:
+    breaker = breaker or CircuitBreaker("upstream", failure_threshold=100, reset_timeout_sec=30)
+    policy = RetryPolicy(max_attempts=max_attempts, base_delay_sec=0.001, max_delay_sec=0.01, max_elapsed_sec=max_elapsed_sec)
+    transport = ResilientTransport(httpx.MockTransport(upstream.handler), breaker=breaker, policy=policy)
+    return httpx.AsyncClient(transport=transport)
+
+
+# --- ретраи и идемпотентность
+
+
+def test_post_not_retried_after_read_error():
+    upstream = Upstream(httpx.ReadError, httpx.Response(200))
+
+    async def go():
+        # запрос мог дойти и выполниться — повтор создал бы дубль
+        with pytest.raises(httpx.ReadError):
+            await client(upstream).post(URL, json={})
+
+    run(go())
+    assert upstream.calls == 1
+
+
+def test_post_retried_after_connect_error():
+    upstream = Upstream(httpx.ConnectError, httpx.Response(201))
+
+    async def go():
+        return await client(upstream).post(URL, json={})
+
+    assert run(go()).status_code == 201
+    assert upstream.calls == 2
+
+
+def test_get_retried_after_read_error():
+    upstream = Upstream(httpx.ReadError, httpx.Response(200))
+    assert run(client(upstream).get(URL)).status_code == 200
+    assert upstream.calls == 2
+
+
+def test_post_marked_idempotent_is_retried_on_5xx():
+    upstream = Upstream(httpx.Response(503), httpx.Response(200))
+
+    async def go():
+        plain = await client(Upstream(httpx.Response(503))).post(URL, json={})
+        marked = await client(upstream).post(URL, json={}, extensions={"idempotent": True})
+        return plain, marked
+
+    plain, marked = run(go())
+    assert plain.status_code == 503
+    assert marked.status_code == 200 and upstream.calls == 2
+
+
+def test_gives_up_after_max_attempts():
+    upstream = Upstream(httpx.Response(502))
+    assert run(client(upstream, max_attempts=3).get(URL)).status_code == 502
+    assert upstream.calls == 3
+
+
+# --- Retry-After
+
+
+def test_retry_after_seconds():
+    assert _retry_after_sec(httpx.Response(429, headers={"Retry-After": "7"})) == 7.0
+    assert _retry_after_sec(httpx.Response(429, headers={"Retry-After": "-3"})) == 0.0
+    assert _retry_after_sec(httpx.Response(429)) is None
+    assert _retry_after_sec(httpx.Response(429, headers={"Retry-After": "soon"})) is None
+
+
+def test_retry_after_http_date():
+    when = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 28 <= _retry_after_sec(httpx.Response(503, headers={"Retry-After": when})) <= 30
+    past = email.utils.formatdate(time.time() - 60, usegmt=True)
+    assert _retry_after_sec(httpx.Response(503, headers={"Retry-After": past})) == 0.0
+
+
+def test_retry_after_is_honoured():
+    upstream = Upstream(httpx.Response(429, headers={"Retry-After": "0.2"}), httpx.Response(200))
+    started = time.monotonic()
+    assert run(client(upstream).get(URL)).status_code == 200
+    assert time.monotonic() - started >= 0.2
+    assert upstream.calls == 2
+
+
+def test_retry_after_beyond_budget_is_not_waited():
+    # Retry-After ограничен бюджетом ретраев: дольше max_elapsed_sec не ждём, отдаём 429 сразу
+    upstream = Upstream(httpx.Response(429, headers={"Retry-After": "3600"}), httpx.Response(200))
+    started = time.monotonic()
+    response = run(client(upstream, max_elapsed_sec=1.0).get(URL))
+    assert response.status_code == 429
+    assert upstream.calls == 1
+    assert time.monotonic() - started < 0.5
+
+
+# --- circuit breaker
+
+
+def test_429_does_not_trip_breaker():
+    breaker = CircuitBreaker("upstream", failure_threshold=2, reset_timeout_sec=30)
+    upstream = Upstream(httpx.Response(429, headers={"Retry-After": "0"}))
+
+    async def go():
+        c = client(upstream, breaker=breaker, max_attempts=2)
+        for _ in range(3):
+            assert (await c.get(URL)).status_code == 429
+
+    run(go())
+    assert upstream.calls == 6
+    assert breaker.state == "closed"
+
+
+def test_open_half_open_closed():
+    breaker = CircuitBreaker("upstream", failure_threshold=2, reset_timeout_sec=0.1)
+    upstream = Upstream(httpx.Response(500), httpx.Response(500), httpx.Response(200))
+
+    async def go():
+        c = client(upstream, breaker=breaker, max_attempts=1)
+        await c.get(URL)
+        assert breaker.state == "closed"
+        await c.get(URL)
+        assert breaker.state == "open"
+
+        # открыт — падаем сразу, upstream не трогаем
+        with pytest.raises(CircuitOpenError) as exc:
+            await c.get(URL)
+        assert 0 < exc.value.retry_after_sec <= 0.1
+        assert upstream.calls == 2
+
+        await asyncio.sleep(0.12)
+        # после reset_timeout пробный запрос проходит и закрывает breaker
+        assert (await c.get(URL)).status_code == 200
+        assert breaker.state == "closed"
+
+    run(go())
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker("upstream", failure_threshold=1, reset_timeout_sec=0.05)
+    upstream = Upstream(httpx.Response(500))
+
+    async def go():
+        c = client(upstream, breaker=breaker, max_attempts=1)
+        await c.get(URL)
+        await asyncio.sleep(0.06)
+        await c.get(URL)
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            await c.get(URL)
+
+    run(go())
+    assert upstream.calls == 2
+
+
+def test_single_probe_when_half_open():
+    breaker = CircuitBreaker("upstream", failure_threshold=1, reset_timeout_sec=0.05)
+    release = None
+
+    async def slow_ok(request):
+        await release.wait()
+        return httpx.Response(200)
+
+    upstream = Upstream(httpx.Response(500), slow_ok)
+
+    async def go():
+        nonlocal release
+        release = asyncio.Event()
+        c = client(upstream, breaker=breaker, max_attempts=1)
+        await c.get(URL)
+        await asyncio.sleep(0.06)
+
+        probe = asyncio.create_task(c.get(URL))
+        await asyncio.sleep(0.01)
+        assert breaker.state == "half_open"
+        # пока проба в полёте, остальные параллельные вызовы отбиваются без похода в upstream
+        others = await asyncio.gather(*(c.get(URL) for _ in range(5)), return_exceptions=True)
+        assert all(isinstance(r, CircuitOpenError) for r in others)
+
+        release.set()
+        assert (await probe).status_code == 200
+        assert breaker.state == "closed"
+        assert (await c.get(URL)).status_code == 200
+
+    run(go())
+    assert upstream.calls == 3
+
+
+def test_cancelled_probe_frees_the_slot():
+    breaker = CircuitBreaker("upstream", failure_threshold=1, reset_timeout_sec=0.05)
+
+    async def hang(request):
+        await asyncio.sleep(10)
+
+    upstream = Upstream(httpx.Response(500), hang, httpx.Response(200))
+
+    async def go():
+        c = client(upstream, breaker=breaker, max_attempts=1)
+        await c.get(URL)
+        await asyncio.sleep(0.06)
+        probe = asyncio.create_task(c.get(URL))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        # отменённая проба не должна навсегда запереть half-open
+        assert (await c.get(URL)).status_code == 200
+
+    run(go())
@@ -0,0 +1,150 @@
+"""/return: какой tension выбирает RETURN_PICK_SQL и с каким reason (due / top_score, no_repeat)."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infra.db.models.tension_events import TensionEvent
+from app.telegram.commands.return_cmd import return_next_tension
+from conftest import run
+
+
+@pytest.fixture
+def sessions(pg_engine):
+    async def clean():
+        async with pg_engine.begin() as conn:
+            await conn.execute(text("TRUNCATE tensions, tension_events RESTART IDENTITY CASCADE"))
+
+    run(clean())
+    return async_sessionmaker(pg_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+async def add(sessions, title: str, *, urgency: int = 0, due_min_ago: int | None = None, status: str = "held") -> int:
+    """Напряжение; due_min_ago — return_at столько минут назад (отрицательное — в будущем)."""
+    async with sessions() as session:
+        tension_id = await session.scalar(
+            text(
+                """
+                INSERT INTO tensions (title, status, charge, vector, urgency, return_at, created_at, updated_at)
+                VALUES (:title, :status, 3, 'unknown', :urgency,
+                        now() - make_interval(mins => CAST(:due AS int)), clock_timestamp(), now())
+                RETURNING id
+                """
+            ),
+            {"title": title, "status": status, "urgency": urgency, "due": due_min_ago},
+        )
+        await session.commit()
+        return tension_id
+
+
+async def returned_by_helix(sessions, tension_id: int) -> None:
+    async with sessions() as session:
+        session.add(TensionEvent(tension_id=tension_id, type="returned", actor="helix", payload={}))
+        await session.commit()
+
+
+async def pick(sessions) -> tuple[str | None, str]:
+    async with sessions() as session:
+        result = await return_next_tension(session)
+    return (result.tension.title if result.tension else None), result.reason
+
+
+def test_empty(sessions):
+    async def go():
+        await add(sessions, "done", status="released", due_min_ago=10)
+        assert await pick(sessions) == (None, "empty")
+        async with sessions() as session:
+            assert await session.scalar(select(func.count()).select_from(TensionEvent)) == 0
+
+    run(go())
+
+
+def test_due_earliest_first(sessions):
+    async def go():
+        await add(sessions, "due later", due_min_ago=5)
+        await add(sessions, "due early", due_min_ago=30)
+        await add(sessions, "future", urgency=900, due_min_ago=-30)
+        # без истории возвратов любой выбор — «не повтор»
+        assert await pick(sessions) == ("due early", "due_no_repeat")
+
+    run(go())
+
+
+def test_due_skips_last_returned(sessions):
+    async def go():
+        early = await add(sessions, "due early", due_min_ago=30)
+        await add(sessions, "due later", due_min_ago=5)
+        await returned_by_helix(sessions, early)
+        assert await pick(sessions) == ("due later", "due_no_repeat")
+
+    run(go())
+
+
+def test_due_repeats_when_it_is_the_only_due(sessions):
+    async def go():
+        only = await add(sessions, "only due", due_min_ago=30)
+        await add(sessions, "hot", urgency=900)
+        await returned_by_helix(sessions, only)
+        # due важнее top: повторяем единственный due, а не уходим в top_score
+        assert await pick(sessions) == ("only due", "due")
+
+    run(go())
+
+
+def test_top_score_by_urgency(sessions):
+    async def go():
+        await add(sessions, "cold", urgency=100)
+        await add(sessions, "hot", urgency=500)
+        await add(sessions, "future", urgency=900, due_min_ago=-30)
+        await add(sessions, "parked", urgency=1000, status="parked")
+        assert await pick(sessions) == ("future", "top_score_no_repeat")
+
+    run(go())
+
+
+def test_top_score_skips_last_returned(sessions):
+    async def go():
+        hot = await add(sessions, "hot", urgency=500)
+        await add(sessions, "cold", urgency=100)
+        await returned_by_helix(sessions, hot)
+        assert await pick(sessions) == ("cold", "top_score_no_repeat")
+
+    run(go())
+
+
+def test_top_score_repeats_the_only_candidate(sessions):
+    async def go():
+        only = await add(sessions, "only", urgency=500)
+        await returned_by_helix(sessions, only)
+        assert await pick(sessions) == ("only", "top_score")
+
+    run(go())
+
+
+def test_consecutive_picks_alternate(sessions):
+    async def go():
+        await add(sessions, "hot", urgency=500)
+        await add(sessions, "cold", urgency=100)
+        # каждый /return пишет событие — следующий уже видит его как last
+        return [await pick(sessions) for _ in range(3)]
+
+    titles = [title for title, _ in run(go())]
+    assert titles[0] != titles[1] and titles[1] != titles[2]
+
+
+def test_concurrent_picks_return_different_tensions(sessions):
+    async def go():
+        await add(sessions, "hot", urgency=500)
+        await add(sessions, "cold", urgency=100)
+        picks = await asyncio.gather(*(pick(sessions) for _ in range(2)))
+        async with sessions() as session:
+            returned = await session.scalar(
+                select(func.count()).select_from(TensionEvent).where(TensionEvent.type == "returned")
+            )
+        return picks, returned
+
+    picks, returned = run(go())
+    assert {title for title, _ in picks} == {"hot", "cold"}
+    assert returned == 2
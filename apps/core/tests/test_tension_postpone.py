@@ -0,0 +1,56 @@
+"""Отложенное напряжение: return_at сдвигается, просрочка сразу уходит из срочности."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infra.db.models.tension_events import TensionEvent
+from app.infra.repos.tensions_repo import TensionsRepo
+from conftest import run
+
+
+@pytest.fixture
+def sessions(pg_engine):
+    return async_sessionmaker(pg_engine, expire_on_commit=False, class_=AsyncSession)
+
+
+async def overdue_tension(sessions, *, status: str = "held") -> int:
+    async with sessions() as session:
+        t = await TensionsRepo(session).create_tension(title="postpone me", charge=2, status=status)
+        await session.execute(
+            text("UPDATE tensions SET return_at = now() - interval '5 hours' WHERE id = :id"), {"id": t.id}
+        )
+        await session.commit()
+        await TensionsRepo(session).refresh_urgency(now=datetime.now(timezone.utc))
+        return t.id
+
+
+def test_postpone_recomputes_urgency(sessions):
+    async def go():
+        tension_id = await overdue_tension(sessions)
+        async with sessions() as session:
+            before = (await TensionsRepo(session).get_by_id(tension_id)).urgency
+            t = await TensionsRepo(session).postpone_tension(tension_id, delay=timedelta(hours=2))
+            # charge 2 -> 200; просрочка (+50 +2/час) ушла вместе со старым return_at
+            assert before == 200 + 50 + 5 * 2
+            assert t.urgency == 200
+            assert t.return_at > datetime.now(timezone.utc) + timedelta(minutes=110)
+            events = (
+                await session.scalars(
+                    select(TensionEvent).where(TensionEvent.tension_id == tension_id, TensionEvent.type == "postponed")
+                )
+            ).all()
+            assert len(events) == 1 and events[0].payload["from"] is not None
+
+    run(go())
+
+
+def test_postpone_skips_inactive(sessions):
+    async def go():
+        tension_id = await overdue_tension(sessions, status="parked")
+        async with sessions() as session:
+            assert await TensionsRepo(session).postpone_tension(tension_id, delay=timedelta(hours=2)) is None
+
+    run(go())
@@ -0,0 +1,103 @@
+"""search_page: полнотекстовый ярус, за ним нечёткий; страницы по курсору без дублей и пропусков."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infra.repos.keyset import InvalidCursor
+from app.infra.repos.tensions_repo import SEARCH_FTS_RANK_BASE, TensionsRepo
+from conftest import run
+
+QUERY = "zephyrine"
+# (title, search_notes, status)
+ROWS = [
+    *[(f"zephyrine plan {i}", "", "held") for i in range(5)],  # одинаковый rank — порядок по id
+    ("zephyrines", "", "held"),  # префикс
+    ("quarterly review", "captured: zephyrine call notes", "forming"),  # по заметкам
+    ("zephyrin draft", "", "held"),  # дальше — только нечётко
+    ("zephyrin draft", "", "held"),
+    ("zephyrinx", "", "held"),
+    ("zephyrene call", "", "held"),
+    ("zephyr", "", "held"),
+    ("zefyrine memo", "", "held"),  # слишком далеко
+    ("unrelated thing", "", "held"),
+    ("zephyrine done", "", "released"),  # не активное
+]
+FTS_COUNT, FUZZY_COUNT = 7, 5
+
+
+@pytest.fixture
+def repo_factory(pg_engine):
+    sessions = async_sessionmaker(pg_engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def seed():
+        async with sessions() as session:
+            await session.execute(text("TRUNCATE tensions, tension_events RESTART IDENTITY CASCADE"))
+            for title, notes, status in ROWS:
+                await session.execute(
+                    text(
+                        "INSERT INTO tensions (title, search_notes, status, charge, vector, created_at, updated_at) "
+                        "VALUES (:title, :notes, :status, 3, 'unknown', now(), now())"
+                    ),
+                    {"title": title, "notes": notes, "status": status},
+                )
+            await session.commit()
+
+    run(seed())
+    return sessions
+
+
+def search(sessions, query: str = QUERY, *, limit: int, cursor: str | None = None):
+    async def go():
+        async with sessions() as session:
+            return await TensionsRepo(session).search_page(query, limit=limit, cursor=cursor)
+
+    return run(go())
+
+
+def all_pages(sessions, limit: int, query: str = QUERY) -> list[list[tuple[int, object]]]:
+    pages, cursor = [], None
+    while True:
+        hits, cursor = search(sessions, query, limit=limit, cursor=cursor)
+        pages.append([(t.id, rank) for t, rank in hits])
+        if cursor is None:
+            return pages
+        assert len(pages) < 50
+
+
+def test_full_text_first_then_fuzzy(repo_factory):
+    hits, cursor = search(repo_factory, limit=100)
+    assert cursor is None
+    titles = [t.title for t, _ in hits]
+    ranks = [rank for _, rank in hits]
+    assert len(hits) == FTS_COUNT + FUZZY_COUNT
+    assert all(r >= SEARCH_FTS_RANK_BASE for r in ranks[:FTS_COUNT])
+    assert all(r < SEARCH_FTS_RANK_BASE for r in ranks[FTS_COUNT:])
+    assert ranks == sorted(ranks, reverse=True)
+    # точное слово выше префикса, нечёткие — по word_similarity
+    assert titles.index("zephyrines") > titles.index("zephyrine plan 0")
+    assert set(titles[FTS_COUNT:]) == {"zephyrin draft", "zephyrinx", "zephyrene call", "zephyr"}
+    assert "zefyrine memo" not in titles and "zephyrine done" not in titles
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 5, 6, 7, 8, 11, 12, 13])
+def test_pages_have_no_duplicates_or_gaps(repo_factory, limit):
+    (everything,) = all_pages(repo_factory, 100)
+    pages = all_pages(repo_factory, limit)
+    flat = [hit for page in pages for hit in page]
+    # склейка страниц — ровно одна большая страница: без дублей, пропусков и перестановок
+    assert flat == everything
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= limit
+
+
+def test_typo_only_query_pages_through_fuzzy_tier(repo_factory):
+    pages = all_pages(repo_factory, 2, query="zephyrinee")
+    flat = [hit for page in pages for hit in page]
+    assert len(flat) == len({hit_id for hit_id, _ in flat}) > 2
+    assert all(rank < SEARCH_FTS_RANK_BASE for _, rank in flat)
+
+
+def test_malformed_cursor(repo_factory):
+    with pytest.raises(InvalidCursor):
+        search(repo_factory, limit=5, cursor="garbage")